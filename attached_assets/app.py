@@ -27,7 +27,14 @@ from datetime import datetime
 # Modified imports for nsepython - removing nse_eq_symbols
 from nsepython import nse_eq, indices, nsefetch, index_info, nse_get_index_quote
 import yfinance as yf
-from swing_trading import analyze_swing_trading, analyze_tickers
+from swing_trading import (analyze_swing_trading, analyze_tickers, iter_analyze_tickers, analyze_timeframes,
+                           requested_timeframes, requested_timings)
+from batch_stream import requested_stream_format, stream_batch
+from stage_timing import histograms as stage_histograms
+from scan_jobs import scan_jobs
+from screener import screener
+from ttl_cache import make_cache_key
+from cache_backends import create_cache
 from attached_assets.indicesdownload import get_indices_list, get_index_constituents as download_index_constituents
 import dash
 from dash import dcc, html
@@ -92,24 +99,48 @@ def create_app():
         """
         API endpoint for swing trading analysis.
         
+        Query Parameters:
+            stream (str, optional): true/ndjson or sse to stream results as they finish
+                (also selected by Accept: application/x-ndjson or text/event-stream)
+            timings (str, optional): true to add each ticker's per-stage "_timings"
+                (also {"timings": true} in the request body)
+        
         Returns:
-            JSON: Analysis results
+            JSON: Analysis results, or a stream of result records ending with a summary
         """
         try:
             data = request.json
             tickers = data.get('tickers', [])
             timeframe = data.get('timeframe', 'short')
+            timings = requested_timings(request.args, data)
             
             if not tickers:
                 return jsonify({"error": "No tickers provided"}), 400
             
-            results = analyze_tickers(tickers, timeframe)
+            # Stream each ticker's analysis as it completes (NDJSON or SSE) when requested
+            stream_format = requested_stream_format()
+            if stream_format:
+                return stream_batch(iter_analyze_tickers(tickers, timeframe, timings), stream_format,
+                                    label="Swing trading stream")
+            
+            results = analyze_tickers(tickers, timeframe, timings)
             return jsonify(results)
         
         except Exception as e:
             logger.error(f"Error in swing trading endpoint: {e}")
             return jsonify({"error": str(e)}), 500
     
+    @app.route('/api/metrics', methods=['GET'])
+    def metrics():
+        """
+        Get the swing trading stage latency histograms and upstream call totals
+        of this worker.
+        
+        Returns:
+            JSON: Per-stage histograms and upstream call counters
+        """
+        return jsonify({"stage_timings": stage_histograms.stats()})
+    
     @app.route('/swing-trading/<ticker>', methods=['GET'])
     @app.route('/api/swing-trading/<ticker>', methods=['GET'])
     def swing_trading_single(ticker):
@@ -119,35 +150,49 @@ def create_app():
         Args:
             ticker (str): Stock ticker symbol
             
+        Query Parameters:
+            timeframe (str, optional): 'short', 'medium', 'long' or 'all'
+            timeframes (str, optional): Comma-separated timeframes analyzed together
+                from one history fetch
+            timings (str, optional): true to add the per-stage "_timings" breakdown
+            
         Returns:
-            JSON: Analysis results
+            JSON: Analysis results (keyed by timeframe for multi-timeframe requests)
         """
         try:
+            timings = requested_timings(request.args)
+            
+            # All requested timeframes from one history fetch and one indicator pass
+            timeframes = requested_timeframes(request.args)
+            if timeframes:
+                return jsonify(analyze_timeframes(ticker, timeframes, timings))
+            
             timeframe = request.args.get('timeframe', 'short')
-            result = analyze_swing_trading(ticker, timeframe)
+            result = analyze_swing_trading(ticker, timeframe, timings)
             return jsonify(result)
         
         except Exception as e:
             logger.error(f"Error in swing trading single endpoint: {e}")
             return jsonify({"error": str(e)}), 500
     
-    # Utility function for caching
+    # Utility function for caching (shared between workers on the host)
+    app_cache = create_cache("app", default_ttl=3600)
+
     def cache_result(func):
         """
-        Simple decorator for caching function results.
+        Simple decorator for caching function results in the shared cache.
         """
-        cache = {}
-        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            key = str(args) + str(kwargs)
-            if key not in cache:
+            key = make_cache_key(func.__name__, args, kwargs)
+            result = app_cache.get(key)
+            if result is None:
                 logger.debug(f"Cache miss for {func.__name__}, calling original function")
                 result = func(*args, **kwargs)
-                cache[key] = result
+                app_cache.set(key, result)
             else:
                 logger.debug(f"Cache hit for {func.__name__}")
-            return cache[key]
+            return result
         
         return wrapper
     
@@ -1616,6 +1661,12 @@ def create_app():
             logger.error(f"Error in get_companies endpoint: {e}", exc_info=True)
             return jsonify({"error": str(e)}), 500
     
+    # Index-wide scans run as background jobs (submit, poll, page results, cancel)
+    app.register_blueprint(scan_jobs)
+    
+    # Queries over the precomputed end-of-day score table
+    app.register_blueprint(screener)
+    
     return app
 
 # Create Flask app
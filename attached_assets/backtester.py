@@ -0,0 +1,532 @@
+"""
+PyTrade - Backtester Module
+
+This module backtests the swing trading scoring model over full price histories.
+Every bar of every symbol is a decision point: the seven technical sub-scores (RSI,
+MACD, ATR, EMA, Fibonacci, Bollinger Bands, market structure) are evaluated with the
+same rules and weights as the live analysis, blended into the combined score and
+mapped to Buy / Neutral / DBuy. The outcome of each decision is then measured by the
+forward return and the maximum adverse excursion (worst low relative to the decision
+close) over several horizons.
+
+Histories are packed into (symbols x bars) matrices by the indicator engine and
+evaluated in vectorized passes over blocks of symbols: indicator matrices come from
+the selected indicator backend, rolling highs and lows take log2(window) passes over
+the matrices, and each decision point is reduced to one
+joint class label so that the statistics of every signal and sub-score come from a
+few bincounts. Nothing loops over symbols or decision points in Python.
+
+Fundamental and news scores have no history, so the backtest holds them at fixed
+values (neutral 50 by default) and the combined score varies with the technical
+score only.
+
+Key features:
+- Buy / Neutral / DBuy decisions at every bar for an entire universe
+- Forward returns, hit rates and maximum adverse excursion per signal and horizon
+- Hit rates of each technical sub-score's bullish and bearish readings
+- Forward returns by combined score decile
+- Long-while-Buy strategy returns and maximum drawdowns against buy and hold
+- Throughput reporting in symbol-bars per second and a synthetic benchmark CLI
+
+Author: PyTrade Development Team
+Version: 1.0.0
+Date: October 17, 2026
+License: Proprietary
+"""
+
+import os
+import time
+import logging
+import argparse
+import numpy as np
+import indicator_engine as engine
+from indicator_backends import get_backend, run_indicator_set, synthetic_ohlc
+from market_data import download_history_batch
+from swing_trading_service import (
+    resolve_timeframe_period, INDICATOR_WEIGHTS, COMBINED_WEIGHTS, BUY_THRESHOLD, DBUY_THRESHOLD
+)
+
+logger = logging.getLogger(__name__)
+
+# Forward horizons in bars (the prediction horizons of the short, medium and long timeframes)
+DEFAULT_HORIZONS = (5, 14, 30)
+TRADING_DAYS_PER_YEAR = 252
+SIGNALS = {"Buy": 1, "Neutral": 0, "DBuy": -1}
+# Symbols per vectorized pass; keeps the indicator and outcome matrices of large
+# universes within a few hundred MB
+CHUNK_SYMBOLS = int(os.environ.get("PYTRADE_BACKTEST_CHUNK_SYMBOLS", 500))
+
+
+def lookback_bars(timeframe):
+    """
+    Convert the analysis period of a timeframe into trading bars.
+
+    Args:
+        timeframe (str): Trading timeframe ('short', 'medium', 'long')
+
+    Returns:
+        int: Bars of the period whose high and low anchor the Fibonacci levels
+    """
+    period, _ = resolve_timeframe_period(timeframe)
+    days = int(period.rstrip("d"))
+    return max(int(days * TRADING_DAYS_PER_YEAR / 365), 2)
+
+
+def rolling_max(values, length):
+    """Rolling maximum over the last `length` bars, of shape (symbols, bars)."""
+    return engine.rolling_max(values, length)
+
+
+def rolling_min(values, length):
+    """Rolling minimum over the last `length` bars, of shape (symbols, bars)."""
+    return engine.rolling_min(values, length)
+
+
+def _rolling_all(condition, length):
+    # True where the condition held on each of the last `length` bars
+    counts = np.cumsum(condition, axis=1, dtype=np.int32)
+    held = np.zeros(condition.shape, dtype=bool)
+    held[:, length - 1:] = counts[:, length - 1:] - np.concatenate(
+        [np.zeros((condition.shape[0], 1), dtype=np.int32), counts[:, :-length]], axis=1) == length
+    return held
+
+
+def market_structure(high, low, params=None):
+    """
+    Market structure at every bar (see indicator_engine.market_structure).
+
+    Args:
+        high (np.ndarray): High prices of shape (symbols, bars)
+        low (np.ndarray): Low prices of shape (symbols, bars)
+        params (dict, optional): Indicator parameter overrides
+
+    Returns:
+        tuple: (is_uptrend, is_downtrend) boolean arrays of shape (symbols, bars)
+    """
+    p = engine.resolve_params(params)
+    window, lookback = p["ms_window"], p["ms_lookback"]
+    high_changes = np.full(high.shape, np.nan)
+    low_changes = np.full(low.shape, np.nan)
+    high_changes[:, 1:] = np.diff(rolling_max(high, window), axis=1)
+    low_changes[:, 1:] = np.diff(rolling_min(low, window), axis=1)
+    with np.errstate(invalid="ignore"):
+        is_uptrend = _rolling_all((high_changes > 0) & (low_changes > 0), lookback)
+        is_downtrend = _rolling_all((high_changes < 0) & (low_changes < 0), lookback)
+    return is_uptrend, is_downtrend
+
+
+def score_bars(high, low, close, timeframe="short", fundamental_score=50.0, news_score=50.0, params=None):
+    """
+    Evaluate the swing trading scoring rules at every bar.
+
+    Args:
+        high (np.ndarray): High prices of shape (symbols, bars)
+        low (np.ndarray): Low prices of shape (symbols, bars)
+        close (np.ndarray): Close prices of shape (symbols, bars)
+        timeframe (str): Trading timeframe; sets the Fibonacci high/low period
+        fundamental_score (float): Fundamental score assumed at every bar
+        news_score (float): News sentiment score assumed at every bar
+        params (dict, optional): Indicator parameter overrides
+
+    Returns:
+        dict: Sub-score matrices by indicator name ("RSI", ... "MS"), "technical" and
+              "combined" score matrices and "signal" (int8: 1 Buy, 0 Neutral, -1 DBuy)
+    """
+    ind = run_indicator_set(get_backend(), high, low, close, params)
+    period = lookback_bars(timeframe)
+    period_high = rolling_max(high, period)
+    period_low = rolling_min(low, period)
+    is_uptrend, is_downtrend = market_structure(high, low, params)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        atr_pct = ind["atr"] / close * 100
+        price_range = period_high - period_low
+        scores = {
+            "RSI": np.where(ind["rsi"] <= 30, 100.0, np.where(ind["rsi"] >= 70, 0.0, 50.0)),
+            "MACD": np.where((ind["macd"] > ind["macd_signal"]) & (ind["macd_hist"] > 0), 100.0,
+                             np.where((ind["macd"] < ind["macd_signal"]) & (ind["macd_hist"] < 0), 0.0, 50.0)),
+            "ATR": np.where((atr_pct < 1.5) | (atr_pct > 4), 30.0, 80.0),
+            "EMA": np.where((ind["ema_short"] > ind["ema_long"]) & (close > ind["ema_short"]), 100.0,
+                            np.where((ind["ema_short"] < ind["ema_long"]) & (close < ind["ema_short"]), 0.0, 50.0)),
+            "Fibonacci": np.where(close <= period_low + 0.236 * price_range, 90.0,
+                                  np.where(close >= period_low + 0.786 * price_range, 10.0, 50.0)),
+            "BB": np.where(close <= ind["bb_lower"], 90.0, np.where(close >= ind["bb_upper"], 10.0, 50.0)),
+            "MS": np.where(is_uptrend, 100.0, np.where(is_downtrend, 0.0, 50.0))
+        }
+
+    technical = sum(INDICATOR_WEIGHTS[name] * score for name, score in scores.items())
+    combined = (COMBINED_WEIGHTS["technical"] * technical +
+                COMBINED_WEIGHTS["fundamental"] * fundamental_score +
+                COMBINED_WEIGHTS["news"] * news_score)
+    signal = np.where(combined >= BUY_THRESHOLD, 1, np.where(combined <= DBUY_THRESHOLD, -1, 0)).astype(np.int8)
+
+    # Bars where any input indicator is still undefined are not decision points
+    defined = np.isfinite(close) & np.isfinite(period_high) & np.isfinite(period_low)
+    for name in ("rsi", "macd", "macd_signal", "atr", "ema_short", "ema_long", "bb_lower", "bb_upper"):
+        defined &= np.isfinite(ind[name])
+
+    scores.update({"technical": technical, "combined": combined, "signal": signal, "defined": defined})
+    return scores
+
+
+def forward_outcomes(low, close, horizon):
+    """
+    Forward return and maximum adverse excursion of a decision at every bar.
+
+    Args:
+        low (np.ndarray): Low prices of shape (symbols, bars)
+        close (np.ndarray): Close prices of shape (symbols, bars)
+        horizon (int): Holding period in bars
+
+    Returns:
+        tuple: (forward return, maximum adverse excursion) arrays of shape
+               (symbols, bars) as fractions; NaN where the horizon runs past the data
+    """
+    forward = np.full(close.shape, np.nan)
+    adverse = np.full(close.shape, np.nan)
+    if horizon < close.shape[1]:
+        future_low = rolling_min(low, horizon)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            forward[:, :-horizon] = close[:, horizon:] / close[:, :-horizon] - 1
+            adverse[:, :-horizon] = np.minimum(future_low[:, horizon:] / close[:, :-horizon] - 1, 0.0)
+    return forward, adverse
+
+
+def _outcome_table(joint, dims, forward, adverse):
+    # Outcome sums per combination of the `dims` three-class labels (see backtest_arrays);
+    # label 3**dims marks excluded points. Axis k of each table is the class of label k.
+    size = 3 ** dims
+    sums = (np.bincount(joint, minlength=size + 1),
+            np.bincount(joint, weights=forward > 0, minlength=size + 1),
+            np.bincount(joint, weights=forward < 0, minlength=size + 1),
+            np.bincount(joint, weights=forward, minlength=size + 1),
+            np.bincount(joint, weights=adverse, minlength=size + 1))
+    return [total[:size].reshape((3,) * dims).T for total in sums]
+
+
+def _class_stats(table, axis, bullish):
+    # Outcome statistics of the three classes of one label (bearish, neutral, bullish)
+    other = tuple(a for a in range(table[0].ndim) if a != axis)
+    counts, rises, falls, returns, excursions = (total.sum(axis=other) for total in table)
+    stats = []
+    for group in range(3):
+        count = int(counts[group])
+        if not count:
+            stats.append({"count": 0, "hit_rate": None, "mean_return_pct": None, "mean_max_adverse_pct": None})
+            continue
+        hits = rises[group] if bullish[group] else falls[group]
+        stats.append({
+            "count": count,
+            "hit_rate": round(float(hits) / count * 100, 2),
+            "mean_return_pct": round(float(returns[group]) / count * 100, 3),
+            "mean_max_adverse_pct": round(float(excursions[group]) / count * 100, 3)
+        })
+    return stats
+
+
+def _decile_table(deciles, excluded, forward):
+    # Count, forward return sum and rise count per combined score decile
+    deciles = np.where(excluded.ravel(), 10, deciles)
+    return np.stack([
+        np.bincount(deciles, minlength=11),
+        np.bincount(deciles, weights=forward.ravel(), minlength=11),
+        np.bincount(deciles, weights=forward.ravel() > 0, minlength=11)
+    ])[:, :10]
+
+
+def _decile_stats(table):
+    counts, sums, ups = table
+    return [{
+        "range": f"{decile * 10}-{decile * 10 + 10}",
+        "count": int(counts[decile]),
+        "mean_return_pct": round(float(sums[decile] / counts[decile]) * 100, 3) if counts[decile] else None,
+        "up_rate": round(float(ups[decile] / counts[decile]) * 100, 2) if counts[decile] else None
+    } for decile in range(10)]
+
+
+def _max_drawdown(equity):
+    # Per-symbol maximum drawdown of equity curves of shape (symbols, bars)
+    return (equity / np.maximum.accumulate(equity, axis=1) - 1).min(axis=1)
+
+
+def strategy_returns(close, signal, evaluated):
+    """
+    Hold each symbol for the next bar whenever the current bar is a Buy.
+
+    Args:
+        close (np.ndarray): Close prices of shape (symbols, bars)
+        signal (np.ndarray): Signals of shape (symbols, bars)
+        evaluated (np.ndarray): Decision points of shape (symbols, bars)
+
+    Returns:
+        dict: Per-symbol arrays of strategy and buy-and-hold total return and maximum
+              drawdown, and the fraction of decision points spent long (exposure)
+    """
+    next_return = np.zeros(close.shape)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        next_return[:, :-1] = close[:, 1:] / close[:, :-1] - 1
+    next_return[~np.isfinite(next_return)] = 0.0
+    tradable = evaluated.copy()
+    tradable[:, -1] = False
+    held = tradable & (signal == 1)
+
+    strategy_equity = np.cumprod(1 + np.where(held, next_return, 0.0), axis=1)
+    hold_equity = np.cumprod(1 + np.where(tradable, next_return, 0.0), axis=1)
+    decisions = np.maximum(tradable.sum(axis=1), 1)
+    return {
+        "total_return": strategy_equity[:, -1] - 1,
+        "max_drawdown": _max_drawdown(strategy_equity),
+        "hold_total_return": hold_equity[:, -1] - 1,
+        "hold_max_drawdown": _max_drawdown(hold_equity),
+        "exposure": held.sum(axis=1) / decisions
+    }
+
+
+def _pct(value, digits=2):
+    return round(float(value) * 100, digits)
+
+
+def _evaluate_chunk(high, low, close, timeframe, horizons, warmup, fundamental_score, news_score, params):
+    # Score one block of symbols and reduce its decisions to additive outcome tables
+    scores = score_bars(high, low, close, timeframe, fundamental_score, news_score, params)
+
+    # Skip each symbol's first bars (left padding included) while recursive indicators settle
+    observed = np.cumsum(np.isfinite(close), axis=1)
+    evaluated = scores["defined"] & (observed > warmup)
+    signal = scores["signal"]
+
+    # Every decision point gets one joint label over the three classes (0 bearish/DBuy,
+    # 1 neutral, 2 bullish/Buy) of the signal and each sub-score, so a handful of
+    # bincounts per horizon yield the statistics of all of them
+    joint = (signal.astype(np.intp) + 1).ravel()
+    for dim, name in enumerate(INDICATOR_WEIGHTS, start=1):
+        joint += (np.sign(scores[name] - 50).astype(np.intp).ravel() + 1) * 3 ** dim
+    dims = len(INDICATOR_WEIGHTS) + 1
+    deciles = np.clip(scores["combined"] // 10, 0, 9).astype(np.intp).ravel()
+
+    chunk = {"tables": {}, "worst": {}, "deciles": {}}
+    for horizon in horizons:
+        forward, adverse = forward_outcomes(low, close, horizon)
+        excluded = ~(evaluated & np.isfinite(forward) & np.isfinite(adverse))
+        forward[excluded] = 0.0
+        adverse[excluded] = 0.0
+        labels = np.where(excluded.ravel(), 3 ** dims, joint)
+        chunk["tables"][horizon] = _outcome_table(labels, dims, forward.ravel(), adverse.ravel())
+        chunk["worst"][horizon] = np.array([np.min(adverse, where=~excluded & (signal == value), initial=0.0)
+                                            for value in (-1, 0, 1)])
+        chunk["deciles"][horizon] = _decile_table(deciles, excluded, forward)
+
+    chunk["strategy"] = strategy_returns(close, signal, evaluated)
+    chunk["decision_points"] = evaluated.sum(axis=1)
+    chunk["signal_counts"] = np.array([np.count_nonzero(evaluated & (signal == value)) for value in (-1, 0, 1)])
+    return chunk
+
+
+def _merge_chunks(total, chunk):
+    if total is None:
+        return chunk
+    for horizon, table in chunk["tables"].items():
+        total["tables"][horizon] = [a + b for a, b in zip(total["tables"][horizon], table)]
+        total["worst"][horizon] = np.minimum(total["worst"][horizon], chunk["worst"][horizon])
+        total["deciles"][horizon] = total["deciles"][horizon] + chunk["deciles"][horizon]
+    total["strategy"] = {name: np.concatenate([values, chunk["strategy"][name]])
+                         for name, values in total["strategy"].items()}
+    total["decision_points"] = np.concatenate([total["decision_points"], chunk["decision_points"]])
+    total["signal_counts"] = total["signal_counts"] + chunk["signal_counts"]
+    return total
+
+
+def backtest_arrays(high, low, close, timeframe="short", horizons=DEFAULT_HORIZONS, warmup=None,
+                    fundamental_score=50.0, news_score=50.0, params=None, symbols=None,
+                    chunk_symbols=CHUNK_SYMBOLS):
+    """
+    Backtest the scoring model over aligned (symbols x bars) price matrices.
+
+    Args:
+        high (np.ndarray): High prices of shape (symbols, bars)
+        low (np.ndarray): Low prices of shape (symbols, bars)
+        close (np.ndarray): Close prices of shape (symbols, bars)
+        timeframe (str): Trading timeframe; sets the Fibonacci high/low period
+        horizons (tuple): Forward horizons in bars
+        warmup (int, optional): Bars of each symbol's history skipped before the first
+            decision (default: the longer of the Fibonacci period and two EMA50 spans)
+        fundamental_score (float): Fundamental score assumed at every bar
+        news_score (float): News sentiment score assumed at every bar
+        params (dict, optional): Indicator parameter overrides
+        symbols (list, optional): Symbol names; adds per-symbol strategy results
+        chunk_symbols (int): Symbols evaluated per vectorized pass (bounds memory use)
+
+    Returns:
+        dict: Universe size, decision counts, throughput, per-signal and per-indicator
+              outcome statistics by horizon, score deciles and strategy results
+    """
+    high, low, close = (np.asarray(values, dtype=np.float64) for values in (high, low, close))
+    if close.ndim == 1:
+        high, low, close = high[np.newaxis, :], low[np.newaxis, :], close[np.newaxis, :]
+    p = engine.resolve_params(params)
+    if warmup is None:
+        warmup = max(lookback_bars(timeframe), 2 * p["ema_long"])
+    horizons = tuple(int(horizon) for horizon in horizons)
+
+    start = time.perf_counter()
+    total = None
+    for first in range(0, close.shape[0], max(int(chunk_symbols), 1)):
+        rows = slice(first, first + chunk_symbols)
+        chunk = _evaluate_chunk(high[rows], low[rows], close[rows], timeframe, horizons, warmup,
+                                fundamental_score, news_score, params)
+        total = _merge_chunks(total, chunk)
+    elapsed = time.perf_counter() - start
+    if total is None:
+        return {"error": "No price history to backtest"}
+
+    by_signal = {name: {} for name in SIGNALS}
+    by_indicator = {name: {} for name in INDICATOR_WEIGHTS}
+    for horizon in horizons:
+        table = total["tables"][horizon]
+        # Buy and Neutral are right when the price rises, DBuy when it falls
+        stats = _class_stats(table, 0, bullish=(False, True, True))
+        for name, value in SIGNALS.items():
+            by_signal[name][horizon] = dict(stats[value + 1],
+                                            worst_max_adverse_pct=_pct(total["worst"][horizon][value + 1], 3))
+        for dim, name in enumerate(INDICATOR_WEIGHTS, start=1):
+            bearish, _, bullish = _class_stats(table, dim, bullish=(False, True, True))
+            by_indicator[name][horizon] = {"bullish": bullish, "bearish": bearish}
+
+    strategy = total["strategy"]
+    active = total["decision_points"] > 0
+    summary = {"symbols": int(np.count_nonzero(active))}
+    if active.any():
+        summary.update({
+            "mean_total_return_pct": _pct(strategy["total_return"][active].mean()),
+            "median_max_drawdown_pct": _pct(np.median(strategy["max_drawdown"][active])),
+            "worst_max_drawdown_pct": _pct(strategy["max_drawdown"][active].min()),
+            "mean_exposure_pct": _pct(strategy["exposure"][active].mean()),
+            "hold_mean_total_return_pct": _pct(strategy["hold_total_return"][active].mean()),
+            "hold_median_max_drawdown_pct": _pct(np.median(strategy["hold_max_drawdown"][active]))
+        })
+
+    symbol_bars = int(close.size)
+    report = {
+        "timeframe": timeframe,
+        "symbols": int(close.shape[0]),
+        "bars": int(close.shape[1]),
+        "symbol_bars": symbol_bars,
+        "decision_points": int(total["decision_points"].sum()),
+        "warmup_bars": int(warmup),
+        "horizons": list(horizons),
+        "assumed_scores": {"fundamental": fundamental_score, "news": news_score},
+        "signal_counts": {name: int(total["signal_counts"][value + 1]) for name, value in SIGNALS.items()},
+        "signals": by_signal,
+        "indicators": by_indicator,
+        "score_deciles": {horizon: _decile_stats(table) for horizon, table in total["deciles"].items()},
+        "strategy": summary,
+        "timing": {
+            "total_seconds": round(elapsed, 4),
+            "symbol_bars_per_second": int(symbol_bars / elapsed) if elapsed > 0 else None,
+            "indicator_backend": get_backend().name
+        }
+    }
+
+    if symbols is not None:
+        report["per_symbol"] = {
+            symbol: {
+                "decision_points": int(total["decision_points"][row]),
+                "total_return_pct": _pct(strategy["total_return"][row]),
+                "max_drawdown_pct": _pct(strategy["max_drawdown"][row]),
+                "hold_total_return_pct": _pct(strategy["hold_total_return"][row]),
+                "exposure_pct": _pct(strategy["exposure"][row])
+            }
+            for row, symbol in enumerate(symbols) if active[row]
+        }
+
+    logger.info(f"Backtested {report['symbols']} symbols x {report['bars']} bars in {elapsed:.3f}s "
+                f"({report['timing']['symbol_bars_per_second']} symbol-bars/s)")
+    return report
+
+
+def backtest_histories(histories, timeframe="short", horizons=DEFAULT_HORIZONS, **kwargs):
+    """
+    Backtest the scoring model over per-ticker OHLCV DataFrames.
+
+    Args:
+        histories (dict): Mapping of ticker to OHLCV DataFrame
+        timeframe (str): Trading timeframe
+        horizons (tuple): Forward horizons in bars
+        **kwargs: Further backtest_arrays options
+
+    Returns:
+        dict: Backtest report (see backtest_arrays) with per-symbol strategy results
+    """
+    symbols, matrices, _ = engine.align_histories(histories)
+    if not symbols:
+        return {"error": "No price history to backtest"}
+    return backtest_arrays(matrices["High"], matrices["Low"], matrices["Close"], timeframe, horizons,
+                           symbols=symbols, **kwargs)
+
+
+def run_backtest(tickers, period="5y", timeframe="short", horizons=DEFAULT_HORIZONS, **kwargs):
+    """
+    Download daily histories for a universe and backtest the scoring model.
+
+    Args:
+        tickers (list): Ticker symbols
+        period (str): Yahoo Finance history period (default: 5y)
+        timeframe (str): Trading timeframe
+        horizons (tuple): Forward horizons in bars
+        **kwargs: Further backtest_arrays options
+
+    Returns:
+        dict: Backtest report, or a dict with an "error" key
+    """
+    try:
+        start = time.perf_counter()
+        histories = download_history_batch(list(tickers), period=period, interval="1d")
+        download_seconds = time.perf_counter() - start
+        report = backtest_histories(histories, timeframe, horizons, **kwargs)
+        if "error" not in report:
+            report["period"] = period
+            report["timing"]["download_seconds"] = round(download_seconds, 3)
+            report["missing_tickers"] = [ticker for ticker in tickers
+                                         if histories.get(ticker) is None or histories[ticker].empty]
+        return report
+    except Exception as e:
+        logger.error(f"Error running backtest: {e}")
+        return {"error": str(e)}
+
+
+def main(argv=None):
+    """Command line entry point."""
+    import json
+    parser = argparse.ArgumentParser(description="Backtest the swing trading scoring model")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--tickers", help="Comma-separated ticker symbols")
+    source.add_argument("--index", action="append", help="Backtest the constituents of an index (repeatable)")
+    source.add_argument("--synthetic", metavar="SYMBOLSxBARS",
+                        help="Benchmark on random-walk prices, e.g. 500x2500")
+    parser.add_argument("--period", default="5y", help="History period (default: 5y)")
+    parser.add_argument("--timeframe", default="short", help="short, medium or long (default: short)")
+    parser.add_argument("--horizons", default=",".join(str(h) for h in DEFAULT_HORIZONS),
+                        help="Comma-separated forward horizons in bars")
+    parser.add_argument("--per-symbol", action="store_true", help="Include per-symbol strategy results")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    horizons = tuple(int(h) for h in args.horizons.split(","))
+    if args.synthetic:
+        symbols, bars = (int(n) for n in args.synthetic.lower().split("x"))
+        high, low, close = synthetic_ohlc(symbols, bars)
+        report = backtest_arrays(high, low, close, args.timeframe, horizons)
+    else:
+        if args.index:
+            from eod_scores import universe_members
+            tickers = list(universe_members(args.index))
+        else:
+            tickers = [t.strip().upper() for t in args.tickers.split(",") if t.strip()]
+        report = run_backtest(tickers, args.period, args.timeframe, horizons)
+        if not args.per_symbol:
+            report.pop("per_symbol", None)
+    print(json.dumps(report, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
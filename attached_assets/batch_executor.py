@@ -0,0 +1,208 @@
+"""
+PyTrade - Batch Executor Module
+
+This module runs per-ticker batch work in parallel. I/O-bound stages (history,
+company info, news) run on a bounded thread pool; the CPU-bound indicator stage can
+optionally be split across a process pool. Results are always returned in request
+order, every ticker has its own timeout measured from when it starts running, and a
+failing or slow ticker is reported in place instead of failing the whole batch, so
+batch latency follows the slowest ticker rather than the sum of all of them.
+
+Key features:
+- Bounded thread pool for I/O stages (PYTRADE_BATCH_IO_WORKERS)
+- Optional process pool for CPU stages (PYTRADE_BATCH_CPU_WORKERS, 0 disables it)
+- Per-ticker timeouts (PYTRADE_BATCH_TICKER_TIMEOUT)
+- Ordered results with per-ticker error entries and a failure summary
+- Pools created lazily per process so they survive gunicorn's pre-fork model
+
+Author: PyTrade Development Team
+Version: 1.0.0
+Date: October 17, 2026
+License: Proprietary
+"""
+
+import os
+import time
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+logger = logging.getLogger(__name__)
+
+IO_WORKERS = int(os.environ.get("PYTRADE_BATCH_IO_WORKERS", 8))
+CPU_WORKERS = int(os.environ.get("PYTRADE_BATCH_CPU_WORKERS", 0))
+TICKER_TIMEOUT = float(os.environ.get("PYTRADE_BATCH_TICKER_TIMEOUT", 30))
+# Below this many items the process pool is not worth the pickling overhead
+CPU_MIN_BATCH = int(os.environ.get("PYTRADE_BATCH_CPU_MIN_BATCH", 200))
+# Longest wait between checks for tickers that exceeded their timeout
+DEADLINE_POLL_INTERVAL = 1.0
+
+
+def default_error(item, message):
+    """
+    Build the per-ticker error entry used when a task fails or times out.
+
+    Args:
+        item: The batch item (usually a ticker symbol)
+        message (str): Error description
+
+    Returns:
+        dict: {"ticker": item, "error": message}
+    """
+    return {"ticker": item, "error": message}
+
+
+class BatchExecutor:
+    """
+    Parallel executor for per-ticker batch work.
+    """
+
+    def __init__(self, io_workers=IO_WORKERS, cpu_workers=CPU_WORKERS, timeout=TICKER_TIMEOUT):
+        self.io_workers = max(1, io_workers)
+        self.cpu_workers = max(0, cpu_workers)
+        self.timeout = timeout
+        self._io_pool = None
+        self._cpu_pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _pools(self):
+        # Pools (and their threads/processes) do not survive fork; recreate them per worker
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._io_pool = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="batch-io")
+                self._cpu_pool = None
+                if self.cpu_workers:
+                    # spawn: forking a process that runs threads is not safe
+                    self._cpu_pool = ProcessPoolExecutor(max_workers=self.cpu_workers,
+                                                         mp_context=multiprocessing.get_context("spawn"))
+            return self._io_pool, self._cpu_pool
+
+    def iter_completed(self, func, items, timeout=None, on_error=default_error, label="batch"):
+        """
+        Apply func to every item on the I/O thread pool, yielding results as they finish.
+
+        Closing the generator early (e.g. when a streaming client disconnects)
+        cancels the items that have not started yet.
+
+        Args:
+            func (callable): Called with one item
+            items (list): Batch items, e.g. ticker symbols
+            timeout (float, optional): Per-item timeout in seconds, counted from when
+                the item starts running (default: the executor timeout; 0 disables it)
+            on_error (callable): Builds the result entry for a failed or timed-out item
+                from (item, message)
+            label (str): Name used in log messages
+
+        Yields:
+            tuple: (index in items, result, error message or None), in completion order
+        """
+        items = list(items)
+        timeout = self.timeout if timeout is None else timeout
+        io_pool, _ = self._pools()
+        started = {}
+        batch_start = time.monotonic()
+
+        def run(index, item):
+            started[index] = time.monotonic()
+            return func(item)
+
+        futures = {io_pool.submit(run, index, item): index for index, item in enumerate(items)}
+        pending = set(futures)
+        failed, timed_out = [], []
+
+        try:
+            while pending:
+                now = time.monotonic()
+                deadlines = [started[futures[f]] + timeout for f in pending if futures[f] in started] if timeout else []
+                wait_for = min([max(0.0, d - now) for d in deadlines] + [DEADLINE_POLL_INTERVAL])
+                done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    index = futures[future]
+                    try:
+                        yield index, future.result(), None
+                    except Exception as e:
+                        logger.error(f"{label}: {items[index]} failed: {e}")
+                        failed.append(items[index])
+                        yield index, on_error(items[index], str(e)), str(e)
+
+                if timeout:
+                    now = time.monotonic()
+                    for future in list(pending):
+                        index = futures[future]
+                        if index in started and now - started[index] > timeout:
+                            # The thread cannot be interrupted; its result is discarded
+                            pending.discard(future)
+                            message = f"Timed out after {timeout:g}s"
+                            timed_out.append(items[index])
+                            yield index, on_error(items[index], message), message
+        finally:
+            for future in pending:
+                future.cancel()
+
+        elapsed = time.monotonic() - batch_start
+        if failed or timed_out:
+            logger.warning(f"{label}: {len(items) - len(failed) - len(timed_out)}/{len(items)} succeeded "
+                           f"in {elapsed:.2f}s (failed: {failed}, timed out: {timed_out})")
+        else:
+            logger.info(f"{label}: {len(items)} items completed in {elapsed:.2f}s")
+
+    def map_ordered(self, func, items, timeout=None, on_error=default_error, label="batch"):
+        """
+        Apply func to every item on the I/O thread pool.
+
+        Args:
+            func (callable): Called with one item
+            items (list): Batch items, e.g. ticker symbols
+            timeout (float, optional): Per-item timeout in seconds (see iter_completed)
+            on_error (callable): Builds the result entry for a failed or timed-out item
+                from (item, message)
+            label (str): Name used in log messages
+
+        Returns:
+            list: One result per item, in the order of items
+        """
+        items = list(items)
+        results = [None] * len(items)
+        for index, result, _ in self.iter_completed(func, items, timeout, on_error, label):
+            results[index] = result
+        return results
+
+    def run_chunked(self, func, mapping, min_size=CPU_MIN_BATCH):
+        """
+        Run a CPU-bound function over a dict, split across the process pool.
+
+        func must be picklable (a module-level function or functools.partial of one)
+        and return a dict; the partial results are merged. Without a process pool, or
+        for small inputs, func runs once in the calling thread.
+
+        Args:
+            func (callable): Called with a dict subset, returns a dict
+            mapping (dict): Input items, e.g. ticker to history
+            min_size (int): Minimum number of items before the work is split
+
+        Returns:
+            dict: Merged results, in the order of mapping
+        """
+        _, cpu_pool = self._pools()
+        if cpu_pool is None or len(mapping) < max(min_size, 2):
+            return func(mapping)
+
+        keys = list(mapping)
+        chunk_count = min(self.cpu_workers, len(keys))
+        chunks = [{key: mapping[key] for key in keys[i::chunk_count]} for i in range(chunk_count)]
+        merged = {}
+        try:
+            for part in cpu_pool.map(func, chunks, timeout=self.timeout or None):
+                merged.update(part)
+        except Exception as e:
+            logger.error(f"Process pool failed ({e}), running {len(keys)} items in-process")
+            return func(mapping)
+        return {key: merged[key] for key in keys if key in merged}
+
+
+# Shared executor for swing trading batches
+executor = BatchExecutor()
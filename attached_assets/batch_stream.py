@@ -0,0 +1,118 @@
+"""
+PyTrade - Batch Stream Module
+
+This module streams batch analysis results to the client as each ticker finishes
+instead of returning one JSON array at the end. The stream format is chosen by the
+request: an Accept header of application/x-ndjson (or stream=true) gives chunked
+newline-delimited JSON, and Accept: text/event-stream (or stream=sse) gives
+Server-Sent Events. Results are written as they complete, so the first record
+arrives after one ticker's latency and finished results are not held in memory.
+
+Every stream ends with a summary record.
+
+Record format (one JSON object per NDJSON line / SSE event):
+- {"type": "result", "index": <position in the request>, "ticker": ..., "data": {...}}
+- {"type": "error", "message": ...} if the batch itself fails mid-stream
+- {"type": "summary", "total": ..., "succeeded": ..., "failed": ...,
+   "failed_tickers": [...], "elapsed_seconds": ...}
+
+Key features:
+- Stream mode negotiation from the Accept header or the stream query parameter
+- Chunked NDJSON and Server-Sent Events encodings
+- Results emitted in completion order with their request index
+- End-of-stream summary with failure reporting
+
+Author: PyTrade Development Team
+Version: 1.0.0
+Date: October 17, 2026
+License: Proprietary
+"""
+
+import time
+import logging
+from flask import request, current_app, Response, stream_with_context
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+SSE_MIMETYPE = "text/event-stream"
+
+
+def requested_stream_format():
+    """
+    Determine whether the client asked for a streamed response.
+
+    Returns:
+        str: "ndjson", "sse" or None for a regular JSON response
+    """
+    stream = request.args.get("stream", "").lower()
+    if stream == "false":
+        return None
+    # Only explicit media types count; a wildcard Accept keeps the JSON response
+    accepted = {value for value, quality in request.accept_mimetypes if quality > 0}
+    if stream == "sse" or SSE_MIMETYPE in accepted:
+        return "sse"
+    if stream in ("true", "ndjson") or NDJSON_MIMETYPE in accepted:
+        return "ndjson"
+    return None
+
+
+def encode_record(record, stream_format):
+    """
+    Encode one record for the stream.
+
+    Args:
+        record (dict): Record to send
+        stream_format (str): "ndjson" or "sse"
+
+    Returns:
+        str: NDJSON line or SSE event
+    """
+    payload = current_app.json.dumps(record)
+    if stream_format == "sse":
+        return f"event: {record.get('type', 'message')}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+
+def stream_batch(records, stream_format, label="batch"):
+    """
+    Build a streaming response from a batch result generator.
+
+    Args:
+        records (iterable): Yields (index, ticker, result, error) as tickers complete;
+            error is None on success
+        stream_format (str): "ndjson" or "sse"
+        label (str): Name used in log messages
+
+    Returns:
+        Response: Streaming Flask response
+    """
+    def generate():
+        start = time.monotonic()
+        total, failed_tickers = 0, []
+        try:
+            for index, ticker, result, error in records:
+                total += 1
+                if error or (isinstance(result, dict) and result.get("error")):
+                    failed_tickers.append(ticker)
+                yield encode_record({"type": "result", "index": index, "ticker": ticker, "data": result},
+                                    stream_format)
+        except Exception as e:
+            logger.error(f"{label}: stream aborted: {e}")
+            yield encode_record({"type": "error", "message": str(e)}, stream_format)
+
+        yield encode_record({
+            "type": "summary",
+            "total": total,
+            "succeeded": total - len(failed_tickers),
+            "failed": len(failed_tickers),
+            "failed_tickers": failed_tickers,
+            "elapsed_seconds": round(time.monotonic() - start, 3)
+        }, stream_format)
+
+    mimetype = SSE_MIMETYPE if stream_format == "sse" else NDJSON_MIMETYPE
+    response = Response(stream_with_context(generate()), mimetype=mimetype)
+    response.headers["Cache-Control"] = "no-cache"
+    # Ask reverse proxies (nginx) not to buffer the stream
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
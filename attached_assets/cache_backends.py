@@ -0,0 +1,422 @@
+"""
+PyTrade - Cache Backends Module
+
+This module provides the storage backends behind the PyTrade caching decorators.
+Gunicorn runs several worker processes per host; with a purely in-process cache each
+worker keeps its own copy of every entry and fetches the same upstream data again.
+The SQLite backend stores entries in a WAL-mode database file that every worker on
+the host reads and writes, and the Redis backend shares entries across hosts.
+
+The backend is selected with the PYTRADE_CACHE_BACKEND environment variable
+(memory, sqlite or redis). All backends expose the same get/set/delete/stats
+interface as ttl_cache.TTLCache, so the decorators do not depend on the choice.
+
+Key features:
+- In-process memory backend (bounded TTL LRU cache)
+- Host-wide SQLite backend in WAL mode with TTL and size bounds
+- Optional Redis backend with an injectable client (falls back to SQLite)
+- Values stored as pickles, so dictionaries and serialized responses can be shared
+
+Author: PyTrade Development Team
+Version: 1.0.0
+Date: October 17, 2026
+License: Proprietary
+"""
+
+import os
+import time
+import pickle
+import sqlite3
+import logging
+import threading
+from ttl_cache import TTLCache, DEFAULT_MAX_ENTRIES, DEFAULT_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+# Constants
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_BACKEND = os.environ.get("PYTRADE_CACHE_BACKEND", "sqlite").lower()
+SQLITE_PATH = os.environ.get("PYTRADE_CACHE_SQLITE_PATH", os.path.join(BASE_DIR, "cache", "shared_cache.db"))
+REDIS_URL = os.environ.get("PYTRADE_CACHE_REDIS_URL", "redis://localhost:6379/0")
+# Number of writes between two purges of expired and excess entries
+PURGE_EVERY = 200
+
+
+class MemoryBackend(TTLCache):
+    """
+    Per-process cache backend (entries are not shared between workers).
+    """
+
+    backend = "memory"
+
+
+class _BackendStats:
+    """Per-worker counters kept by the shared backends."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "sets": 0, "expired": 0, "evictions": 0, "errors": 0}
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def snapshot(self):
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+
+class SQLiteBackend:
+    """
+    Host-wide cache backend stored in a WAL-mode SQLite database.
+
+    Every namespace uses its own table so that sizes and purges are independent.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, name="cache", path=SQLITE_PATH, max_entries=DEFAULT_MAX_ENTRIES,
+                 max_bytes=DEFAULT_MAX_BYTES, default_ttl=300):
+        self.name = name
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.table = "cache_" + "".join(ch if ch.isalnum() else "_" for ch in name)
+        self._local = threading.local()
+        self._stats = _BackendStats()
+        self._writes = 0
+
+    def _connection(self):
+        # Connections must not cross fork or thread boundaries
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL, "
+            "stored_at REAL NOT NULL, size INTEGER NOT NULL)"
+        )
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_expires ON {self.table} (expires_at)")
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _fetch(self, key):
+        row = self._connection().execute(
+            f"SELECT value, expires_at, stored_at FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return pickle.loads(row[0]), row[1], row[2]
+
+    def get(self, key, default=None):
+        """
+        Get a live value from the cache.
+
+        Args:
+            key (str): Cache key
+            default: Value returned on a miss
+
+        Returns:
+            The cached value, or default if missing or expired
+        """
+        try:
+            entry = self._fetch(key)
+        except Exception as e:
+            logger.error(f"Cache [{self.name}] read failed for {key}: {e}")
+            self._stats.incr("errors")
+            return default
+        if entry is None or entry[1] <= time.time():
+            self._stats.incr("misses")
+            if entry is not None:
+                self._stats.incr("expired")
+            return default
+        self._stats.incr("hits")
+        return entry[0]
+
+    def get_entry(self, key):
+        """
+        Get a value together with its timestamps, including expired entries.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            tuple: (value, expires_at, stored_at) or None if the key is absent
+        """
+        try:
+            return self._fetch(key)
+        except Exception as e:
+            logger.error(f"Cache [{self.name}] read failed for {key}: {e}")
+            self._stats.incr("errors")
+            return None
+
+    def set(self, key, value, ttl=None, size=None):
+        """
+        Store a value in the cache.
+
+        Args:
+            key (str): Cache key
+            value: Picklable value to store
+            ttl (int, optional): Time to live in seconds (default: the cache default)
+            size (int, optional): Ignored; the pickled size is used
+        """
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning(f"Cache [{self.name}] value for {key} is not picklable, not cached: {e}")
+            return
+        if len(blob) > self.max_bytes:
+            logger.warning(f"Cache [{self.name}] value for {key} ({len(blob)} bytes) exceeds the byte budget, not cached")
+            return
+
+        now = time.time()
+        expires_at = now + (self.default_ttl if ttl is None else ttl)
+        try:
+            self._connection().execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at, stored_at, size) VALUES (?, ?, ?, ?, ?)",
+                (key, sqlite3.Binary(blob), expires_at, now, len(blob))
+            )
+            self._stats.incr("sets")
+            self._writes += 1
+            if self._writes % PURGE_EVERY == 0:
+                self.sweep()
+        except Exception as e:
+            logger.error(f"Cache [{self.name}] write failed for {key}: {e}")
+            self._stats.incr("errors")
+
+    def delete(self, key):
+        """
+        Remove a key from the cache.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            bool: True if the key was present
+        """
+        cursor = self._connection().execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+        return cursor.rowcount > 0
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        self._connection().execute(f"DELETE FROM {self.table}")
+
+    def sweep(self):
+        """
+        Remove expired entries, then the oldest entries beyond the size limits.
+
+        Returns:
+            int: Number of entries removed
+        """
+        conn = self._connection()
+        removed = conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (time.time(),)).rowcount
+        self._stats.incr("expired", removed)
+
+        count, total_bytes = conn.execute(f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}").fetchone()
+        if count > self.max_entries or total_bytes > self.max_bytes:
+            excess_rows = max(0, count - self.max_entries)
+            excess_bytes = max(0, total_bytes - self.max_bytes)
+            evicted = 0
+            for key, size in conn.execute(f"SELECT key, size FROM {self.table} ORDER BY stored_at").fetchall():
+                if excess_rows <= 0 and excess_bytes <= 0:
+                    break
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                excess_rows -= 1
+                excess_bytes -= size
+                evicted += 1
+            self._stats.incr("evictions", evicted)
+            removed += evicted
+        return removed
+
+    def __contains__(self, key):
+        entry = self.get_entry(key)
+        return entry is not None and entry[1] > time.time()
+
+    def __len__(self):
+        return self._connection().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: This worker's counters plus the shared entry count and byte usage
+        """
+        stats = self._stats.snapshot()
+        try:
+            count, total_bytes = self._connection().execute(
+                f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}"
+            ).fetchone()
+        except Exception:
+            count, total_bytes = None, None
+        stats.update({
+            "backend": self.backend,
+            "entries": count,
+            "bytes": total_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes
+        })
+        return stats
+
+
+class RedisBackend:
+    """
+    Cache backend stored in Redis (shared across hosts).
+
+    The client can be injected, so any object implementing the redis-py
+    get/set/delete/pttl/scan_iter interface (for example fakeredis) can be used.
+    """
+
+    backend = "redis"
+
+    def __init__(self, name="cache", client=None, url=REDIS_URL, default_ttl=300, max_bytes=DEFAULT_MAX_BYTES):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url)
+        self.name = name
+        self.client = client
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.prefix = f"pytrade:{name}:"
+        self._stats = _BackendStats()
+
+    def get(self, key, default=None):
+        """
+        Get a live value from the cache.
+
+        Args:
+            key (str): Cache key
+            default: Value returned on a miss
+
+        Returns:
+            The cached value, or default if missing or expired
+        """
+        entry = self.get_entry(key)
+        if entry is None or entry[1] <= time.time():
+            self._stats.incr("misses")
+            return default
+        self._stats.incr("hits")
+        return entry[0]
+
+    def get_entry(self, key):
+        """
+        Get a value together with its timestamps.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            tuple: (value, expires_at, stored_at) or None if the key is absent
+        """
+        try:
+            blob = self.client.get(self.prefix + key)
+        except Exception as e:
+            logger.error(f"Cache [{self.name}] read failed for {key}: {e}")
+            self._stats.incr("errors")
+            return None
+        if blob is None:
+            return None
+        return pickle.loads(blob)
+
+    def set(self, key, value, ttl=None, size=None):
+        """
+        Store a value in the cache.
+
+        Args:
+            key (str): Cache key
+            value: Picklable value to store
+            ttl (int, optional): Time to live in seconds (default: the cache default)
+            size (int, optional): Ignored; the pickled size is used
+        """
+        now = time.time()
+        ttl = self.default_ttl if ttl is None else ttl
+        try:
+            blob = pickle.dumps((value, now + ttl, now), protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning(f"Cache [{self.name}] value for {key} is not picklable, not cached: {e}")
+            return
+        if len(blob) > self.max_bytes:
+            return
+        try:
+            self.client.set(self.prefix + key, blob, ex=max(1, int(ttl)))
+            self._stats.incr("sets")
+        except Exception as e:
+            logger.error(f"Cache [{self.name}] write failed for {key}: {e}")
+            self._stats.incr("errors")
+
+    def delete(self, key):
+        """
+        Remove a key from the cache.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            bool: True if the key was present
+        """
+        return bool(self.client.delete(self.prefix + key))
+
+    def clear(self):
+        """Remove every entry in this namespace."""
+        for redis_key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(redis_key)
+
+    def sweep(self):
+        """Redis expires keys itself; nothing to sweep."""
+        return 0
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: This worker's counters
+        """
+        stats = self._stats.snapshot()
+        stats["backend"] = self.backend
+        return stats
+
+
+def create_cache(name, default_ttl=300, backend=None):
+    """
+    Create the cache for a namespace using the configured backend.
+
+    Args:
+        name (str): Cache namespace (e.g. api, responses, app)
+        default_ttl (int): Default time to live in seconds
+        backend (str, optional): memory, sqlite or redis (default: PYTRADE_CACHE_BACKEND)
+
+    Returns:
+        Cache backend instance
+    """
+    backend = (backend or CACHE_BACKEND).lower()
+    if backend == "redis":
+        try:
+            cache = RedisBackend(name=name, default_ttl=default_ttl)
+            cache.client.ping()
+            logger.info(f"Cache [{name}] using Redis backend at {REDIS_URL}")
+            return cache
+        except Exception as e:
+            logger.warning(f"Redis cache backend unavailable ({e}), falling back to SQLite")
+            backend = "sqlite"
+    if backend == "sqlite":
+        try:
+            cache = SQLiteBackend(name=name, default_ttl=default_ttl)
+            cache._connection()
+            logger.info(f"Cache [{name}] using SQLite backend at {cache.path}")
+            return cache
+        except Exception as e:
+            logger.warning(f"SQLite cache backend unavailable ({e}), falling back to memory")
+    return MemoryBackend(name=name, default_ttl=default_ttl)
@@ -0,0 +1,531 @@
+"""
+PyTrade - End-of-Day Scores Module
+
+This module precomputes the swing trading scores for every constituent of the
+supported universes (SUPPORTED_INDICES in stock_data_manager_updated) once per
+trading day, so that screening does not trigger hundreds of live analyses. The
+pipeline downloads the daily histories in bulk, computes the indicators in one
+vectorized pass, scores each ticker with the same functions the live analysis uses
+(analyze_technical_indicators, analyze_fundamentals, combine_scores) and writes the
+result as a columnar table: one NumPy array per column in a compressed .npz file.
+
+A ticker that belongs to several indices is stored once; its index membership is a
+bitmask over SUPPORTED_INDICES. Screener queries are boolean masks and an argsort
+over the loaded arrays and answer in milliseconds.
+
+The table is rebuilt after the Indian and US market closes (PYTRADE_EOD_SCORE_SCHEDULE,
+UTC times) by a background refresher; a file lock ensures only one worker per host
+builds it, and every worker reloads the file when it changes. It can also be built
+from cron:
+    python eod_scores.py --timeframe short
+
+Key features:
+- Bulk history download and vectorized indicators for all supported universes
+- Technical sub-scores, technical, fundamental and combined scores per ticker
+- Compact columnar .npz storage with atomic replacement
+- Filter, sort and page queries over the loaded table
+- Post-close refresh schedule with a host-wide build lock and bounded retries
+
+Author: PyTrade Development Team
+Version: 1.0.0
+Date: October 17, 2026
+License: Proprietary
+"""
+
+import os
+import json
+import time
+import fcntl
+import logging
+import argparse
+import threading
+import datetime
+import numpy as np
+import yfinance as yf
+from stock_data_manager_updated import SUPPORTED_INDICES, get_data as get_index_data
+from indicesdownload import get_index_constituents
+from market_data import download_history_batch, to_yahoo_ticker
+from indicator_memo import memo as indicator_memo
+from batch_executor import executor as batch_executor
+from swing_trading_service import (
+    analyze_technical_indicators, analyze_fundamentals, analyze_news_sentiment,
+    combine_scores, resolve_timeframe_period
+)
+
+logger = logging.getLogger(__name__)
+
+# Constants
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SCORE_TABLE_PATH = os.environ.get("PYTRADE_EOD_SCORE_PATH", os.path.join(BASE_DIR, "cache", "eod_scores.npz"))
+SCORE_TIMEFRAME = os.environ.get("PYTRADE_EOD_SCORE_TIMEFRAME", "short")
+# UTC build times: one hour after the NSE close (15:30 IST) and after the NYSE close (16:00 ET)
+SCORE_SCHEDULE = os.environ.get("PYTRADE_EOD_SCORE_SCHEDULE", "11:00,21:30")
+REFRESH_CHECK_INTERVAL = 300
+# A failed scheduled build is retried this many times, this many seconds apart; after
+# that the refresher waits for the next scheduled time
+BUILD_RETRIES = int(os.environ.get("PYTRADE_EOD_SCORE_RETRIES", 2))
+BUILD_RETRY_DELAY = int(os.environ.get("PYTRADE_EOD_SCORE_RETRY_DELAY", 1800))
+INDIAN_INDEX_PREFIXES = ("NIFTY", "BSE")
+
+# Technical sub-scores, keyed by the section of analyze_technical_indicators' result
+SUB_SCORES = {
+    "RSI": "rsi_score",
+    "MACD": "macd_score",
+    "ATR": "atr_score",
+    "EMA": "ema_score",
+    "Fibonacci": "fibonacci_score",
+    "BB": "bb_score",
+    "MS": "ms_score"
+}
+
+STRING_COLUMNS = ("symbol", "company", "bar_date", "combined_overall_signal")
+FLOAT_COLUMNS = (
+    "close", "change_pct", "volume", "rsi", "macd", "macd_signal", "macd_hist", "atr", "atr_pct",
+    "ema_short", "ema_long", "bb_lower", "bb_middle", "bb_upper"
+) + tuple(SUB_SCORES.values()) + (
+    "overall_ta_score", "overall_fa_score", "news_sentiment_score", "combined_overall_score"
+)
+INT_COLUMNS = ("indices",)
+COLUMNS = STRING_COLUMNS + INT_COLUMNS + FLOAT_COLUMNS
+
+
+def universe_members(indices=SUPPORTED_INDICES):
+    """
+    Collect the constituents of the given indices, one entry per ticker.
+
+    Args:
+        indices (list): Index names from SUPPORTED_INDICES
+
+    Returns:
+        dict: Mapping of Yahoo Finance ticker to {"company", "indices" (bitmask)}
+    """
+    members = {}
+    for index_name in indices:
+        bit = 1 << SUPPORTED_INDICES.index(index_name)
+        try:
+            constituents = get_index_data(index_name) or get_index_constituents(index_name)
+        except Exception as e:
+            logger.error(f"Could not load constituents for {index_name}: {e}")
+            continue
+        for entry in constituents or []:
+            if isinstance(entry, dict):
+                symbol = entry.get("symbol") or entry.get("Symbol") or entry.get("ticker")
+                company = entry.get("company") or entry.get("name") or entry.get("Company") or ""
+            else:
+                symbol, company = entry, ""
+            if not symbol:
+                continue
+            symbol = str(symbol).strip().upper()
+            if index_name.upper().startswith(INDIAN_INDEX_PREFIXES) and "." not in symbol:
+                symbol = f"{symbol}.NS"
+            ticker = to_yahoo_ticker(symbol)
+            member = members.setdefault(ticker, {"company": company, "indices": 0})
+            member["indices"] |= bit
+            member["company"] = member["company"] or company
+    return members
+
+
+def score_ticker(ticker, hist, latest, timeframe="short", include_fundamentals=True):
+    """
+    Score one ticker from its history and latest indicator values.
+
+    Args:
+        ticker (str): Ticker symbol
+        hist (pd.DataFrame): Daily OHLCV history
+        latest (dict): Latest indicator values (see indicator_engine.screen_histories)
+        timeframe (str): Trading timeframe
+        include_fundamentals (bool): Fetch fundamentals (otherwise a neutral 50 is used)
+
+    Returns:
+        dict: One table row (without symbol, company and indices)
+    """
+    analysis = analyze_technical_indicators(hist, ticker, timeframe, latest=latest)
+    fa_score = analyze_fundamentals(yf.Ticker(ticker))["overall_fa_score"] if include_fundamentals else 50
+    news_score = analyze_news_sentiment(ticker)["score"]
+    combined_score, combined_signal = combine_scores(analysis["overall_ta_score"], fa_score, news_score)
+
+    close = hist["Close"]
+    row = {
+        "bar_date": str(hist.index[-1].date()),
+        "close": float(close.iat[-1]),
+        "change_pct": float((close.iat[-1] / close.iat[-2] - 1) * 100) if len(close) > 1 else np.nan,
+        "volume": float(hist["Volume"].iat[-1]) if "Volume" in hist else np.nan,
+        "rsi": analysis["RSI"]["value"],
+        "macd": analysis["MACD"]["value"],
+        "macd_signal": analysis["MACD"]["signal_line"],
+        "macd_hist": analysis["MACD"]["histogram"],
+        "atr": analysis["ATR"]["value"],
+        "atr_pct": analysis["ATR"]["percentage"],
+        "ema_short": analysis["EMA"]["short"],
+        "ema_long": analysis["EMA"]["long"],
+        "bb_lower": analysis["BB"]["lower"],
+        "bb_middle": analysis["BB"]["middle"],
+        "bb_upper": analysis["BB"]["upper"],
+        "overall_ta_score": analysis["overall_ta_score"],
+        "overall_fa_score": fa_score,
+        "news_sentiment_score": news_score,
+        "combined_overall_score": combined_score,
+        "combined_overall_signal": combined_signal
+    }
+    for section, column in SUB_SCORES.items():
+        row[column] = analysis[section]["score"]
+    return row
+
+
+def build_score_table(indices=SUPPORTED_INDICES, timeframe=SCORE_TIMEFRAME, include_fundamentals=True):
+    """
+    Compute the score table for every constituent of the given indices.
+
+    Args:
+        indices (list): Index names from SUPPORTED_INDICES
+        timeframe (str): Trading timeframe used for the history period
+        include_fundamentals (bool): Fetch fundamentals for the fundamental score
+
+    Returns:
+        tuple: (columns dict of NumPy arrays, metadata dict)
+    """
+    start = time.monotonic()
+    members = universe_members(indices)
+    tickers = list(members)
+    logger.info(f"Building EOD score table for {len(tickers)} tickers from {len(indices)} indices")
+
+    period, _ = resolve_timeframe_period(timeframe)
+    histories = download_history_batch(tickers, period=period, interval="1d")
+    indicators = indicator_memo.latest_values_batch(histories)
+    scorable = [t for t in tickers if t in indicators and histories.get(t) is not None and len(histories[t]) > 1]
+
+    def score(ticker):
+        return score_ticker(ticker, histories[ticker], indicators[ticker], timeframe, include_fundamentals)
+
+    # Fundamentals are fetched per ticker over the network, so score on the I/O pool
+    rows = batch_executor.map_ordered(score, scorable, label="EOD score table")
+    table = []
+    for ticker, row in zip(scorable, rows):
+        if row is None or row.get("error"):
+            continue
+        row.update(symbol=ticker, company=members[ticker]["company"] or ticker,
+                   indices=members[ticker]["indices"])
+        table.append(row)
+
+    columns = {}
+    for column in STRING_COLUMNS:
+        columns[column] = np.array([str(row[column]) for row in table], dtype=str)
+    for column in INT_COLUMNS:
+        columns[column] = np.array([row[column] for row in table], dtype=np.int64)
+    for column in FLOAT_COLUMNS:
+        columns[column] = np.array([row[column] for row in table], dtype=np.float64)
+
+    meta = {
+        "built_at": time.time(),
+        "as_of": max(columns["bar_date"]) if table else None,
+        "timeframe": timeframe,
+        "indices": list(SUPPORTED_INDICES),
+        "universe_size": len(tickers),
+        "rows": len(table),
+        "build_seconds": round(time.monotonic() - start, 1)
+    }
+    logger.info(f"EOD score table built: {len(table)}/{len(tickers)} tickers scored in {meta['build_seconds']}s")
+    return columns, meta
+
+
+def save_score_table(columns, meta, path=SCORE_TABLE_PATH):
+    """
+    Write the score table atomically as a compressed .npz file.
+
+    Args:
+        columns (dict): Column name to NumPy array
+        meta (dict): Table metadata
+        path (str): Destination file
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(f, __meta__=np.array(json.dumps(meta)), **columns)
+    os.replace(tmp_path, path)
+    logger.info(f"EOD score table saved to {path} ({os.path.getsize(path)} bytes)")
+
+
+class ScoreTable:
+    """
+    Loaded score table with filter, sort and page queries.
+    """
+
+    def __init__(self, path=SCORE_TABLE_PATH):
+        self.path = path
+        self.columns = {}
+        self.meta = {}
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """
+        Load the table, reloading it if the file changed.
+
+        Returns:
+            bool: True if a table is available
+        """
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return bool(self.columns)
+        with self._lock:
+            if mtime != self._mtime:
+                with np.load(self.path, allow_pickle=False) as data:
+                    self.meta = json.loads(str(data["__meta__"]))
+                    self.columns = {name: data[name] for name in data.files if name != "__meta__"}
+                self._mtime = mtime
+                logger.info(f"Loaded EOD score table ({self.meta.get('rows')} rows, as of {self.meta.get('as_of')})")
+        return True
+
+    def query(self, minimums=None, maximums=None, equals=None, indices=None,
+              sort="-combined_overall_score", offset=0, limit=50, fields=None):
+        """
+        Filter, sort and page the table.
+
+        Args:
+            minimums (dict, optional): Numeric column to inclusive lower bound
+            maximums (dict, optional): Numeric column to inclusive upper bound
+            equals (dict, optional): String column to a list of accepted values
+            indices (list, optional): Only constituents of any of these indices
+            sort (str): Column to sort by; a leading "-" sorts descending
+            offset (int): Number of rows to skip
+            limit (int): Page size
+            fields (list, optional): Columns to return (default: all)
+
+        Returns:
+            dict: total matches, paging information and the matching stocks
+
+        Raises:
+            LookupError: If the table has not been built yet
+            ValueError: If a column, index or sort key is unknown
+        """
+        if not self.load():
+            raise LookupError("The EOD score table has not been built yet")
+        columns = self.columns
+        mask = np.ones(len(columns["symbol"]), dtype=bool)
+
+        for bounds, compare in ((minimums, np.greater_equal), (maximums, np.less_equal)):
+            for column, value in (bounds or {}).items():
+                if column not in FLOAT_COLUMNS:
+                    raise ValueError(f"Unknown numeric column: {column}")
+                with np.errstate(invalid="ignore"):
+                    mask &= compare(columns[column], float(value))
+        for column, values in (equals or {}).items():
+            if column not in STRING_COLUMNS:
+                raise ValueError(f"Unknown text column: {column}")
+            mask &= np.isin(columns[column], [str(v) for v in values])
+        if indices:
+            bits = 0
+            for index_name in indices:
+                if index_name not in SUPPORTED_INDICES:
+                    raise ValueError(f"Unknown index: {index_name}")
+                bits |= 1 << SUPPORTED_INDICES.index(index_name)
+            mask &= (columns["indices"] & bits) != 0
+
+        descending = sort.startswith("-")
+        sort_column = sort.lstrip("-+")
+        if sort_column not in COLUMNS:
+            raise ValueError(f"Unknown sort column: {sort_column}")
+        selected = np.flatnonzero(mask)
+        keys = columns[sort_column][selected]
+        if sort_column in FLOAT_COLUMNS:
+            # NaN sorts last in both directions
+            order = np.argsort(-keys if descending else keys, kind="stable")
+        else:
+            order = np.argsort(keys, kind="stable")
+            if descending:
+                order = order[::-1]
+        page = selected[order][offset:offset + limit]
+
+        names = [name for name in (fields or COLUMNS) if name in columns]
+        values = {name: columns[name][page].tolist() for name in names}
+        if "indices" in values:
+            values["indices"] = [[name for i, name in enumerate(self.meta["indices"]) if bits & (1 << i)]
+                                 for bits in values["indices"]]
+        for name in names:
+            if name in FLOAT_COLUMNS:
+                values[name] = [None if v != v else v for v in values[name]]
+        stocks = [dict(zip(names, row)) for row in zip(*(values[name] for name in names))]
+        return {
+            "as_of": self.meta.get("as_of"),
+            "built_at": self.meta.get("built_at"),
+            "timeframe": self.meta.get("timeframe"),
+            "total": int(mask.sum()),
+            "offset": offset,
+            "limit": limit,
+            "stocks": stocks
+        }
+
+
+def _parse_schedule(schedule):
+    times = []
+    for item in filter(None, (part.strip() for part in schedule.split(","))):
+        hour, minute = item.split(":")
+        times.append(datetime.time(int(hour), int(minute)))
+    return sorted(times)
+
+
+def last_due_time(now=None, schedule=SCORE_SCHEDULE):
+    """
+    Get the most recent scheduled build time on a weekday.
+
+    Args:
+        now (datetime.datetime, optional): Current UTC time
+        schedule (str): Comma-separated UTC times (HH:MM)
+
+    Returns:
+        float: Unix timestamp of the last due build, or None without a schedule
+    """
+    times = _parse_schedule(schedule)
+    if not times:
+        return None
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    for days_back in range(8):
+        day = (now - datetime.timedelta(days=days_back)).date()
+        if day.weekday() >= 5:
+            continue
+        for at in reversed(times):
+            due = datetime.datetime.combine(day, at, tzinfo=datetime.timezone.utc)
+            if due <= now:
+                return due.timestamp()
+    return None
+
+
+def _read_failure(path):
+    try:
+        with open(f"{path}.failed", "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _record_failure(path, due, error):
+    """
+    Record a failed build of a scheduled time next to the table (seen by every worker).
+
+    Returns:
+        int: Failed attempts for this scheduled time
+    """
+    failure = _read_failure(path)
+    attempts = failure.get("attempts", 0) + 1 if failure.get("due") == due else 1
+    tmp_path = f"{path}.failed.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"due": due, "attempts": attempts, "at": time.time(), "error": str(error)}, f)
+    os.replace(tmp_path, f"{path}.failed")
+    return attempts
+
+
+def build_backing_off(path, due, now=None):
+    """
+    Check whether a failed build of the scheduled time is waiting for its retry.
+
+    Args:
+        path (str): Score table path
+        due (float): Unix timestamp of the scheduled build
+        now (float, optional): Current Unix time
+
+    Returns:
+        bool: True if no build should be attempted for this scheduled time yet
+    """
+    failure = _read_failure(path)
+    if failure.get("due") != due:
+        return False
+    if failure.get("attempts", 0) > BUILD_RETRIES:
+        return True
+    return (now or time.time()) - failure.get("at", 0) < BUILD_RETRY_DELAY
+
+
+def refresh_score_table(table, timeframe=SCORE_TIMEFRAME, force=False):
+    """
+    Rebuild the score table if a scheduled build is due, unless another worker is
+    already building it or a failed build of that time is backing off.
+
+    Args:
+        table (ScoreTable): Table to check and reload
+        timeframe (str): Trading timeframe
+        force (bool): Rebuild even if the table is up to date
+
+    Returns:
+        bool: True if this call rebuilt the table
+    """
+    due = last_due_time()
+    table.load()
+    if not force and (due is None or table.meta.get("built_at", 0) >= due or build_backing_off(table.path, due)):
+        return False
+
+    lock_path = f"{table.path}.lock"
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    with open(lock_path, "w") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            logger.info("EOD score table is being built by another worker")
+            return False
+        try:
+            # Another worker may have finished a build while we waited for the lock
+            table.load()
+            if not force and (table.meta.get("built_at", 0) >= due or build_backing_off(table.path, due)):
+                return False
+            try:
+                columns, meta = build_score_table(timeframe=timeframe)
+                save_score_table(columns, meta, table.path)
+            except Exception as e:
+                attempts = _record_failure(table.path, due, e)
+                retry = "giving up until the next scheduled build" if attempts > BUILD_RETRIES \
+                    else f"retrying in {BUILD_RETRY_DELAY}s"
+                logger.error(f"EOD score table build failed (attempt {attempts}, {retry}): {e}")
+                return False
+            if os.path.exists(f"{table.path}.failed"):
+                os.remove(f"{table.path}.failed")
+            table.load()
+            return True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class ScoreRefresher:
+    """
+    Background thread that rebuilds the score table after each scheduled close.
+    """
+
+    def __init__(self, table, interval=REFRESH_CHECK_INTERVAL):
+        self.table = table
+        self.interval = interval
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the refresher in this process (idempotent; disabled without a schedule)."""
+        with self._lock:
+            if self._pid == os.getpid() or not _parse_schedule(SCORE_SCHEDULE):
+                return
+            # Threads do not survive fork; start one per worker
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name="eod-score-refresher", daemon=True).start()
+
+    def _run(self):
+        pid = os.getpid()
+        while self._pid == pid:
+            try:
+                refresh_score_table(self.table)
+            except Exception as e:
+                logger.error(f"EOD score table refresh failed: {e}")
+            time.sleep(self.interval)
+
+
+# Shared table and refresher used by the screener endpoint
+score_table = ScoreTable()
+refresher = ScoreRefresher(score_table)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the PyTrade end-of-day score table")
+    parser.add_argument("--timeframe", default=SCORE_TIMEFRAME, help="Trading timeframe (short, medium, long)")
+    parser.add_argument("--indices", nargs="+", default=list(SUPPORTED_INDICES), help="Indices to include")
+    parser.add_argument("--no-fundamentals", action="store_true", help="Skip the per-ticker fundamentals fetch")
+    parser.add_argument("--output", default=SCORE_TABLE_PATH, help="Destination .npz file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(name)s: %(message)s')
+    table_columns, table_meta = build_score_table(args.indices, args.timeframe, not args.no_fundamentals)
+    save_score_table(table_columns, table_meta, args.output)
@@ -0,0 +1,686 @@
+"""
+PyTrade - Indicator Backends Module
+
+This module provides one indicator API (RSI, MACD, ATR, EMA, SMA and Bollinger Bands)
+on top of interchangeable computation engines. Every backend takes price arrays of
+shape (bars,) or (symbols, bars) and returns arrays of the same shape, following the
+pandas_ta conventions used by indicator_engine: EMAs seeded with the SMA of the first
+`length` values, Wilder smoothing (RMA) for RSI and ATR, and population standard
+deviation for Bollinger Bands.
+
+Available backends:
+- numpy: vectorized indicator_engine kernels, always available
+- numba: JIT-compiled recursion kernels (requires numba)
+- talib: TA-Lib C implementations (requires TA-Lib)
+- pandas_ta: the pandas_ta reference implementation (requires pandas_ta)
+
+numpy, numba and pandas_ta produce the same values. TA-Lib seeds Wilder smoothing
+with a simple average, so its RSI and ATR match the others only once the warm-up
+window (indicator_engine.warmup_bars) has passed; indicator_benchmark reports the
+deviation.
+
+The backend is chosen once per process: PYTRADE_INDICATOR_BACKEND names one
+explicitly, otherwise ("auto") the available backends that reproduce the numpy
+values are timed on a small synthetic batch and the fastest is used. TA-Lib is
+never picked automatically, so scores do not depend on which libraries a deployment
+has installed; it must be requested by name.
+
+The selected backend is used by the backtester (and compared by indicator_benchmark)
+only. The live endpoints keep their own implementations: the swing trading service,
+screeners and streaming indicators call indicator_engine directly, swing_trading and
+chartprediction_simplified use their pandas formulas and indicatorscharts uses
+TA-Lib, so the backend choice does not change any value an API endpoint returns.
+
+Key features:
+- Common rsi/macd/atr/ema/sma/bbands API for single series and batches
+- Backend registry with optional-dependency detection
+- Automatic selection of the fastest backend verified against the numpy values
+
+Author: PyTrade Development Team
+Version: 1.0.0
+Date: October 17, 2026
+License: Proprietary
+"""
+
+import os
+import abc
+import time
+import logging
+import threading
+import numpy as np
+import pandas as pd
+import indicator_engine as engine
+
+logger = logging.getLogger(__name__)
+
+try:
+    import talib
+except ImportError:
+    talib = None
+
+try:
+    import pandas_ta_patch  # noqa: F401  (adds numpy.NaN, then imports pandas_ta)
+    import pandas_ta
+except ImportError:
+    pandas_ta = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Backend name from the environment ("auto" picks the fastest available one)
+BACKEND_ENV = os.environ.get("PYTRADE_INDICATOR_BACKEND", "auto")
+# Synthetic batch used to verify and time backends during automatic selection
+SELECTION_SYMBOLS = 50
+SELECTION_BARS = 500
+# Largest deviation from the numpy values a backend may show to be picked automatically
+VERIFY_TOLERANCE = 1e-8
+
+
+def _restore_shape(result, one_d):
+    if isinstance(result, tuple):
+        return tuple(_restore_shape(part, one_d) for part in result)
+    return result[0] if one_d else result
+
+
+class IndicatorBackend(abc.ABC):
+    """
+    Base class for indicator backends.
+    """
+
+    name = "base"
+    available = False
+    # Whether the backend follows the numpy formulas exactly (eligible for "auto")
+    exact = True
+
+    @abc.abstractmethod
+    def rsi(self, close, length=14):
+        """
+        Relative Strength Index.
+
+        Args:
+            close (np.ndarray): Close prices of shape (bars,) or (symbols, bars)
+            length (int): RSI period
+
+        Returns:
+            np.ndarray: RSI values
+        """
+
+    @abc.abstractmethod
+    def macd(self, close, fast=12, slow=26, signal=9):
+        """
+        Moving Average Convergence Divergence.
+
+        Args:
+            close (np.ndarray): Close prices
+            fast (int): Fast EMA period
+            slow (int): Slow EMA period
+            signal (int): Signal EMA period
+
+        Returns:
+            tuple: (macd line, signal line, histogram)
+        """
+
+    @abc.abstractmethod
+    def atr(self, high, low, close, length=14):
+        """
+        Average True Range.
+
+        Args:
+            high (np.ndarray): High prices
+            low (np.ndarray): Low prices
+            close (np.ndarray): Close prices
+            length (int): ATR period
+
+        Returns:
+            np.ndarray: ATR values
+        """
+
+    @abc.abstractmethod
+    def ema(self, close, length):
+        """
+        Exponential moving average.
+
+        Args:
+            close (np.ndarray): Close prices
+            length (int): EMA span
+
+        Returns:
+            np.ndarray: EMA values
+        """
+
+    @abc.abstractmethod
+    def sma(self, close, length):
+        """
+        Simple moving average.
+
+        Args:
+            close (np.ndarray): Close prices
+            length (int): Window length
+
+        Returns:
+            np.ndarray: SMA values
+        """
+
+    @abc.abstractmethod
+    def bbands(self, close, length=20, std=2.0):
+        """
+        Bollinger Bands.
+
+        Args:
+            close (np.ndarray): Close prices
+            length (int): Moving average period
+            std (float): Number of standard deviations
+
+        Returns:
+            tuple: (lower, middle, upper) bands
+        """
+
+
+class SeriesBackend(IndicatorBackend):
+    """
+    Base class for backends that compute one series at a time.
+
+    Batches are processed row by row. Leading NaN padding (from right-aligned
+    batches) is stripped before the series is handed to the library and restored
+    afterwards, since the libraries treat a leading NaN as part of the series.
+    """
+
+    def _per_series(self, func, *arrays):
+        arrays = [np.asarray(array, dtype=np.float64) for array in arrays]
+        one_d = arrays[0].ndim == 1
+        rows = [array[np.newaxis, :] if one_d else array for array in arrays]
+        count, bars = rows[-1].shape
+        outputs = None
+
+        for row in range(count):
+            valid = ~np.isnan(rows[-1][row])
+            if not valid.any():
+                continue
+            start = int(np.argmax(valid))
+            results = func(*[np.ascontiguousarray(array[row, start:]) for array in rows])
+            if outputs is None:
+                outputs = [np.full((count, bars), np.nan) for _ in results]
+            for output, result in zip(outputs, results):
+                output[row, start:] = np.asarray(result, dtype=np.float64)
+
+        if outputs is None:
+            outputs = [np.full((count, bars), np.nan)]
+        return [output[0] if one_d else output for output in outputs]
+
+
+class NumpyBackend(IndicatorBackend):
+    """
+    Vectorized NumPy backend (indicator_engine kernels).
+    """
+
+    name = "numpy"
+    available = True
+
+    def rsi(self, close, length=14):
+        close = np.asarray(close, dtype=np.float64)
+        return _restore_shape(engine.rsi(close, length), close.ndim == 1)
+
+    def macd(self, close, fast=12, slow=26, signal=9):
+        close = np.asarray(close, dtype=np.float64)
+        return _restore_shape(engine.macd(close, fast, slow, signal), close.ndim == 1)
+
+    def atr(self, high, low, close, length=14):
+        close = np.asarray(close, dtype=np.float64)
+        return _restore_shape(engine.atr(high, low, close, length), close.ndim == 1)
+
+    def ema(self, close, length):
+        close = np.asarray(close, dtype=np.float64)
+        return _restore_shape(engine.ema(close, length), close.ndim == 1)
+
+    def sma(self, close, length):
+        close = np.asarray(close, dtype=np.float64)
+        return _restore_shape(engine.sma(close, length), close.ndim == 1)
+
+    def bbands(self, close, length=20, std=2.0):
+        close = np.asarray(close, dtype=np.float64)
+        return _restore_shape(engine.bbands(close, length, std), close.ndim == 1)
+
+
+def _ewm_kernel(values, alpha, adjust, min_periods):
+    # Same recursion as indicator_engine.ewm_mean, one symbol at a time
+    rows, bars = values.shape
+    out = np.full((rows, bars), np.nan)
+    new_wt = 1.0 if adjust else alpha
+    decay = 1.0 - alpha
+    min_obs = max(min_periods, 1)
+    for row in range(rows):
+        weighted = np.nan
+        old_wt = 1.0
+        started = False
+        nobs = 0
+        for col in range(bars):
+            current = values[row, col]
+            is_obs = not np.isnan(current)
+            if started:
+                old_wt *= decay
+                if is_obs:
+                    weighted = (old_wt * weighted + new_wt * current) / (old_wt + new_wt)
+                    old_wt = old_wt + new_wt if adjust else 1.0
+            elif is_obs:
+                weighted = current
+                old_wt = 1.0
+                started = True
+            if is_obs:
+                nobs += 1
+            if started and nobs >= min_obs:
+                out[row, col] = weighted
+    return out
+
+
+def _ema_seed_kernel(values, length):
+    # Replace the first `length` observations by their mean, placed on the last of them
+    rows, bars = values.shape
+    out = np.full((rows, bars), np.nan)
+    for row in range(rows):
+        count = 0
+        total = 0.0
+        for col in range(bars):
+            current = values[row, col]
+            if count < length:
+                if not np.isnan(current):
+                    count += 1
+                    total += current
+                    if count == length:
+                        out[row, col] = total / length
+            else:
+                out[row, col] = current
+    return out
+
+
+if numba is not None:
+    _ewm_kernel = numba.njit(cache=True)(_ewm_kernel)
+    _ema_seed_kernel = numba.njit(cache=True)(_ema_seed_kernel)
+
+
+class NumbaBackend(NumpyBackend):
+    """
+    NumPy backend with JIT-compiled EMA/RMA recursions.
+
+    The recursive smoothing is the only part of the indicator set that cannot be
+    vectorized across bars; windowed indicators reuse the NumPy kernels.
+    """
+
+    name = "numba"
+    available = numba is not None
+
+    def _ema(self, values, length):
+        seeded = _ema_seed_kernel(engine._as_2d(values), length)
+        return _ewm_kernel(seeded, 2.0 / (length + 1), False, 0)
+
+    def _rma(self, values, length):
+        return _ewm_kernel(engine._as_2d(values), 1.0 / length, True, length)
+
+    def rsi(self, close, length=14):
+        close = np.asarray(close, dtype=np.float64)
+        close_2d = engine._as_2d(close)
+        change = np.full(close_2d.shape, np.nan)
+        change[:, 1:] = np.diff(close_2d, axis=1)
+        gains = np.where(change > 0, change, np.where(np.isnan(change), np.nan, 0.0))
+        losses = np.where(change < 0, -change, np.where(np.isnan(change), np.nan, 0.0))
+        avg_gain, avg_loss = self._rma(gains, length), self._rma(losses, length)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return _restore_shape(100.0 * avg_gain / (avg_gain + avg_loss), close.ndim == 1)
+
+    def macd(self, close, fast=12, slow=26, signal=9):
+        close = np.asarray(close, dtype=np.float64)
+        macd_line = self._ema(close, fast) - self._ema(close, slow)
+        signal_line = self._ema(macd_line, signal)
+        return _restore_shape((macd_line, signal_line, macd_line - signal_line), close.ndim == 1)
+
+    def atr(self, high, low, close, length=14):
+        close = np.asarray(close, dtype=np.float64)
+        tr = engine.true_range(high, low, close)
+        return _restore_shape(self._rma(tr, length), close.ndim == 1)
+
+    def ema(self, close, length):
+        close = np.asarray(close, dtype=np.float64)
+        return _restore_shape(self._ema(close, length), close.ndim == 1)
+
+
+class TalibBackend(SeriesBackend):
+    """
+    TA-Lib backend (C implementations, one series at a time).
+
+    MACD is assembled from TA-Lib EMAs so that the signal line starts from the first
+    MACD value like the other backends; TA-Lib's own MACD aligns the fast EMA to the
+    slow one and differs during warm-up.
+    """
+
+    name = "talib"
+    available = talib is not None
+    # RSI/ATR seed Wilder smoothing differently: opt-in only
+    exact = False
+
+    def rsi(self, close, length=14):
+        return self._per_series(lambda c: (talib.RSI(c, timeperiod=length),), close)[0]
+
+    def macd(self, close, fast=12, slow=26, signal=9):
+        def compute(c):
+            macd_line = talib.EMA(c, timeperiod=fast) - talib.EMA(c, timeperiod=slow)
+            signal_line = np.full(len(c), np.nan)
+            first = slow - 1
+            if len(c) > first:
+                signal_line[first:] = talib.EMA(macd_line[first:], timeperiod=signal)
+            return macd_line, signal_line, macd_line - signal_line
+        return tuple(self._per_series(compute, close))
+
+    def atr(self, high, low, close, length=14):
+        return self._per_series(lambda h, l, c: (talib.ATR(h, l, c, timeperiod=length),), high, low, close)[0]
+
+    def ema(self, close, length):
+        return self._per_series(lambda c: (talib.EMA(c, timeperiod=length),), close)[0]
+
+    def sma(self, close, length):
+        return self._per_series(lambda c: (talib.SMA(c, timeperiod=length),), close)[0]
+
+    def bbands(self, close, length=20, std=2.0):
+        def compute(c):
+            upper, middle, lower = talib.BBANDS(c, timeperiod=length, nbdevup=std, nbdevdn=std, matype=0)
+            return lower, middle, upper
+        return tuple(self._per_series(compute, close))
+
+
+class PandasTABackend(SeriesBackend):
+    """
+    pandas_ta backend (reference implementation, one series at a time).
+    """
+
+    name = "pandas_ta"
+    available = pandas_ta is not None
+
+    @staticmethod
+    def _values(result, length):
+        if result is None:
+            return np.full(length, np.nan)
+        return result.to_numpy(dtype=np.float64)
+
+    def rsi(self, close, length=14):
+        return self._per_series(
+            lambda c: (self._values(pandas_ta.rsi(pd.Series(c), length=length, talib=False), len(c)),), close)[0]
+
+    def macd(self, close, fast=12, slow=26, signal=9):
+        def compute(c):
+            frame = pandas_ta.macd(pd.Series(c), fast=fast, slow=slow, signal=signal, talib=False)
+            if frame is None:
+                empty = np.full(len(c), np.nan)
+                return empty, empty, empty
+            # Columns: MACD, MACDh (histogram), MACDs (signal)
+            values = frame.to_numpy(dtype=np.float64)
+            return values[:, 0], values[:, 2], values[:, 1]
+        return tuple(self._per_series(compute, close))
+
+    def atr(self, high, low, close, length=14):
+        def compute(h, l, c):
+            result = pandas_ta.atr(pd.Series(h), pd.Series(l), pd.Series(c), length=length, talib=False)
+            return (self._values(result, len(c)),)
+        return self._per_series(compute, high, low, close)[0]
+
+    def ema(self, close, length):
+        return self._per_series(
+            lambda c: (self._values(pandas_ta.ema(pd.Series(c), length=length, talib=False), len(c)),), close)[0]
+
+    def sma(self, close, length):
+        return self._per_series(
+            lambda c: (self._values(pandas_ta.sma(pd.Series(c), length=length, talib=False), len(c)),), close)[0]
+
+    def bbands(self, close, length=20, std=2.0):
+        def compute(c):
+            frame = pandas_ta.bbands(pd.Series(c), length=length, std=std, ddof=0, talib=False)
+            if frame is None:
+                empty = np.full(len(c), np.nan)
+                return empty, empty, empty
+            # Columns: BBL (lower), BBM (middle), BBU (upper), BBB, BBP
+            values = frame.to_numpy(dtype=np.float64)
+            return values[:, 0], values[:, 1], values[:, 2]
+        return tuple(self._per_series(compute, close))
+
+
+# Registry of backend name to backend class
+BACKENDS = {
+    backend.name: backend
+    for backend in (NumpyBackend, NumbaBackend, TalibBackend, PandasTABackend)
+}
+
+
+def available_backends():
+    """
+    Get the names of backends whose dependencies are installed.
+
+    Returns:
+        list: Backend names
+    """
+    return [name for name, backend in BACKENDS.items() if backend.available]
+
+
+def create_backend(name):
+    """
+    Instantiate a backend by name.
+
+    Args:
+        name (str): Backend name (numpy, numba, talib or pandas_ta)
+
+    Returns:
+        IndicatorBackend: Backend instance
+
+    Raises:
+        ValueError: If the backend is unknown or its dependency is not installed
+    """
+    backend = BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(f"Unknown indicator backend '{name}', expected one of {sorted(BACKENDS)}")
+    if not backend.available:
+        raise ValueError(f"Indicator backend '{name}' is not available (missing dependency)")
+    return backend()
+
+
+def synthetic_ohlc(symbols, bars, seed=7):
+    """
+    Generate random-walk OHLC data for benchmarking.
+
+    Args:
+        symbols (int): Number of symbols
+        bars (int): Number of bars per symbol
+        seed (int): Random seed
+
+    Returns:
+        tuple: (high, low, close) arrays of shape (symbols, bars)
+    """
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, (symbols, bars)), axis=1))
+    spread = close * rng.uniform(0.001, 0.02, (symbols, bars))
+    return close + spread, close - spread, close
+
+
+def run_indicator_set(backend, high, low, close, params=None):
+    """
+    Compute the full swing trading indicator set with a backend.
+
+    Args:
+        backend (IndicatorBackend): Backend to use
+        high (np.ndarray): High prices
+        low (np.ndarray): Low prices
+        close (np.ndarray): Close prices
+        params (dict, optional): Indicator parameter overrides
+
+    Returns:
+        dict: Indicator name to array
+    """
+    p = engine.resolve_params(params)
+    macd_line, signal_line, histogram = backend.macd(close, p["macd_fast"], p["macd_slow"], p["macd_signal"])
+    bb_lower, bb_middle, bb_upper = backend.bbands(close, p["bb_length"], p["bb_std"])
+    return {
+        "rsi": backend.rsi(close, p["rsi_length"]),
+        "macd": macd_line,
+        "macd_signal": signal_line,
+        "macd_hist": histogram,
+        "atr": backend.atr(high, low, close, p["atr_length"]),
+        "ema_short": backend.ema(close, p["ema_short"]),
+        "ema_long": backend.ema(close, p["ema_long"]),
+        "bb_lower": bb_lower,
+        "bb_middle": bb_middle,
+        "bb_upper": bb_upper
+    }
+
+
+def time_backend(backend, high, low, close, repeats=3):
+    """
+    Time the full indicator set on a backend (best of several runs, after one warm-up).
+
+    Args:
+        backend (IndicatorBackend): Backend to time
+        high (np.ndarray): High prices
+        low (np.ndarray): Low prices
+        close (np.ndarray): Close prices
+        repeats (int): Number of timed runs
+
+    Returns:
+        float: Best wall time in seconds
+    """
+    # The first call compiles JIT kernels and warms library caches
+    run_indicator_set(backend, high, low, close)
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run_indicator_set(backend, high, low, close)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def backend_deviation(backend, high, low, close):
+    """
+    Largest absolute deviation of a backend's indicator set from the numpy values.
+
+    Args:
+        backend (IndicatorBackend): Backend to check
+        high (np.ndarray): High prices
+        low (np.ndarray): Low prices
+        close (np.ndarray): Close prices
+
+    Returns:
+        float: Maximum deviation (inf if the NaN warm-up positions differ)
+    """
+    reference = run_indicator_set(NumpyBackend(), high, low, close)
+    values = run_indicator_set(backend, high, low, close)
+    worst = 0.0
+    for name, expected in reference.items():
+        actual = np.asarray(values[name], dtype=float)
+        if not np.array_equal(np.isnan(expected), np.isnan(actual)):
+            return float("inf")
+        finite = ~np.isnan(expected)
+        if finite.any():
+            worst = max(worst, float(np.max(np.abs(actual[finite] - expected[finite]))))
+    return worst
+
+
+def select_backend(name=BACKEND_ENV):
+    """
+    Choose the indicator backend.
+
+    Args:
+        name (str): Backend name, or "auto" to time the available backends that
+            reproduce the numpy values and pick the fastest
+
+    Returns:
+        IndicatorBackend: Selected backend (numpy if the requested one is unavailable)
+    """
+    if name and name != "auto":
+        try:
+            return create_backend(name)
+        except ValueError as e:
+            logger.error(f"{e}; falling back to automatic selection")
+
+    high, low, close = synthetic_ohlc(SELECTION_SYMBOLS, SELECTION_BARS)
+    timings = {}
+    for candidate in available_backends():
+        if not BACKENDS[candidate].exact:
+            continue
+        try:
+            backend = create_backend(candidate)
+            if candidate != NumpyBackend.name:
+                deviation = backend_deviation(backend, high, low, close)
+                if deviation > VERIFY_TOLERANCE:
+                    logger.warning(f"Indicator backend {candidate} deviates from numpy by {deviation:.3g}, skipping")
+                    continue
+            timings[candidate] = time_backend(backend, high, low, close, repeats=1)
+        except Exception as e:
+            logger.error(f"Indicator backend {candidate} failed during selection: {e}")
+
+    if not timings:
+        return NumpyBackend()
+    fastest = min(timings, key=timings.get)
+    summary = ", ".join(f"{n}={t * 1000:.1f}ms" for n, t in sorted(timings.items(), key=lambda item: item[1]))
+    logger.info(f"Selected indicator backend '{fastest}' ({summary})")
+    return create_backend(fastest)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """
+    Get the process-wide indicator backend, selecting it on first use (the backend
+    the backtester evaluates with; the live endpoints do not go through it).
+
+    Returns:
+        IndicatorBackend: Selected backend
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = select_backend()
+    return _backend
+
+
+def set_backend(name):
+    """
+    Switch the process-wide indicator backend.
+
+    Args:
+        name (str): Backend name, or "auto"
+
+    Returns:
+        IndicatorBackend: Newly selected backend
+    """
+    global _backend
+    with _backend_lock:
+        _backend = select_backend(name)
+    return _backend
+
+
+def rsi(close, length=14):
+    """Relative Strength Index on the selected backend (see IndicatorBackend.rsi)."""
+    return get_backend().rsi(close, length)
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    """MACD line, signal and histogram on the selected backend (see IndicatorBackend.macd)."""
+    return get_backend().macd(close, fast, slow, signal)
+
+
+def atr(high, low, close, length=14):
+    """Average True Range on the selected backend (see IndicatorBackend.atr)."""
+    return get_backend().atr(high, low, close, length)
+
+
+def ema(close, length):
+    """Exponential moving average on the selected backend (see IndicatorBackend.ema)."""
+    return get_backend().ema(close, length)
+
+
+def sma(close, length):
+    """Simple moving average on the selected backend (see IndicatorBackend.sma)."""
+    return get_backend().sma(close, length)
+
+
+def bbands(close, length=20, std=2.0):
+    """Bollinger Bands (lower, middle, upper) on the selected backend (see IndicatorBackend.bbands)."""
+    return get_backend().bbands(close, length, std)
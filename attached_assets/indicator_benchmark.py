@@ -0,0 +1,157 @@
+"""
+PyTrade - Indicator Benchmark Module
+
+This module benchmarks the indicator backends from indicator_backends against each
+other. For every available backend it times each indicator across a grid of series
+lengths and batch sizes, reports throughput in bars per second, and compares the
+output with the NumPy reference so that backends which diverge (for example during
+the warm-up window) are visible next to their speed.
+
+Usage:
+    python indicator_benchmark.py --lengths 250 1000 5000 --batches 1 50 500
+
+Key features:
+- Per-indicator timings for every installed backend
+- Throughput across series lengths and batch sizes
+- Maximum deviation from the NumPy backend, overall and after warm-up
+
+Author: PyTrade Development Team
+Version: 1.0.0
+Date: October 17, 2026
+License: Proprietary
+"""
+
+import time
+import logging
+import argparse
+import numpy as np
+import indicator_engine as engine
+from indicator_backends import available_backends, create_backend, synthetic_ohlc
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LENGTHS = (250, 1000, 5000)
+DEFAULT_BATCHES = (1, 50, 500)
+DEFAULT_REPEATS = 3
+
+
+def _indicator_calls(params=None):
+    p = engine.resolve_params(params)
+    return {
+        "rsi": lambda b, h, l, c: b.rsi(c, p["rsi_length"]),
+        "macd": lambda b, h, l, c: b.macd(c, p["macd_fast"], p["macd_slow"], p["macd_signal"]),
+        "atr": lambda b, h, l, c: b.atr(h, l, c, p["atr_length"]),
+        "ema": lambda b, h, l, c: b.ema(c, p["ema_long"]),
+        "sma": lambda b, h, l, c: b.sma(c, p["bb_length"]),
+        "bbands": lambda b, h, l, c: b.bbands(c, p["bb_length"], p["bb_std"])
+    }
+
+
+def _max_deviation(result, reference, start=0):
+    parts = result if isinstance(result, tuple) else (result,)
+    reference_parts = reference if isinstance(reference, tuple) else (reference,)
+    deviation = 0.0
+    for part, expected in zip(parts, reference_parts):
+        part, expected = part[..., start:], expected[..., start:]
+        if part.size == 0:
+            continue
+        with np.errstate(invalid="ignore"):
+            diff = np.abs(part - expected)
+        # A value present in one output but missing from the other is a mismatch
+        if (np.isnan(part) != np.isnan(expected)).any():
+            return float("inf")
+        if not np.isnan(diff).all():
+            deviation = max(deviation, float(np.nanmax(diff)))
+    return deviation
+
+
+def _time_call(call, backend, high, low, close, repeats):
+    result = call(backend, high, low, close)  # warm-up (JIT compilation, caches)
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        call(backend, high, low, close)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run_benchmark(lengths=DEFAULT_LENGTHS, batches=DEFAULT_BATCHES, backends=None, repeats=DEFAULT_REPEATS):
+    """
+    Benchmark every indicator on every backend across series lengths and batch sizes.
+
+    Args:
+        lengths (iterable): Bars per series
+        batches (iterable): Number of series per call
+        backends (list, optional): Backend names (default: all available)
+        repeats (int): Timed runs per measurement (best is reported)
+
+    Returns:
+        list: One dict per (backend, indicator, bars, symbols) with seconds,
+              bars_per_second, max_deviation and max_deviation_after_warmup
+    """
+    names = backends or available_backends()
+    instances = {name: create_backend(name) for name in names}
+    reference = create_backend("numpy")
+    warmup = engine.warmup_bars()
+    calls = _indicator_calls()
+    rows = []
+
+    for bars in lengths:
+        for symbols in batches:
+            high, low, close = synthetic_ohlc(symbols, bars)
+            for indicator, call in calls.items():
+                expected = call(reference, high, low, close)
+                for name, backend in instances.items():
+                    try:
+                        seconds, result = _time_call(call, backend, high, low, close, repeats)
+                    except Exception as e:
+                        logger.error(f"{name} failed on {indicator} ({symbols}x{bars}): {e}")
+                        continue
+                    rows.append({
+                        "backend": name,
+                        "indicator": indicator,
+                        "bars": bars,
+                        "symbols": symbols,
+                        "seconds": seconds,
+                        "bars_per_second": symbols * bars / seconds if seconds else float("inf"),
+                        "max_deviation": _max_deviation(result, expected),
+                        "max_deviation_after_warmup": _max_deviation(result, expected, warmup) if bars > warmup else None
+                    })
+    return rows
+
+
+def format_report(rows):
+    """
+    Format benchmark rows as a text table.
+
+    Args:
+        rows (list): Rows returned by run_benchmark
+
+    Returns:
+        str: Table sorted by series length, batch size, indicator and speed
+    """
+    header = f"{'bars':>6} {'symbols':>7} {'indicator':<9} {'backend':<10} {'ms':>10} {'Mbars/s':>9} {'max dev':>10} {'dev warm':>10}"
+    lines = [header, "-" * len(header)]
+    ordered = sorted(rows, key=lambda r: (r["bars"], r["symbols"], r["indicator"], r["seconds"]))
+    for r in ordered:
+        after = r["max_deviation_after_warmup"]
+        after = "n/a" if after is None else f"{after:.2e}"
+        lines.append(
+            f"{r['bars']:>6} {r['symbols']:>7} {r['indicator']:<9} {r['backend']:<10} "
+            f"{r['seconds'] * 1000:>10.3f} {r['bars_per_second'] / 1e6:>9.2f} "
+            f"{r['max_deviation']:>10.2e} {after:>10}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark PyTrade indicator backends")
+    parser.add_argument("--lengths", type=int, nargs="+", default=list(DEFAULT_LENGTHS), help="Bars per series")
+    parser.add_argument("--batches", type=int, nargs="+", default=list(DEFAULT_BATCHES), help="Series per call")
+    parser.add_argument("--backends", nargs="+", default=None, help="Backends to compare (default: all available)")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Timed runs per measurement")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(name)s: %(message)s')
+    logger.info(f"Available indicator backends: {', '.join(available_backends())}")
+    print(format_report(run_benchmark(args.lengths, args.batches, args.backends, args.repeats)))
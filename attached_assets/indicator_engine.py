@@ -0,0 +1,633 @@
+"""
+PyTrade - Indicator Engine Module
+
+This module computes the swing trading indicators (RSI, MACD, ATR, EMA20/50 and
+Bollinger Bands) for many symbols at once. Price histories are packed into aligned
+2-D NumPy arrays of shape (symbols, bars) and every indicator is evaluated for all
+symbols in a single vectorized pass, so screening a whole index costs a handful of
+array operations instead of one pandas pipeline per ticker.
+
+The formulas follow pandas_ta conventions so that results match the per-ticker
+analysis: EMAs are seeded with the SMA of the first `length` values, RSI and ATR use
+Wilder's moving average (RMA, an adjusted EWM with alpha = 1/length), and Bollinger
+Bands use the population standard deviation.
+
+Histories are right-aligned by bar position: the last bar of every symbol sits in the
+last column and shorter histories are padded with NaN on the left. Indicators are
+therefore computed over each symbol's own bar sequence even when exchanges have
+different trading calendars.
+
+Key features:
+- Alignment of per-ticker OHLCV DataFrames into (symbols x bars) matrices
+- Vectorized EMA, RMA, SMA, rolling standard deviation and true range kernels
+- RSI, MACD, ATR, EMA and Bollinger Band matrices for all symbols
+- Compact arrays of the latest indicator values for scoring and screening
+- Tail-only evaluation: only the last k values are produced, over the shortest
+  warm-up window that keeps the recursive indicators within a set tolerance
+
+Author: PyTrade Development Team
+Version: 1.0.0
+Date: October 17, 2026
+License: Proprietary
+"""
+
+import math
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Default indicator parameters used by the swing trading analysis
+DEFAULT_PARAMS = {
+    "rsi_length": 14,
+    "macd_fast": 12,
+    "macd_slow": 26,
+    "macd_signal": 9,
+    "atr_length": 14,
+    "ema_short": 20,
+    "ema_long": 50,
+    "bb_length": 20,
+    "bb_std": 2.0,
+    # Market structure: rolling window of the swing high/low and bars inspected
+    "ms_window": 3,
+    "ms_lookback": 5
+}
+
+# Maximum relative weight the truncated history may still carry in a recursive
+# indicator (EMA/RMA) when only the latest values are evaluated
+WARMUP_TOLERANCE = 1e-6
+
+
+def resolve_params(params=None):
+    """
+    Merge caller parameters with the defaults.
+
+    Args:
+        params (dict, optional): Indicator parameter overrides
+
+    Returns:
+        dict: Complete parameter set
+    """
+    merged = dict(DEFAULT_PARAMS)
+    if params:
+        merged.update(params)
+    return merged
+
+
+def align_histories(histories, columns=("High", "Low", "Close"), max_bars=None):
+    """
+    Pack per-ticker OHLCV DataFrames into right-aligned 2-D arrays.
+
+    Args:
+        histories (dict): Mapping of ticker to OHLCV DataFrame
+        columns (tuple): Columns to extract
+        max_bars (int, optional): Keep at most this many trailing bars per ticker
+
+    Returns:
+        tuple: (symbols list, dict of column name to float64 array of shape
+               (symbols, bars), list of last bar timestamps)
+    """
+    symbols = [ticker for ticker, frame in histories.items() if frame is not None and not frame.empty]
+    lengths = [len(histories[ticker]) for ticker in symbols]
+    bars = max(lengths) if lengths else 0
+    if max_bars:
+        bars = min(bars, max_bars)
+
+    matrices = {column: np.full((len(symbols), bars), np.nan) for column in columns}
+    last_timestamps = []
+    for row, ticker in enumerate(symbols):
+        frame = histories[ticker].iloc[-bars:] if bars else histories[ticker].iloc[:0]
+        count = len(frame)
+        for column in columns:
+            if column in frame.columns:
+                matrices[column][row, bars - count:] = frame[column].to_numpy(dtype=np.float64)
+        last_timestamps.append(frame.index[-1] if count else None)
+    return symbols, matrices, last_timestamps
+
+
+def _as_2d(values):
+    array = np.asarray(values, dtype=np.float64)
+    return array[np.newaxis, :] if array.ndim == 1 else array
+
+
+def _decay_bars(alpha, tolerance):
+    # Bars after which the weight of everything before them drops below tolerance
+    return int(math.ceil(math.log(tolerance) / math.log(1.0 - alpha)))
+
+
+def warmup_bars(params=None, tolerance=WARMUP_TOLERANCE):
+    """
+    Get the number of trailing bars needed to evaluate the latest indicator values.
+
+    Recursive indicators (EMA, RMA) never fully forget old data, so the window is
+    chosen such that the weight of the discarded history stays below tolerance.
+    Windowed indicators (Bollinger Bands, market structure) need only their window.
+
+    Args:
+        params (dict, optional): Indicator parameter overrides
+        tolerance (float): Maximum weight left on discarded history
+
+    Returns:
+        int: Number of trailing bars to keep
+    """
+    p = resolve_params(params)
+
+    def ema_bars(length):
+        return length + _decay_bars(2.0 / (length + 1), tolerance)
+
+    def rma_bars(length):
+        # One extra bar for the price change / previous close
+        return 1 + length + _decay_bars(1.0 / length, tolerance)
+
+    return max(
+        rma_bars(p["rsi_length"]),
+        rma_bars(p["atr_length"]),
+        ema_bars(p["macd_slow"]) + ema_bars(p["macd_signal"]),
+        ema_bars(p["ema_short"]),
+        ema_bars(p["ema_long"]),
+        p["bb_length"],
+        p["ms_window"] + p["ms_lookback"]
+    )
+
+
+# Block length of the decay filter (one small triangular matmul per block)
+FILTER_BLOCK = 32
+
+
+def _decay_filter(inputs, decay, block=FILTER_BLOCK):
+    """
+    Linear recurrence y[t] = decay * y[t - 1] + inputs[t] along the bar axis (y[-1] = 0).
+
+    Bars are processed in blocks: the state at the end of every block is solved first
+    (one matrix-vector product per block and a Python loop over blocks, not bars), each
+    state is folded into the first input of the next block, and one matmul with the
+    triangular matrix of decay powers then filters all blocks independently. All powers
+    are at most 1, so the blocked form is as accurate as the recursion.
+
+    Args:
+        inputs (np.ndarray): Finite array of shape (rows, bars)
+        decay (float): Decay factor between 0 and 1
+
+    Returns:
+        np.ndarray: Filtered array of shape (rows, bars)
+    """
+    rows, bars = inputs.shape
+    if bars == 0:
+        return np.zeros((rows, 0))
+    block = min(block, bars)
+    blocks = -(-bars // block)
+    padded = np.zeros((rows, blocks, block))
+    padded.reshape(rows, -1)[:, :bars] = inputs
+    powers = decay ** np.arange(block + 1)
+    lags = np.arange(block)[np.newaxis, :] - np.arange(block)[:, np.newaxis]
+    # kernel[j, i] is the weight of input j of a block in output i of the same block
+    kernel = np.where(lags >= 0, powers[np.clip(lags, 0, block)], 0.0)
+    states = np.ascontiguousarray((padded @ kernel[:, -1]).T)
+    for index in range(1, blocks):
+        states[index] += powers[block] * states[index - 1]
+    padded[:, 1:, 0] += decay * states[:-1].T
+    return (padded.reshape(-1, block) @ kernel).reshape(rows, -1)[:, :bars]
+
+
+def _ewm_recursive(values, alpha, adjust):
+    # Bar-by-bar recursion for rows with gaps after their first observation when
+    # adjust=False (the missing bars change the weights, so the filter does not apply)
+    rows, bars = values.shape
+    # Work on a (bars, symbols) copy so every step reads contiguous memory
+    by_bar = np.ascontiguousarray(values.T)
+    is_obs = ~np.isnan(by_bar)
+    new_wt = 1.0 if adjust else alpha
+    decay = 1.0 - alpha
+
+    # Weight of the running mean before each bar's update: it decays on every bar,
+    # observed or not, and is zero until a row's first observation
+    prior_wt = np.empty((bars, rows))
+    old_wt = np.zeros(rows)
+    for col in range(bars):
+        np.multiply(old_wt, decay, out=prior_wt[col])
+        old_wt = prior_wt[col] + new_wt * is_obs[col] if adjust else np.where(is_obs[col], 1.0, prior_wt[col])
+
+    # Each bar is then a linear update mean = keep * mean + add (keep = 1, add = 0 on
+    # missing bars; keep = 0 on a row's first observation)
+    missing = ~is_obs
+    scale = np.reciprocal(prior_wt + new_wt)
+    keep = np.multiply(prior_wt, scale, out=prior_wt)
+    add = np.multiply(by_bar, scale, out=scale)
+    if not adjust:
+        add *= new_wt
+    np.copyto(keep, 1.0, where=missing)
+    np.copyto(add, 0.0, where=missing)
+    weighted = np.empty((bars, rows))
+    previous = np.zeros(rows)
+    for col in range(bars):
+        np.multiply(previous, keep[col], out=weighted[col])
+        weighted[col] += add[col]
+        previous = weighted[col]
+
+    return weighted.T
+
+
+def ewm_mean(values, alpha, adjust=True, min_periods=0, tail=None):
+    """
+    Exponentially weighted mean along the bar axis (pandas ewm semantics, ignore_na=False).
+
+    With adjusted weights the mean is a decay filter of the observations divided by the
+    sum of their weights, a closed-form geometric sum unless bars are missing after the
+    first observation (a second filter then tracks the weights). Without adjustment it
+    is one decay filter started at each row's first observation; rows with missing
+    bars after that fall back to the bar-by-bar recursion.
+
+    Args:
+        values (np.ndarray): Array of shape (symbols, bars)
+        alpha (float): Smoothing factor
+        adjust (bool): Use adjusted weights like pandas (default: True)
+        min_periods (int): Minimum observations before a value is emitted
+        tail (int, optional): Only return the last `tail` bars
+
+    Returns:
+        np.ndarray: Weighted means of shape (symbols, bars), or (symbols, tail)
+    """
+    values = _as_2d(values)
+    rows, bars = values.shape
+    first_out = bars - min(tail, bars) if tail else 0
+    is_obs = ~np.isnan(values)
+    decay = 1.0 - alpha
+    first = np.argmax(is_obs, axis=1)
+    has_obs = is_obs.any(axis=1)
+    elapsed = np.clip(np.arange(1, bars + 1)[np.newaxis, :] - first[:, np.newaxis], 0, None)
+    elapsed[~has_obs] = 0
+    started = elapsed > 0
+    gapped = (started & ~is_obs).any(axis=1)
+    # Missing bars after the first observation change the weights: with adjusted weights
+    # a second filter tracks them (except for alpha = 1, where they vanish); otherwise
+    # those rows fall back to the bar-by-bar recursion
+    recursive = gapped if not adjust or decay == 0 else np.zeros(rows, dtype=bool)
+
+    if adjust:
+        # Rows without gaps share one closed-form weight curve
+        weights = ((1.0 - decay ** np.arange(bars + 1)) / alpha)[elapsed]
+        tracked = gapped & ~recursive
+        if tracked.any():
+            weights[tracked] = _decay_filter(is_obs[tracked].astype(np.float64), decay)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weighted = _decay_filter(np.where(is_obs, values, 0.0), decay) / weights
+    else:
+        inputs = np.where(is_obs, alpha * values, 0.0)
+        seeded_rows = np.nonzero(has_obs)[0]
+        inputs[seeded_rows, first[seeded_rows]] = values[seeded_rows, first[seeded_rows]]
+        weighted = _decay_filter(inputs, decay)
+    if recursive.any():
+        weighted[recursive] = _ewm_recursive(values[recursive], alpha, adjust)
+
+    if min_periods > 1:
+        emitted = np.cumsum(is_obs, axis=1, dtype=np.int32) >= min_periods
+    else:
+        emitted = started
+    weighted[~emitted] = np.nan
+    return weighted[:, first_out:]
+
+
+def ema(values, length, tail=None):
+    """
+    Exponential moving average seeded with the SMA of the first `length` values.
+
+    Args:
+        values (np.ndarray): Array of shape (symbols, bars)
+        length (int): EMA span
+        tail (int, optional): Only return the last `tail` bars
+
+    Returns:
+        np.ndarray: EMA values (NaN during warm-up)
+    """
+    values = _as_2d(values)
+    rows, bars = values.shape
+    is_obs = ~np.isnan(values)
+    counts = np.cumsum(is_obs, axis=1)
+    has_seed = counts[:, -1] >= length if bars else np.zeros(rows, dtype=bool)
+
+    if not has_seed.any():
+        return np.full((rows, min(tail, bars) if tail else bars), np.nan)
+    seed_col = np.argmax(counts >= length, axis=1)
+    seed_mask = is_obs & (counts <= length)
+    seed_value = np.where(seed_mask, values, 0.0).sum(axis=1) / length
+
+    after_seed = np.arange(bars)[np.newaxis, :] > seed_col[:, np.newaxis]
+    seeded = np.where(after_seed & has_seed[:, np.newaxis], values, np.nan)
+    rows_with_seed = np.nonzero(has_seed)[0]
+    seeded[rows_with_seed, seed_col[rows_with_seed]] = seed_value[rows_with_seed]
+    return ewm_mean(seeded, alpha=2.0 / (length + 1), adjust=False, tail=tail)
+
+
+def rma(values, length, tail=None):
+    """
+    Wilder's moving average (adjusted EWM with alpha = 1 / length).
+
+    Args:
+        values (np.ndarray): Array of shape (symbols, bars)
+        length (int): Smoothing length
+        tail (int, optional): Only return the last `tail` bars
+
+    Returns:
+        np.ndarray: RMA values (NaN until `length` observations are available)
+    """
+    return ewm_mean(values, alpha=1.0 / length, adjust=True, min_periods=length, tail=tail)
+
+
+def _window_sum(values, length):
+    # Sum of every full window as `length` shifted-slice additions (contiguous passes
+    # instead of a reduction over a strided window view); NaNs propagate
+    count = values.shape[1] - length + 1
+    total = values[:, :count].copy()
+    for lag in range(1, length):
+        total += values[:, lag:lag + count]
+    return total
+
+
+def _window_std(values, length, ddof):
+    # Two-pass standard deviation of every full window (as accurate as np.std)
+    mean = _window_sum(values, length) / length
+    count = mean.shape[1]
+    squares = np.zeros(mean.shape)
+    for lag in range(length):
+        deviation = values[:, lag:lag + count] - mean
+        squares += deviation * deviation
+    return np.sqrt(squares / (length - ddof))
+
+
+def _window_extreme(values, length, ufunc):
+    # Max/min of every full window by doubling: after each step span[:, t] covers bars
+    # t .. t + width - 1, and two overlapping spans cover a window, so the cost grows
+    # with log2(length) rather than length. NaNs propagate.
+    count = values.shape[1] - length + 1
+    span, width = values, 1
+    while 2 * width <= length:
+        span = ufunc(span[:, :-width], span[:, width:])
+        width *= 2
+    return ufunc(span[:, :count], span[:, length - width:length - width + count])
+
+
+def _rolling(values, length, reducer, tail=None):
+    values = _as_2d(values)
+    if tail:
+        # Only the windows ending in the last `tail` bars are needed
+        values = values[:, -(length + tail - 1):]
+    rows, bars = values.shape
+    out = np.full((rows, bars), np.nan)
+    if bars >= length:
+        out[:, length - 1:] = reducer(values, length)
+    return out[:, -tail:] if tail else out
+
+
+def sma(values, length, tail=None):
+    """
+    Simple moving average (NaN while the window has missing values).
+
+    Args:
+        values (np.ndarray): Array of shape (symbols, bars)
+        length (int): Window length
+        tail (int, optional): Only return the last `tail` bars
+
+    Returns:
+        np.ndarray: SMA values
+    """
+    return _rolling(values, length, lambda v, n: _window_sum(v, n) / n, tail)
+
+
+def rolling_std(values, length, ddof=0, tail=None):
+    """
+    Rolling standard deviation (population by default, like pandas_ta bbands).
+
+    Args:
+        values (np.ndarray): Array of shape (symbols, bars)
+        length (int): Window length
+        ddof (int): Delta degrees of freedom
+        tail (int, optional): Only return the last `tail` bars
+
+    Returns:
+        np.ndarray: Standard deviation values
+    """
+    return _rolling(values, length, lambda v, n: _window_std(v, n, ddof), tail)
+
+
+def rolling_max(values, length):
+    """Rolling maximum over `length` bars."""
+    return _rolling(values, length, lambda v, n: _window_extreme(v, n, np.maximum))
+
+
+def rolling_min(values, length):
+    """Rolling minimum over `length` bars."""
+    return _rolling(values, length, lambda v, n: _window_extreme(v, n, np.minimum))
+
+
+def rsi(close, length=14, tail=None):
+    """
+    Relative Strength Index using Wilder smoothing.
+
+    Args:
+        close (np.ndarray): Close prices of shape (symbols, bars)
+        length (int): RSI period
+        tail (int, optional): Only return the last `tail` bars
+
+    Returns:
+        np.ndarray: RSI values between 0 and 100
+    """
+    close = _as_2d(close)
+    change = np.full(close.shape, np.nan)
+    change[:, 1:] = np.diff(close, axis=1)
+    gains = np.where(change > 0, change, np.where(np.isnan(change), np.nan, 0.0))
+    losses = np.where(change < 0, -change, np.where(np.isnan(change), np.nan, 0.0))
+    avg_gain = rma(gains, length, tail)
+    avg_loss = rma(losses, length, tail)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100.0 * avg_gain / (avg_gain + avg_loss)
+
+
+def macd(close, fast=12, slow=26, signal=9, tail=None):
+    """
+    Moving Average Convergence Divergence.
+
+    Args:
+        close (np.ndarray): Close prices of shape (symbols, bars)
+        fast (int): Fast EMA period
+        slow (int): Slow EMA period
+        signal (int): Signal EMA period
+        tail (int, optional): Only return the last `tail` bars
+
+    Returns:
+        tuple: (macd line, signal line, histogram) arrays
+    """
+    # The signal line needs the whole MACD line, so only the signal EMA is tail-evaluated
+    macd_line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(macd_line, signal, tail)
+    if tail:
+        macd_line = macd_line[:, -signal_line.shape[1]:]
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def true_range(high, low, close):
+    """
+    True range (NaN on the first bar, which has no previous close).
+
+    Args:
+        high (np.ndarray): High prices of shape (symbols, bars)
+        low (np.ndarray): Low prices of shape (symbols, bars)
+        close (np.ndarray): Close prices of shape (symbols, bars)
+
+    Returns:
+        np.ndarray: True range values
+    """
+    high, low, close = _as_2d(high), _as_2d(low), _as_2d(close)
+    prev_close = np.full(close.shape, np.nan)
+    prev_close[:, 1:] = close[:, :-1]
+    ranges = np.stack([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+    tr = ranges.max(axis=0)
+    tr[np.isnan(prev_close)] = np.nan
+    return tr
+
+
+def atr(high, low, close, length=14, tail=None):
+    """
+    Average True Range using Wilder smoothing.
+
+    Args:
+        high (np.ndarray): High prices of shape (symbols, bars)
+        low (np.ndarray): Low prices of shape (symbols, bars)
+        close (np.ndarray): Close prices of shape (symbols, bars)
+        length (int): ATR period
+        tail (int, optional): Only return the last `tail` bars
+
+    Returns:
+        np.ndarray: ATR values
+    """
+    return rma(true_range(high, low, close), length, tail)
+
+
+def bbands(close, length=20, std=2.0, tail=None):
+    """
+    Bollinger Bands around a simple moving average.
+
+    Args:
+        close (np.ndarray): Close prices of shape (symbols, bars)
+        length (int): Moving average period
+        std (float): Number of standard deviations
+        tail (int, optional): Only return the last `tail` bars
+
+    Returns:
+        tuple: (lower, middle, upper) band arrays
+    """
+    middle = sma(close, length, tail)
+    deviation = std * rolling_std(close, length, ddof=0, tail=tail)
+    return middle - deviation, middle, middle + deviation
+
+
+def compute_indicators(high, low, close, params=None, tail=None):
+    """
+    Compute indicator matrices for every symbol.
+
+    Args:
+        high (np.ndarray): High prices of shape (symbols, bars)
+        low (np.ndarray): Low prices of shape (symbols, bars)
+        close (np.ndarray): Close prices of shape (symbols, bars)
+        params (dict, optional): Indicator parameter overrides
+        tail (int, optional): Only return the last `tail` bars of each indicator
+
+    Returns:
+        dict: Indicator name to array of shape (symbols, bars), or (symbols, tail)
+    """
+    p = resolve_params(params)
+    macd_line, signal_line, histogram = macd(close, p["macd_fast"], p["macd_slow"], p["macd_signal"], tail)
+    bb_lower, bb_middle, bb_upper = bbands(close, p["bb_length"], p["bb_std"], tail)
+    return {
+        "rsi": rsi(close, p["rsi_length"], tail),
+        "macd": macd_line,
+        "macd_signal": signal_line,
+        "macd_hist": histogram,
+        "atr": atr(high, low, close, p["atr_length"], tail),
+        "ema_short": ema(close, p["ema_short"], tail),
+        "ema_long": ema(close, p["ema_long"], tail),
+        "bb_lower": bb_lower,
+        "bb_middle": bb_middle,
+        "bb_upper": bb_upper
+    }
+
+
+def market_structure(high, low, params=None):
+    """
+    Detect higher-highs/higher-lows (uptrend) and lower-highs/lower-lows (downtrend).
+
+    Args:
+        high (np.ndarray): High prices of shape (symbols, bars)
+        low (np.ndarray): Low prices of shape (symbols, bars)
+        params (dict, optional): Indicator parameter overrides
+
+    Returns:
+        tuple: (is_uptrend, is_downtrend) boolean arrays of shape (symbols,)
+    """
+    p = resolve_params(params)
+    window, lookback = p["ms_window"], p["ms_lookback"]
+    tail = window + lookback
+    high_changes = np.diff(rolling_max(_as_2d(high)[:, -tail:], window), axis=1)[:, -lookback:]
+    low_changes = np.diff(rolling_min(_as_2d(low)[:, -tail:], window), axis=1)[:, -lookback:]
+    with np.errstate(invalid="ignore"):
+        is_uptrend = (high_changes > 0).all(axis=1) & (low_changes > 0).all(axis=1)
+        is_downtrend = (high_changes < 0).all(axis=1) & (low_changes < 0).all(axis=1)
+    return is_uptrend, is_downtrend
+
+
+def latest_values(high, low, close, params=None, last=1, tolerance=WARMUP_TOLERANCE):
+    """
+    Compute the latest value(s) of every indicator for all symbols.
+
+    Only the trailing warm-up window (see warmup_bars) is evaluated and no
+    full-length indicator series are materialized.
+
+    Args:
+        high (np.ndarray): High prices of shape (symbols, bars)
+        low (np.ndarray): Low prices of shape (symbols, bars)
+        close (np.ndarray): Close prices of shape (symbols, bars)
+        params (dict, optional): Indicator parameter overrides
+        last (int): Number of trailing values to return per indicator
+        tolerance (float): Warm-up tolerance (None evaluates the full history)
+
+    Returns:
+        dict: Indicator name to array of shape (symbols,) (or (symbols, last) when
+              last > 1), plus the latest close, the period high/low used for
+              Fibonacci levels and the market structure flags
+    """
+    high, low, close = _as_2d(high), _as_2d(low), _as_2d(close)
+    window = warmup_bars(params, tolerance) + last - 1 if tolerance else close.shape[1]
+    indicators = compute_indicators(high[:, -window:], low[:, -window:], close[:, -window:], params, tail=last)
+    latest = {name: series[:, -1] if last == 1 else series for name, series in indicators.items()}
+    is_uptrend, is_downtrend = market_structure(high, low, params)
+    with np.errstate(invalid="ignore"):
+        latest.update({
+            "close": close[:, -1],
+            "period_high": np.nanmax(high, axis=1) if high.shape[1] else np.full(len(high), np.nan),
+            "period_low": np.nanmin(low, axis=1) if low.shape[1] else np.full(len(low), np.nan),
+            "is_uptrend": is_uptrend,
+            "is_downtrend": is_downtrend
+        })
+    return latest
+
+
+def screen_histories(histories, params=None, tolerance=WARMUP_TOLERANCE):
+    """
+    Compute the latest indicator values for a universe of tickers in one pass.
+
+    Args:
+        histories (dict): Mapping of ticker to OHLCV DataFrame
+        params (dict, optional): Indicator parameter overrides
+        tolerance (float): Warm-up tolerance for the tail-only evaluation
+
+    Returns:
+        dict: Mapping of ticker to a dict of latest indicator values
+    """
+    symbols, matrices, _ = align_histories(histories)
+    if not symbols:
+        return {}
+    latest = latest_values(matrices["High"], matrices["Low"], matrices["Close"], params, tolerance=tolerance)
+    logger.debug(f"Computed indicators for {len(symbols)} tickers over {matrices['Close'].shape[1]} bars")
+    return {
+        ticker: {name: values[row].item() for name, values in latest.items()}
+        for row, ticker in enumerate(symbols)
+    }
@@ -0,0 +1,171 @@
+"""
+PyTrade - Indicator Memo Module
+
+This module memoizes indicator results so that repeated analyses of the same data
+cost a dictionary lookup. Results are keyed on the symbol, the bar interval, the
+indicator parameter set and a fingerprint of the input history: the number of bars,
+the first and last bar timestamps and the last bar's high, low and close. A new bar,
+a longer or shorter period, or a change in the forming bar's prices (intraday quotes
+on today's daily bar) produces a new key; otherwise the stored result is reused.
+
+Earlier bars are assumed immutable. Corporate-action re-adjustments rewrite the whole
+history including the last bar, so they change the fingerprint as well.
+
+Key features:
+- Memo keys built from symbol, interval, parameters and the last-bar fingerprint
+- Latest swing trading indicator values for single tickers and whole batches
+- Batch misses computed together in one vectorized indicator_engine pass
+- Generic get_or_compute for other indicator derivations
+- Bounded LRU storage with hit/miss statistics
+
+Author: PyTrade Development Team
+Version: 1.0.0
+Date: October 17, 2026
+License: Proprietary
+"""
+
+import os
+import logging
+from ttl_cache import TTLCache, make_cache_key
+from indicator_engine import resolve_params, screen_histories
+
+logger = logging.getLogger(__name__)
+
+# Entries are only ever superseded by new keys, so the TTL merely bounds memory
+MEMO_TTL = int(os.environ.get("PYTRADE_INDICATOR_MEMO_TTL", 86400))
+MEMO_MAX_ENTRIES = int(os.environ.get("PYTRADE_INDICATOR_MEMO_MAX_ENTRIES", 8192))
+
+
+def history_fingerprint(hist):
+    """
+    Summarize the parts of a history that identify its indicator results.
+
+    Args:
+        hist (pd.DataFrame): OHLCV history
+
+    Returns:
+        tuple: (bars, first timestamp, last timestamp, last high, last low, last close)
+    """
+    if hist is None or hist.empty:
+        return (0,)
+    index = hist.index
+    return (len(hist), str(index[0]), str(index[-1]),
+            float(hist["High"].iat[-1]), float(hist["Low"].iat[-1]), float(hist["Close"].iat[-1]))
+
+
+class IndicatorMemo:
+    """
+    Memo of indicator results keyed on symbol, interval, parameters and input data.
+    """
+
+    def __init__(self, max_entries=MEMO_MAX_ENTRIES, ttl=MEMO_TTL):
+        self.cache = TTLCache("indicator-memo", max_entries=max_entries, default_ttl=ttl)
+
+    @staticmethod
+    def memo_key(symbol, hist, name="latest", interval="1d", params=None):
+        """
+        Build the memo key for an indicator computation.
+
+        Args:
+            symbol (str): Ticker symbol
+            hist (pd.DataFrame): Input history
+            name (str): Name of the computation
+            interval (str): Bar interval
+            params (dict, optional): Parameters of the computation
+
+        Returns:
+            str: Memo key
+        """
+        param_items = tuple(sorted((params or {}).items()))
+        return make_cache_key(name, (symbol, interval, param_items, history_fingerprint(hist)), {})
+
+    def get_or_compute(self, symbol, hist, compute, name="latest", interval="1d", params=None):
+        """
+        Return a memoized result, computing and storing it on a miss.
+
+        Args:
+            symbol (str): Ticker symbol
+            hist (pd.DataFrame): Input history
+            compute (callable): Called with hist on a miss
+            name (str): Name of the computation (separates different derivations)
+            interval (str): Bar interval
+            params (dict, optional): Parameters of the computation
+
+        Returns:
+            The computed or memoized result
+        """
+        key = self.memo_key(symbol, hist, name, interval, params)
+        result = self.cache.get(key)
+        if result is None:
+            result = compute(hist)
+            if result is not None:
+                self.cache.set(key, result)
+        else:
+            logger.debug(f"Indicator memo hit for {symbol} ({name}, {interval})")
+        return result
+
+    def latest_values(self, symbol, hist, interval="1d", params=None):
+        """
+        Get the latest swing trading indicator values for one ticker.
+
+        Args:
+            symbol (str): Ticker symbol
+            hist (pd.DataFrame): OHLCV history
+            interval (str): Bar interval
+            params (dict, optional): Indicator parameter overrides
+
+        Returns:
+            dict: Latest indicator values (see indicator_engine.screen_histories), or None
+        """
+        resolved = resolve_params(params)
+        result = self.get_or_compute(symbol, hist, lambda h: screen_histories({symbol: h}, resolved).get(symbol),
+                                     interval=interval, params=resolved)
+        return dict(result) if result is not None else None
+
+    def latest_values_batch(self, histories, interval="1d", params=None, compute=None):
+        """
+        Get the latest indicator values for many tickers, computing only the misses.
+
+        Args:
+            histories (dict): Mapping of ticker to OHLCV DataFrame
+            interval (str): Bar interval
+            params (dict, optional): Indicator parameter overrides
+            compute (callable, optional): Called with (histories, params) for the
+                misses (default: indicator_engine.screen_histories)
+
+        Returns:
+            dict: Mapping of ticker to latest indicator values
+        """
+        resolved = resolve_params(params)
+        results, misses = {}, {}
+        for ticker, hist in histories.items():
+            if hist is None or hist.empty:
+                continue
+            key = self.memo_key(ticker, hist, interval=interval, params=resolved)
+            cached = self.cache.get(key)
+            if cached is None:
+                misses[ticker] = (key, hist)
+            else:
+                results[ticker] = dict(cached)
+
+        if misses:
+            compute = compute or screen_histories
+            computed = compute({ticker: hist for ticker, (_, hist) in misses.items()}, resolved)
+            for ticker, values in computed.items():
+                self.cache.set(misses[ticker][0], values)
+                results[ticker] = dict(values)
+        logger.debug(f"Indicator memo: {len(histories) - len(misses)} hits, {len(misses)} computed")
+        return results
+
+    def stats(self):
+        """
+        Get memo statistics.
+
+        Returns:
+            dict: Hit/miss counters and entry counts of the underlying cache
+        """
+        return self.cache.stats()
+
+
+# Shared memo used by the swing trading analysis
+memo = IndicatorMemo()
@@ -0,0 +1,300 @@
+"""
+PyTrade - Market Data Module
+
+This module provides batched OHLCV acquisition for multi-ticker workloads such as
+the swing trading batch endpoint. Instead of issuing one history request per ticker,
+the ticker list is grouped by data provider and exchange suffix, and each group is
+fetched with a single bulk download. The result is sliced into per-ticker DataFrames
+with the same shape that yf.Ticker(...).history() returns.
+
+Key features:
+- Grouping of tickers by provider and exchange suffix (.NS or plain)
+- One bulk Yahoo Finance download per group (chunked for very large universes)
+- Per-ticker DataFrame slicing compatible with the single-ticker analysis code
+- Incremental updates through the local OHLCV store (only bars after the watermark)
+- Bulk latest-quote snapshots (one quote endpoint call per chunk of tickers)
+
+Author: PyTrade Development Team
+Version: 1.0.0
+Date: October 17, 2026
+License: Proprietary
+"""
+
+import logging
+import pandas as pd
+import yfinance as yf
+from ohlcv_store import store as ohlcv_store
+from stage_timing import stage, count_call
+
+logger = logging.getLogger(__name__)
+
+# Indian tickers that are quoted on NSE even when passed without a suffix
+NSE_DEFAULT_TICKERS = {
+    "RELIANCE", "TCS", "HDFCBANK", "ICICIBANK", "SBIN",
+    "BHARTIARTL", "ITC", "KOTAKBANK", "HCLTECH", "HINDUNILVR",
+    "MARUTI", "ONGC", "TATAMOTORS", "ADANIPORTS"
+}
+
+# Maximum number of tickers sent to Yahoo Finance in a single bulk download
+BULK_CHUNK_SIZE = 100
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# Yahoo Finance quote endpoint (many symbols per request) and the number of tickers per call
+YAHOO_QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+QUOTE_CHUNK_SIZE = 200
+# Daily bars fetched when quotes are derived from a bulk download (covers weekends and holidays)
+QUOTE_BAR_PERIOD = "5d"
+
+
+def is_indian_ticker(ticker):
+    """
+    Check whether a ticker should be treated as an NSE-listed Indian stock.
+
+    Args:
+        ticker (str): Stock ticker symbol
+
+    Returns:
+        bool: True if the ticker is an NSE stock
+    """
+    return ticker in NSE_DEFAULT_TICKERS or ticker.endswith(".NS")
+
+
+def to_yahoo_ticker(ticker):
+    """
+    Convert a ticker to the symbol Yahoo Finance expects.
+
+    Args:
+        ticker (str): Stock ticker symbol
+
+    Returns:
+        str: Yahoo Finance ticker (with .NS suffix for Indian stocks)
+    """
+    if is_indian_ticker(ticker) and not ticker.endswith(".NS"):
+        return f"{ticker}.NS"
+    return ticker
+
+
+def group_tickers_by_provider(tickers):
+    """
+    Group tickers by data provider and exchange suffix.
+
+    Args:
+        tickers (list): List of ticker symbols
+
+    Returns:
+        dict: Mapping of (provider, suffix) to a list of (ticker, yahoo_ticker) pairs
+    """
+    groups = {}
+    for ticker in tickers:
+        suffix = ".NS" if is_indian_ticker(ticker) else ""
+        groups.setdefault(("yahoo", suffix), []).append((ticker, to_yahoo_ticker(ticker)))
+    return groups
+
+
+def _slice_ticker_frame(data, yahoo_ticker, single_ticker):
+    """
+    Extract the OHLCV frame for one ticker from a bulk download result.
+
+    Args:
+        data (pd.DataFrame): Result of yf.download with group_by='ticker'
+        yahoo_ticker (str): Yahoo Finance ticker to extract
+        single_ticker (bool): Whether the download contained only this ticker
+
+    Returns:
+        pd.DataFrame: OHLCV data for the ticker (empty if unavailable)
+    """
+    if isinstance(data.columns, pd.MultiIndex):
+        if yahoo_ticker not in data.columns.get_level_values(0):
+            return pd.DataFrame()
+        frame = data[yahoo_ticker]
+    elif single_ticker:
+        frame = data
+    else:
+        return pd.DataFrame()
+
+    columns = [col for col in OHLCV_COLUMNS if col in frame.columns]
+    frame = frame[columns].dropna(how="all")
+    return frame.copy()
+
+
+def _bulk_download(yahoo_tickers, interval, **kwargs):
+    """
+    Run one Yahoo Finance bulk download for a chunk of tickers.
+
+    Args:
+        yahoo_tickers (list): Yahoo Finance tickers
+        interval (str): Bar interval
+        **kwargs: Either period or start for yf.download
+
+    Returns:
+        pd.DataFrame: Bulk download result grouped by ticker (may be empty)
+    """
+    count_call("yahoo_download")
+    with stage("history.bulk_download"):
+        return yf.download(
+            tickers=yahoo_tickers,
+            interval=interval,
+            group_by="ticker",
+            auto_adjust=True,
+            threads=True,
+            progress=False,
+            **kwargs
+        )
+
+
+def download_history_batch(tickers, period="60d", interval="1d"):
+    """
+    Fetch OHLCV history for many tickers using one bulk call per provider group.
+
+    Tickers whose local OHLCV store is fresh are served from disk. The rest are
+    split into tickers that only need the bars after their stored watermark and
+    tickers that need the full period, and each of those sets is downloaded in bulk.
+
+    Args:
+        tickers (list): List of ticker symbols
+        period (str): Yahoo Finance period (e.g. 60d, 120d, 250d)
+        interval (str): Bar interval (default: 1d)
+
+    Returns:
+        dict: Mapping of ticker to OHLCV DataFrame. Tickers that could not be
+              fetched in bulk are omitted so callers can fall back to a
+              per-ticker request.
+    """
+    histories = {}
+    unique_tickers = list(dict.fromkeys(tickers))
+    if not unique_tickers:
+        return histories
+
+    for (provider, suffix), members in group_tickers_by_provider(unique_tickers).items():
+        full_fetch, incremental_fetch = [], []
+        for ticker, yahoo_ticker in members:
+            cached = ohlcv_store.cached_history(yahoo_ticker, period, interval)
+            if cached is not None and not cached.empty:
+                histories[ticker] = cached
+                continue
+            start = ohlcv_store.incremental_start(yahoo_ticker, period, interval)
+            if start is None:
+                full_fetch.append((ticker, yahoo_ticker, None))
+            else:
+                incremental_fetch.append((ticker, yahoo_ticker, start))
+
+        for pending, incremental in ((full_fetch, False), (incremental_fetch, True)):
+            for begin in range(0, len(pending), BULK_CHUNK_SIZE):
+                chunk = pending[begin:begin + BULK_CHUNK_SIZE]
+                yahoo_tickers = [yahoo_ticker for _, yahoo_ticker, _ in chunk]
+                if incremental:
+                    fetch_args = {"start": min(start for _, _, start in chunk)}
+                else:
+                    fetch_args = {"period": period}
+                logger.info(f"Bulk downloading {len(yahoo_tickers)} tickers from {provider} "
+                            f"(suffix '{suffix or 'none'}', {fetch_args}, interval={interval})")
+                try:
+                    data = _bulk_download(yahoo_tickers, interval, **fetch_args)
+                except Exception as e:
+                    logger.error(f"Bulk download failed for group {provider}{suffix}: {e}")
+                    continue
+
+                if data is None:
+                    data = pd.DataFrame()
+                if data.empty and not incremental:
+                    logger.warning(f"Bulk download returned no data for group {provider}{suffix}")
+                    continue
+
+                for ticker, yahoo_ticker, _ in chunk:
+                    frame = _slice_ticker_frame(data, yahoo_ticker, len(chunk) == 1) if not data.empty else pd.DataFrame()
+                    if frame.empty and not incremental:
+                        logger.warning(f"No bulk data for {yahoo_ticker}, caller will fetch it individually")
+                        continue
+                    try:
+                        frame = ohlcv_store.merge(yahoo_ticker, period, interval, frame, incremental=incremental)
+                    except Exception as e:
+                        logger.error(f"Error updating OHLCV store for {yahoo_ticker}: {e}")
+                        if incremental:
+                            # Only the bars after the watermark were fetched; the caller
+                            # fetches the full period individually
+                            continue
+                    if not frame.empty:
+                        histories[ticker] = frame
+
+    logger.info(f"Bulk download returned history for {len(histories)}/{len(unique_tickers)} tickers")
+    return histories
+
+
+def _quote_endpoint(yahoo_tickers):
+    # One request for the whole chunk through yfinance's session (handles the crumb)
+    from yfinance.data import YfData
+    count_call("yahoo_quote")
+    with stage("quotes.quote_endpoint"):
+        payload = YfData().get_raw_json(YAHOO_QUOTE_URL, params={"symbols": ",".join(yahoo_tickers)})
+    quotes = {}
+    for item in (payload.get("quoteResponse") or {}).get("result") or []:
+        if item.get("regularMarketPrice") is None:
+            continue
+        quotes[item["symbol"]] = {
+            "price": item["regularMarketPrice"],
+            "previous_close": item.get("regularMarketPreviousClose"),
+            "high": item.get("regularMarketDayHigh"),
+            "low": item.get("regularMarketDayLow"),
+            "volume": item.get("regularMarketVolume"),
+            "currency": item.get("currency"),
+            # Epoch seconds of the last trade (stays at the last close outside sessions)
+            "market_time": item.get("regularMarketTime")
+        }
+    return quotes
+
+
+def _quotes_from_bars(yahoo_tickers):
+    # Latest daily bar as the quote and the bar before it as the previous close
+    data = _bulk_download(yahoo_tickers, "1d", period=QUOTE_BAR_PERIOD)
+    quotes = {}
+    if data is None or data.empty:
+        return quotes
+    for yahoo_ticker in yahoo_tickers:
+        frame = _slice_ticker_frame(data, yahoo_ticker, len(yahoo_tickers) == 1)
+        if frame.empty or "Close" not in frame.columns:
+            continue
+        frame = frame.dropna(subset=["Close"])
+        if frame.empty:
+            continue
+        last = frame.iloc[-1]
+        quotes[yahoo_ticker] = {
+            "price": float(last["Close"]),
+            "previous_close": float(frame["Close"].iloc[-2]) if len(frame) > 1 else None,
+            "high": float(last["High"]) if "High" in frame.columns else None,
+            "low": float(last["Low"]) if "Low" in frame.columns else None,
+            "volume": float(last["Volume"]) if "Volume" in frame.columns else None,
+            "currency": None,
+            "market_time": frame.index[-1]
+        }
+    return quotes
+
+
+def download_quotes(yahoo_tickers):
+    """
+    Fetch the latest quote for many tickers with one upstream call per chunk.
+
+    The Yahoo Finance quote endpoint is used first; if it fails for a chunk, the
+    quotes are derived from one bulk download of the last daily bars instead.
+
+    Args:
+        yahoo_tickers (list): Yahoo Finance tickers
+
+    Returns:
+        dict: Mapping of Yahoo ticker to {"price", "previous_close", "high", "low",
+              "volume", "currency", "market_time"} for the tickers that returned a quote
+    """
+    quotes = {}
+    unique_tickers = list(dict.fromkeys(yahoo_tickers))
+    for begin in range(0, len(unique_tickers), QUOTE_CHUNK_SIZE):
+        chunk = unique_tickers[begin:begin + QUOTE_CHUNK_SIZE]
+        try:
+            quotes.update(_quote_endpoint(chunk))
+            continue
+        except Exception as e:
+            logger.warning(f"Quote endpoint failed for {len(chunk)} tickers ({e}), using a bulk bar download")
+        try:
+            quotes.update(_quotes_from_bars(chunk))
+        except Exception as e:
+            logger.error(f"Bulk quote download failed for {len(chunk)} tickers: {e}")
+    return quotes
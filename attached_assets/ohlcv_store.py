@@ -0,0 +1,486 @@
+"""
+PyTrade - OHLCV Store Module
+
+This module implements a persistent, incremental OHLCV store on local disk. Each
+(symbol, interval) pair is kept as a set of columnar NumPy arrays that are read back
+memory-mapped, together with a small metadata file that records the last-bar
+watermark and the oldest date the store is known to cover.
+
+When history is requested, only the bars after the watermark are pulled from the
+upstream provider and merged into the store; the rest of the window is served from
+disk. The watermark bar itself is always re-fetched because the current session's bar
+is still forming.
+
+Key features:
+- Columnar, memory-mapped storage (one .npy file per column)
+- Last-bar watermark with incremental upstream fetches
+- Coverage tracking so longer periods trigger a one-off backfill
+- Period windows counted back from the last bar's session, not the current time
+- Detection of split/dividend re-adjustments, which force a full refresh
+- Atomic generation swaps so readers never observe a half-written store
+
+Author: PyTrade Development Team
+Version: 1.0.0
+Date: October 17, 2026
+License: Proprietary
+"""
+
+import os
+import re
+import json
+import glob
+import time
+import logging
+import threading
+from urllib.parse import quote
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from stage_timing import stage, count_call
+
+logger = logging.getLogger(__name__)
+
+# Constants
+STORE_DIR = os.environ.get(
+    "PYTRADE_OHLCV_STORE_DIR",
+    os.path.join(os.path.dirname(__file__), "cache", "ohlcv")
+)
+# Requests within this many seconds of the last upstream fetch are served from disk only
+REFRESH_SECONDS = int(os.environ.get("PYTRADE_OHLCV_REFRESH_SECONDS", 60))
+# Relative change in the watermark bar's open that indicates a re-adjusted history
+ADJUSTMENT_TOLERANCE = 0.005
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+INTRADAY_INTERVALS = {"1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h"}
+
+
+def period_start(period, now=None):
+    """
+    Compute the first timestamp covered by a Yahoo Finance period string.
+
+    Args:
+        period (str): Period such as 5d, 60d, 1mo, 1y, ytd or max
+        now (pd.Timestamp, optional): Reference time (default: current UTC time)
+
+    Returns:
+        pd.Timestamp: Start of the period in UTC, or None for 'max'
+    """
+    now = now if now is not None else pd.Timestamp.now(tz="UTC")
+    if period == "max":
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=now.year, month=1, day=1, tz="UTC")
+
+    match = re.match(r"^(\d+)(d|wk|mo|y)$", str(period))
+    if not match:
+        logger.warning(f"Unrecognized period '{period}', treating it as 1y")
+        return now - pd.DateOffset(years=1)
+
+    amount, unit = int(match.group(1)), match.group(2)
+    if unit == "d":
+        return now - pd.Timedelta(days=amount)
+    if unit == "wk":
+        return now - pd.Timedelta(weeks=amount)
+    if unit == "mo":
+        return now - pd.DateOffset(months=amount)
+    return now - pd.DateOffset(years=amount)
+
+
+def window_start(period, last_bar):
+    """
+    Compute the first timestamp of a period's window of stored bars.
+
+    The window is counted back from the end of the last bar's session day rather
+    than from the current time, so weekends and holidays after the last session do
+    not push bars out of it (a 1d window on a Saturday is Friday's session).
+
+    Args:
+        period (str): Period such as 1d, 5d, 60d or 1y
+        last_bar (pd.Timestamp): Timestamp of the last available bar
+
+    Returns:
+        pd.Timestamp: Start of the window in UTC, or None for 'max'
+    """
+    if last_bar.tzinfo is None:
+        last_bar = last_bar.tz_localize("UTC")
+    session_end = last_bar.normalize() + pd.Timedelta(days=1)
+    return period_start(period, session_end.tz_convert("UTC"))
+
+
+def _slice_period(frame, required_start):
+    """Return the bars of frame at or after required_start (None keeps everything)."""
+    if required_start is None or frame.empty:
+        return frame
+    if frame.index.tz is None:
+        required_start = required_start.tz_convert(None)
+    return frame[frame.index >= required_start]
+
+
+def _match_tz(frame, tz):
+    """
+    Express a frame's index in the timezone of the stored bars.
+
+    yf.download returns daily bars tz-naive (exchange-local dates) while
+    Ticker.history returns them tz-aware, and both feed the same store key. Naive
+    bars are taken as wall time in tz; aware bars keep their wall time when the
+    store is naive.
+    """
+    if frame.empty:
+        return frame
+    index = frame.index
+    if index.tz is None and tz is not None:
+        index = index.tz_localize(tz, ambiguous="NaT", nonexistent="shift_forward")
+    elif index.tz is not None:
+        index = index.tz_convert(tz) if tz is not None else index.tz_localize(None)
+    else:
+        return frame
+    frame = frame.copy()
+    frame.index = index
+    return frame[frame.index.notna()]
+
+
+def slice_history(frame, period):
+    """
+    Cut a history down to the bars of a shorter period, exactly as a fetch of that
+    period would have returned them from the store.
+
+    Args:
+        frame (pd.DataFrame): OHLCV history covering at least the period
+        period (str): Period such as 60d or 1y
+
+    Returns:
+        pd.DataFrame: Bars in the period's window ending with the last bar's session
+    """
+    if frame.empty:
+        return frame
+    return _slice_period(frame, window_start(period, frame.index[-1]))
+
+
+def _yahoo_fetch(symbol, interval, start=None, period=None):
+    """
+    Default upstream fetcher backed by yf.Ticker(...).history().
+
+    Args:
+        symbol (str): Yahoo Finance ticker
+        interval (str): Bar interval
+        start (str or pd.Timestamp, optional): Fetch bars from this point on
+        period (str, optional): Fetch this period when no start is given
+
+    Returns:
+        pd.DataFrame: OHLCV history
+    """
+    ticker = yf.Ticker(symbol)
+    count_call("yahoo_history")
+    with stage("history.yahoo"):
+        if start is not None:
+            return ticker.history(start=start, interval=interval)
+        return ticker.history(period=period, interval=interval)
+
+
+class OHLCVStore:
+    """
+    Persistent per-symbol, per-interval OHLCV store with last-bar watermarks.
+    """
+
+    def __init__(self, root=STORE_DIR, refresh_seconds=REFRESH_SECONDS, fetch_fn=_yahoo_fetch):
+        self.root = root
+        self.refresh_seconds = refresh_seconds
+        self.fetch_fn = fetch_fn
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Storage helpers
+    # ------------------------------------------------------------------
+    def _key_dir(self, symbol, interval):
+        return os.path.join(self.root, quote(symbol, safe=""), interval)
+
+    def _lock(self, symbol, interval):
+        with self._locks_guard:
+            return self._locks.setdefault((symbol, interval), threading.Lock())
+
+    def _read_meta(self, symbol, interval):
+        meta_path = os.path.join(self._key_dir(symbol, interval), "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading OHLCV store metadata for {symbol} ({interval}): {e}")
+            return None
+
+    def _load_columns(self, symbol, interval, meta):
+        """Open the current generation of column arrays memory-mapped."""
+        key_dir = self._key_dir(symbol, interval)
+        generation = meta["generation"]
+        columns = {}
+        for name in ["ts"] + PRICE_COLUMNS:
+            path = os.path.join(key_dir, f"{name}.{generation}.npy")
+            columns[name] = np.load(path, mmap_mode="r")
+        return columns
+
+    def _to_frame(self, columns, tz, start=None):
+        """Build a DataFrame from column arrays, copying only bars from start onward."""
+        ts = columns["ts"]
+        first = 0
+        if start is not None and len(ts):
+            first = int(np.searchsorted(ts, start.value, side="left"))
+        index = pd.to_datetime(np.asarray(ts[first:]), utc=True)
+        index = index.tz_convert(tz) if tz else index.tz_localize(None)
+        frame = pd.DataFrame(
+            {name: np.array(columns[name][first:]) for name in PRICE_COLUMNS},
+            index=index
+        )
+        frame.index.name = "Date"
+        return frame
+
+    def _write(self, symbol, interval, frame, meta):
+        """Persist a full frame as a new generation and atomically switch metadata to it."""
+        key_dir = self._key_dir(symbol, interval)
+        os.makedirs(key_dir, exist_ok=True)
+        generation = (meta or {}).get("generation", 0) + 1
+
+        index = frame.index
+        tz = str(index.tz) if index.tz is not None else None
+        utc_index = index.tz_convert("UTC") if index.tz is not None else index.tz_localize("UTC")
+        arrays = {"ts": utc_index.as_unit("ns").asi8.astype(np.int64)}
+        for name in PRICE_COLUMNS:
+            values = frame[name] if name in frame.columns else pd.Series(0.0, index=index)
+            arrays[name] = values.to_numpy(dtype=np.float64)
+
+        for name, values in arrays.items():
+            tmp_path = os.path.join(key_dir, f".{name}.{generation}.npy.tmp")
+            with open(tmp_path, "wb") as f:
+                np.save(f, values)
+            os.replace(tmp_path, os.path.join(key_dir, f"{name}.{generation}.npy"))
+
+        new_meta = dict(meta or {})
+        new_meta.update({
+            "symbol": symbol,
+            "interval": interval,
+            "generation": generation,
+            "tz": tz,
+            "bars": int(len(frame)),
+            "watermark": int(arrays["ts"][-1]) if len(frame) else None,
+            "fetched_at": time.time()
+        })
+        tmp_meta = os.path.join(key_dir, ".meta.json.tmp")
+        with open(tmp_meta, "w") as f:
+            json.dump(new_meta, f)
+        os.replace(tmp_meta, os.path.join(key_dir, "meta.json"))
+
+        # Remove superseded generations; open memory maps stay valid on POSIX
+        for path in glob.glob(os.path.join(key_dir, "*.npy")):
+            if not path.endswith(f".{generation}.npy"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        return new_meta
+
+    def _touch(self, symbol, interval, meta):
+        """Record an upstream check that returned no new bars."""
+        meta = dict(meta)
+        meta["fetched_at"] = time.time()
+        key_dir = self._key_dir(symbol, interval)
+        tmp_meta = os.path.join(key_dir, ".meta.json.tmp")
+        with open(tmp_meta, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, os.path.join(key_dir, "meta.json"))
+        return meta
+
+    @staticmethod
+    def _covers(meta, required_start):
+        coverage = meta.get("coverage_start")
+        if coverage == "max":
+            return True
+        if required_start is None or coverage is None:
+            return False
+        return coverage <= required_start.value
+
+    @staticmethod
+    def _coverage_value(required_start):
+        return "max" if required_start is None else int(required_start.value)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def watermark(self, symbol, interval):
+        """
+        Get the timestamp of the last stored bar.
+
+        Args:
+            symbol (str): Yahoo Finance ticker
+            interval (str): Bar interval
+
+        Returns:
+            pd.Timestamp: Last-bar watermark in UTC, or None if nothing is stored
+        """
+        meta = self._read_meta(symbol, interval)
+        if not meta or meta.get("watermark") is None:
+            return None
+        return pd.Timestamp(meta["watermark"], tz="UTC")
+
+    def cached_history(self, symbol, period, interval, force_refresh=False):
+        """
+        Serve history purely from disk when the store is fresh and covers the period.
+
+        Args:
+            symbol (str): Yahoo Finance ticker
+            period (str): Requested period
+            interval (str): Bar interval
+            force_refresh (bool): Skip the freshness window
+
+        Returns:
+            pd.DataFrame: Stored history, or None if an upstream fetch is required
+        """
+        meta = self._read_meta(symbol, interval)
+        if not meta or not meta.get("bars") or not self._covers(meta, period_start(period)):
+            return None
+        if force_refresh or time.time() - meta.get("fetched_at", 0) > self.refresh_seconds:
+            return None
+        try:
+            watermark = pd.Timestamp(meta["watermark"], tz="UTC")
+            if meta.get("tz"):
+                watermark = watermark.tz_convert(meta["tz"])
+            start = window_start(period, watermark)
+            return self._to_frame(self._load_columns(symbol, interval, meta), meta.get("tz"), start)
+        except Exception as e:
+            logger.error(f"Error reading OHLCV store for {symbol} ({interval}): {e}")
+            return None
+
+    def incremental_start(self, symbol, period, interval):
+        """
+        Determine where an upstream fetch needs to start for this symbol.
+
+        Args:
+            symbol (str): Yahoo Finance ticker
+            period (str): Requested period
+            interval (str): Bar interval
+
+        Returns:
+            str or pd.Timestamp: Start of the incremental fetch (the watermark bar),
+                or None if a full fetch of the period is required
+        """
+        meta = self._read_meta(symbol, interval)
+        if not meta or meta.get("watermark") is None or not self._covers(meta, period_start(period)):
+            return None
+        watermark = pd.Timestamp(meta["watermark"], tz="UTC")
+        if meta.get("tz"):
+            watermark = watermark.tz_convert(meta["tz"])
+        if interval in INTRADAY_INTERVALS:
+            return watermark
+        return watermark.strftime("%Y-%m-%d")
+
+    def merge(self, symbol, period, interval, fetched, incremental):
+        """
+        Merge freshly fetched bars into the store and return the requested window.
+
+        Args:
+            symbol (str): Yahoo Finance ticker
+            period (str): Requested period
+            interval (str): Bar interval
+            fetched (pd.DataFrame): Bars returned by the upstream provider
+            incremental (bool): Whether the fetch started at the watermark
+
+        Returns:
+            pd.DataFrame: History for the requested period
+        """
+        required_start = period_start(period)
+        with self._lock(symbol, interval):
+            meta = self._read_meta(symbol, interval)
+            fetched = fetched[[col for col in PRICE_COLUMNS if col in fetched.columns]].dropna(how="all")
+
+            if incremental and meta and meta.get("bars"):
+                stored = self._to_frame(self._load_columns(symbol, interval, meta), meta.get("tz"))
+                fetched = _match_tz(fetched, stored.index.tz)
+                if fetched.empty:
+                    self._touch(symbol, interval, meta)
+                    return slice_history(stored, period)
+
+                # The watermark bar is re-fetched; a moved open means the provider re-adjusted history
+                overlap = stored.index.intersection(fetched.index)
+                if len(overlap):
+                    old_open = float(stored.loc[overlap[0], "Open"])
+                    new_open = float(fetched.loc[overlap[0], "Open"])
+                    if old_open and abs(new_open - old_open) / abs(old_open) > ADJUSTMENT_TOLERANCE:
+                        logger.info(f"History for {symbol} ({interval}) was re-adjusted upstream, refetching in full")
+                        fetched = self.fetch_fn(symbol, interval, period=period)
+                        fetched = fetched[[col for col in PRICE_COLUMNS if col in fetched.columns]].dropna(how="all")
+                        incremental = False
+
+                if incremental:
+                    fetched = pd.concat([stored[stored.index < fetched.index[0]], fetched])
+                    coverage = meta.get("coverage_start")
+                else:
+                    coverage = self._coverage_value(required_start)
+            else:
+                coverage = self._coverage_value(required_start)
+
+            if fetched.empty:
+                return fetched
+
+            fetched = fetched[~fetched.index.duplicated(keep="last")].sort_index()
+            new_meta = dict(meta or {})
+            new_meta["coverage_start"] = coverage
+            self._write(symbol, interval, fetched, new_meta)
+            logger.info(f"OHLCV store updated for {symbol} ({interval}): {len(fetched)} bars")
+
+        # A full fetch is already the upstream's window of the period
+        return slice_history(fetched, period) if incremental else fetched
+
+    def get_history(self, symbol, period="1y", interval="1d", force_refresh=False):
+        """
+        Get OHLCV history, fetching only the bars after the stored watermark.
+
+        Args:
+            symbol (str): Yahoo Finance ticker
+            period (str): Requested period (e.g. 1mo, 1y, 5y, 60d)
+            interval (str): Bar interval (e.g. 1d, 1wk, 5m)
+            force_refresh (bool): Always check upstream for new bars
+
+        Returns:
+            pd.DataFrame: OHLCV history for the requested period (may be empty)
+        """
+        cached = self.cached_history(symbol, period, interval, force_refresh=force_refresh)
+        if cached is not None:
+            logger.debug(f"OHLCV store hit for {symbol} ({period}, {interval})")
+            return cached
+
+        start = self.incremental_start(symbol, period, interval)
+        if start is not None:
+            logger.info(f"Incremental fetch for {symbol} ({interval}) from watermark {start}")
+            fetched = self.fetch_fn(symbol, interval, start=start)
+        else:
+            logger.info(f"Full fetch for {symbol} ({period}, {interval})")
+            fetched = self.fetch_fn(symbol, interval, period=period)
+
+        if fetched is None:
+            fetched = pd.DataFrame(columns=PRICE_COLUMNS)
+        return self.merge(symbol, period, interval, fetched, incremental=start is not None)
+
+
+# Shared store used by the API endpoints and swing trading service
+store = OHLCVStore()
+
+
+def get_history(symbol, period="1y", interval="1d", force_refresh=False):
+    """
+    Get OHLCV history for a symbol from the shared incremental store.
+
+    Args:
+        symbol (str): Yahoo Finance ticker
+        period (str): Requested period
+        interval (str): Bar interval
+        force_refresh (bool): Always check upstream for new bars
+
+    Returns:
+        pd.DataFrame: OHLCV history for the requested period
+    """
+    try:
+        return store.get_history(symbol, period, interval, force_refresh=force_refresh)
+    except Exception as e:
+        logger.error(f"OHLCV store failed for {symbol} ({period}, {interval}), fetching directly: {e}")
+        return _yahoo_fetch(symbol, interval, period=period)
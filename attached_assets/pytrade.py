@@ -8,6 +8,7 @@ import requests
 from priceprediction import predict_return
 #from intradaytrading import predictintraday
 from shorttermswingtrading import get_shorttermswingsignal
+from batch_executor import executor as batch_executor
 
 app = Flask(__name__)
 
@@ -49,35 +50,30 @@ def analyze_all():
         # Log that we're using live data
         logger.info(f"Using LIVE data sources only for {len(tickers)} tickers with {timeframe} timeframe")
         
-        # Initialize an empty list to store results
-        results = []
+        # Process the tickers in parallel - with live data only; results keep the
+        # request order and a failing or slow ticker is reported in its own entry
+        def process(ticker):
+            logger.info(f"Processing ticker: {ticker} with timeframe: {timeframe}")
+            
+            # Get live data for this ticker directly from the source
+            result = get_shorttermswingsignal(ticker, timeframe=timeframe)
+            logger.info(f"Successfully processed {ticker}")
+            return {
+                "symbol": ticker,
+                "result": result
+            }
         
-        # Process each ticker - with live data only
-        for ticker in tickers:
-            try:
-                logger.info(f"Processing ticker: {ticker} with timeframe: {timeframe}")
-                
-                # Get live data for this ticker directly from the source
-                result = get_shorttermswingsignal(ticker, timeframe=timeframe)
-                
-                # Add to results
-                results.append({
-                    "symbol": ticker,
-                    "result": result
-                })
-                
-                logger.info(f"Successfully processed {ticker}")
-                
-            except Exception as e:
-                # Log the error but continue with other tickers
-                logger.error(f"Error processing {ticker}: {e}", exc_info=True)
-                results.append({
-                    "symbol": ticker,
-                    "result": {
-                        "error": f"Failed to process: {str(e)}",
-                        "ticker": ticker
-                    }
-                })
+        def report_failure(ticker, message):
+            return {
+                "symbol": ticker,
+                "result": {
+                    "error": f"Failed to process: {message}",
+                    "ticker": ticker
+                }
+            }
+        
+        results = batch_executor.map_ordered(process, tickers, on_error=report_failure,
+                                             label=f"Swing trading signals ({timeframe})")
         
         logger.info(f"Completed processing {len(tickers)} tickers with live data")
         return jsonify(results)
@@ -0,0 +1,209 @@
+"""
+PyTrade - Quote Poller Module
+
+This module produces the live quotes that the WebSocket server pushes to its
+subscribers. A refresh cycle takes the distinct subscribed symbols, maps them to
+Yahoo Finance tickers through the symbol resolver and fetches all of their quotes
+with one quote endpoint call per chunk of tickers (market_data.download_quotes), so
+the upstream calls per cycle grow with the number of chunks, not with the number of
+symbols. Live indicators that still need history are seeded with bulk history
+downloads in the same cycle.
+
+Symbols whose exchange suffix is not confirmed yet go into the bulk call with every
+candidate variant (SYMBOL.NS, SYMBOL.BO, SYMBOL), so a US watchlist or index gets
+its first prices in the first cycle; the variant that answers is recorded and only
+that one is polled from then on. The few symbols that return nothing are retried
+individually with the per-symbol info probe, a bounded number per cycle.
+
+Key features:
+- Bulk quote polling for every subscribed symbol (one call per chunk)
+- Exchange suffix resolution inside the bulk call (all variants of unconfirmed symbols)
+- Bulk seeding of the live indicators of newly subscribed symbols
+- Price update payloads in the WebSocket server's format
+
+Author: PyTrade Development Team
+Version: 1.0.0
+Date: October 17, 2026
+License: Proprietary
+"""
+
+import os
+import logging
+from datetime import datetime
+import pandas as pd
+import yfinance as yf
+from market_data import download_quotes, download_history_batch
+from symbol_resolver import resolver as symbol_resolver
+from streaming_indicators import registry as indicator_registry, SEED_PERIOD
+
+logger = logging.getLogger(__name__)
+
+# Exchange suffixes tried for bare symbols: NSE, then BSE, then the bare symbol
+QUOTE_SUFFIXES = (".NS", ".BO", "")
+# Symbols missing from the bulk quotes that are probed individually per cycle
+RESOLVE_PER_CYCLE = int(os.environ.get("PYTRADE_QUOTE_RESOLVE_PER_CYCLE", 5))
+INDIAN_SUFFIXES = (".NS", ".BO")
+
+
+def build_price_data(quote, yahoo_ticker):
+    """
+    Build a price update payload from a quote.
+
+    Args:
+        quote (dict): {"price", "previous_close", "high", "low", "volume", "currency"}
+        yahoo_ticker (str): Yahoo Finance ticker of the quote
+
+    Returns:
+        dict: Price data as sent in price_update messages
+    """
+    price = quote['price']
+    previous_close = quote.get('previous_close')
+    change = price - previous_close if previous_close else 0
+    change_percent = (change / previous_close * 100) if previous_close else 0
+    currency = quote.get('currency') or ('INR' if yahoo_ticker.endswith(INDIAN_SUFFIXES) else 'USD')
+
+    return {
+        'price': price,
+        'change': change,
+        'changePercent': change_percent,
+        'high': quote.get('high') if quote.get('high') is not None else price,
+        'low': quote.get('low') if quote.get('low') is not None else price,
+        'volume': quote.get('volume') or 0,
+        # Include date, time, and timezone information in the timestamp
+        'timestamp': datetime.now().strftime('%d/%m/%Y %H:%M:%S %Z'),
+        'currency': currency
+    }
+
+
+def fetch_quote(symbol):
+    """
+    Fetch one symbol's quote with the per-symbol info probe (resolves the exchange suffix).
+
+    Args:
+        symbol (str): Stock symbol
+
+    Returns:
+        tuple: (yahoo_ticker, quote dict), or (None, None) if no variant has data
+    """
+    def probe(yahoo_ticker):
+        info = yf.Ticker(yahoo_ticker).info
+        return info if info and 'regularMarketPrice' in info else None
+
+    # Try NSE, then BSE, then the bare symbol, starting from the known working variant
+    yahoo_ticker, info = symbol_resolver.resolve(symbol, probe, suffixes=QUOTE_SUFFIXES)
+    if not info:
+        return None, None
+    return yahoo_ticker, {
+        "price": info.get('regularMarketPrice'),
+        "previous_close": info.get('regularMarketPreviousClose'),
+        "high": info.get('dayHigh'),
+        "low": info.get('dayLow'),
+        "volume": info.get('regularMarketVolume'),
+        "currency": info.get('currency'),
+        "market_time": info.get('regularMarketTime')
+    }
+
+
+def _seed_indicators(yahoo_tickers):
+    # Seed the live indicators of new (or stale) tickers with bulk history downloads
+    pending = [ticker for ticker in yahoo_tickers if indicator_registry.needs_seed(ticker)]
+    if not pending:
+        return
+    try:
+        histories = download_history_batch(pending, period=SEED_PERIOD, interval="1d")
+    except Exception as e:
+        logger.error(f"Error downloading seed history for {len(pending)} tickers: {e}")
+        return
+    for ticker, hist in histories.items():
+        try:
+            indicator_registry.get(ticker, loader=lambda hist=hist: hist)
+        except Exception as e:
+            logger.error(f"Error seeding indicators for {ticker}: {e}")
+
+
+def _market_time(quote):
+    # Time of the quote's last trade: epoch seconds from the quote endpoint, or the
+    # bar timestamp of the bulk bar fallback
+    value = quote.get('market_time')
+    if value is None:
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            return pd.Timestamp(value, unit='s', tz='UTC')
+        return pd.Timestamp(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _attach_indicators(price_data, yahoo_ticker, quote):
+    # Tickers the bulk seeding could not cover are retried next cycle rather than
+    # fetched one by one here
+    if indicator_registry.needs_seed(yahoo_ticker):
+        return
+    try:
+        price_data['indicators'] = indicator_registry.on_tick(
+            yahoo_ticker, quote['price'], quote.get('high'), quote.get('low'), timestamp=_market_time(quote))
+    except Exception as e:
+        logger.error(f"Error updating indicators for {yahoo_ticker}: {e}")
+
+
+def poll_quotes(symbols, resolve_limit=RESOLVE_PER_CYCLE):
+    """
+    Fetch the latest quotes for a set of symbols with bulk upstream calls.
+
+    Args:
+        symbols (iterable): Subscribed stock symbols
+        resolve_limit (int): Symbols missing from the bulk quotes to probe individually
+
+    Returns:
+        dict: Mapping of symbol to price data for the symbols that returned a quote
+    """
+    symbols = list(dict.fromkeys(symbols))
+    # Tickers polled per symbol: the confirmed variant, or every candidate variant
+    # while the exchange suffix is unknown (several symbols can share a ticker,
+    # e.g. RELIANCE and RELIANCE.NS)
+    variants = {}
+    for symbol in symbols:
+        candidates = symbol_resolver.candidates(symbol, QUOTE_SUFFIXES)
+        if candidates:
+            variants[symbol] = candidates[:1] if symbol_resolver.is_confirmed(symbol) else candidates
+
+    polled = [ticker for tickers in variants.values() for ticker in tickers]
+    quotes = download_quotes(polled) if polled else {}
+    matched = {}
+    missing = []
+    for symbol, tickers in variants.items():
+        # Best-guess order: the first variant that answered wins
+        yahoo_ticker = next((ticker for ticker in tickers if ticker in quotes), None)
+        if yahoo_ticker is None:
+            missing.append(symbol)
+            continue
+        symbol_resolver.record_success(symbol, yahoo_ticker)
+        matched[symbol] = yahoo_ticker
+
+    # Resolve a bounded number of unquoted symbols per cycle with individual probes
+    resolved = {}
+    for symbol in missing[:resolve_limit]:
+        try:
+            yahoo_ticker, quote = fetch_quote(symbol)
+        except Exception as e:
+            logger.error(f"Error fetching quote for {symbol}: {e}")
+            continue
+        if quote and quote.get("price") is not None:
+            quotes[yahoo_ticker] = quote
+            resolved[symbol] = yahoo_ticker
+    if len(missing) > resolve_limit:
+        logger.info(f"{len(missing) - resolve_limit} unquoted symbols deferred to the next cycle")
+
+    matched.update(resolved)
+    _seed_indicators(list(dict.fromkeys(matched.values())))
+
+    results = {}
+    for symbol, yahoo_ticker in matched.items():
+        quote = quotes[yahoo_ticker]
+        price_data = build_price_data(quote, yahoo_ticker)
+        _attach_indicators(price_data, yahoo_ticker, quote)
+        results[symbol] = price_data
+
+    logger.info(f"Polled quotes for {len(results)}/{len(symbols)} symbols")
+    return results
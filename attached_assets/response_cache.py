@@ -0,0 +1,262 @@
+"""
+PyTrade - Response Cache Module
+
+This module provides an HTTP response cache for Flask views. Cached entries are keyed
+on the view, its path parameters and the normalized query string, so that
+/api/stock/<symbol>/history?period=5y and ?period=1d no longer share an entry. The
+JSON body is serialized and gzip-compressed once when the entry is stored; cache hits
+send those bytes as they are. Every cached response carries an ETag and a
+Last-Modified header, and conditional requests are answered with 304 Not Modified.
+
+Key features:
+- Cache keys built from view name, path parameters and sorted query arguments
+- Pre-serialized, gzip-compressed response bodies
+- ETag / Last-Modified validators with 304 revalidation
+- Only successful (200) responses are cached
+- Refresh query parameters bypass the cached copy
+- Optional stale-while-revalidate: expired entries are served during a grace
+  window while a single background task refreshes them
+
+Author: PyTrade Development Team
+Version: 1.0.0
+Date: October 17, 2026
+License: Proprietary
+"""
+
+import gzip
+import time
+import hashlib
+import inspect
+import logging
+import functools
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from flask import request, make_response, current_app, Response
+from cache_backends import create_cache
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that never change the response (client-side cache busters)
+IGNORED_QUERY_PARAMS = {"_", "_ts", "cacheBust"}
+# Query parameters that force a fresh response when set to true
+REFRESH_QUERY_PARAMS = ("refresh", "force_refresh")
+GZIP_LEVEL = 6
+# Seconds a background refresh may take before another worker is allowed to start one
+REFRESH_LOCK_TTL = 60
+
+# Store of serialized responses (shared between workers with the sqlite/redis backends)
+response_cache = create_cache("responses")
+
+# Keys being refreshed in the background by this worker
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def normalize_query_args(args):
+    """
+    Normalize query arguments into a stable, order-independent string.
+
+    Args:
+        args (MultiDict): Request query arguments
+
+    Returns:
+        str: Sorted, URL-style representation of the arguments
+    """
+    items = []
+    for key in sorted(args.keys()):
+        if key in IGNORED_QUERY_PARAMS or key in REFRESH_QUERY_PARAMS:
+            continue
+        for value in sorted(args.getlist(key)):
+            if value != "":
+                items.append(f"{key}={value}")
+    return "&".join(items)
+
+
+def build_response_key(func, signature, args, kwargs):
+    """
+    Build the cache key for a view call.
+
+    Args:
+        func (callable): View function
+        signature (inspect.Signature): Signature of the view function
+        args (tuple): Positional arguments of the call
+        kwargs (dict): Keyword arguments of the call (Flask path parameters)
+
+    Returns:
+        str: Cache key
+    """
+    try:
+        bound = signature.bind(*args, **kwargs).arguments
+    except TypeError:
+        bound = dict(enumerate(args), **kwargs)
+    path_params = ",".join(f"{k}={v}" for k, v in bound.items())
+    return f"{func.__module__}.{func.__qualname__}({path_params})?{normalize_query_args(request.args)}"
+
+
+def serialize_response(response, timeout, stale_ttl=0):
+    """
+    Convert a Flask response into a cacheable entry.
+
+    Args:
+        response (Response): Successful response produced by the view
+        timeout (int): Seconds the entry is fresh
+        stale_ttl (int): Seconds the entry may be served stale after it expires
+
+    Returns:
+        dict: Compressed body, validators, expiry time and content type
+    """
+    body = response.get_data()
+    now = time.time()
+    return {
+        "body": gzip.compress(body, compresslevel=GZIP_LEVEL),
+        "etag": f'W/"{hashlib.sha1(body).hexdigest()}"',
+        "last_modified": int(now),
+        "expires_at": now + timeout,
+        "stale_ttl": stale_ttl,
+        "mimetype": response.mimetype
+    }
+
+
+def _is_not_modified(entry):
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        # Weak comparison: ignore the W/ prefix on either side
+        etag = entry["etag"].replace("W/", "")
+        return "*" in candidates or any(tag.replace("W/", "") == etag for tag in candidates)
+
+    if_modified_since = request.headers.get("If-Modified-Since")
+    if if_modified_since:
+        try:
+            return parsedate_to_datetime(if_modified_since).timestamp() >= entry["last_modified"]
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def build_cached_response(entry, cache_status):
+    """
+    Build the HTTP response for a cache entry, honouring conditional request headers.
+
+    Args:
+        entry (dict): Cache entry produced by serialize_response
+        cache_status (str): Value for the X-Cache header (HIT, STALE or MISS)
+
+    Returns:
+        Response: 304 response or the (possibly compressed) body
+    """
+    max_age = max(0, int(entry["expires_at"] - time.time()))
+    cache_control = f"public, max-age={max_age}"
+    if entry.get("stale_ttl"):
+        cache_control += f", stale-while-revalidate={entry['stale_ttl']}"
+    headers = {
+        "ETag": entry["etag"],
+        "Last-Modified": formatdate(entry["last_modified"], usegmt=True),
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding",
+        "X-Cache": cache_status
+    }
+
+    if _is_not_modified(entry):
+        return Response(status=304, headers=headers)
+
+    if "gzip" in request.headers.get("Accept-Encoding", ""):
+        response = Response(entry["body"], mimetype=entry["mimetype"], headers=headers)
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response = Response(gzip.decompress(entry["body"]), mimetype=entry["mimetype"], headers=headers)
+    return response
+
+
+def _refresh_requested():
+    return any(request.args.get(param, "false").lower() == "true" for param in REFRESH_QUERY_PARAMS)
+
+
+def _store_response(cache_key, response, timeout, stale_ttl):
+    entry = serialize_response(response, timeout, stale_ttl)
+    # Keep the entry for the grace window too; freshness is tracked in the entry itself
+    response_cache.set(cache_key, entry, ttl=timeout + stale_ttl, size=len(entry["body"]))
+    return entry
+
+
+def _start_background_refresh(cache_key, func, args, kwargs, timeout, stale_ttl):
+    """
+    Refresh a stale entry in the background, at most once at a time per key.
+
+    Args:
+        cache_key (str): Cache key of the stale entry
+        func (callable): Undecorated view function
+        args (tuple): Positional arguments of the original call
+        kwargs (dict): Keyword arguments of the original call
+        timeout (int): Seconds the refreshed entry is fresh
+        stale_ttl (int): Seconds the refreshed entry may be served stale
+    """
+    lock_key = f"refresh-lock:{cache_key}"
+    with _refreshing_lock:
+        if cache_key in _refreshing or response_cache.get(lock_key) is not None:
+            return
+        _refreshing.add(cache_key)
+        # Tell other workers sharing the cache that a refresh is under way
+        response_cache.set(lock_key, True, ttl=REFRESH_LOCK_TTL)
+
+    app = current_app._get_current_object()
+    path, query_string = request.path, request.query_string.decode("utf-8", errors="replace")
+
+    def refresh():
+        try:
+            with app.test_request_context(path, query_string=query_string):
+                response = make_response(func(*args, **kwargs))
+                if response.status_code == 200 and not response.direct_passthrough:
+                    _store_response(cache_key, response, timeout, stale_ttl)
+                    logger.info(f"Background refresh completed for {cache_key}")
+                else:
+                    logger.warning(f"Background refresh for {cache_key} returned status {response.status_code}")
+        except Exception as e:
+            logger.error(f"Background refresh failed for {cache_key}: {e}")
+        finally:
+            response_cache.delete(lock_key)
+            with _refreshing_lock:
+                _refreshing.discard(cache_key)
+
+    threading.Thread(target=refresh, name=f"refresh-{func.__name__}", daemon=True).start()
+
+
+def cache_response(timeout=300, stale_ttl=0):
+    """
+    Flask view decorator that caches serialized responses per route, path and query.
+
+    Args:
+        timeout (int): Cache timeout in seconds (default: 300 seconds / 5 minutes)
+        stale_ttl (int): Grace window in seconds during which an expired entry is
+            still served while one background task refreshes it (default: 0, disabled)
+
+    Returns:
+        Function wrapper implementing the response caching behavior
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = build_response_key(func, signature, args, kwargs)
+
+            if not _refresh_requested():
+                entry = response_cache.get(cache_key)
+                if entry is not None:
+                    if time.time() < entry["expires_at"]:
+                        logger.debug(f"Response cache hit for {cache_key}")
+                        return build_cached_response(entry, "HIT")
+                    if stale_ttl:
+                        logger.debug(f"Serving stale response for {cache_key} while revalidating")
+                        _start_background_refresh(cache_key, func, args, kwargs, timeout, stale_ttl)
+                        return build_cached_response(entry, "STALE")
+
+            logger.debug(f"Response cache miss for {cache_key}, calling view")
+            response = make_response(func(*args, **kwargs))
+            if response.status_code != 200 or response.direct_passthrough:
+                return response
+
+            entry = _store_response(cache_key, response, timeout, stale_ttl)
+            return build_cached_response(entry, "MISS")
+        return wrapper
+    return decorator
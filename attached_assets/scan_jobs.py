@@ -0,0 +1,621 @@
+"""
+PyTrade - Scan Jobs Module
+
+This module runs index-wide swing trading scans as background jobs. A scan over
+NIFTY 500 or the S&P 500 takes longer than the gunicorn request timeout, so instead
+of analyzing the tickers inside the request, the client submits a job (a universe
+name or a ticker list plus a timeframe), gets a job id back immediately and then
+polls for progress and fetches the results page by page.
+
+Jobs and their per-ticker results are kept in a WAL-mode SQLite database shared by
+all workers on the host, so any worker can answer a poll or a cancel request. Each
+worker runs the jobs it accepted on a small background thread pool and heartbeats
+them; a job whose worker died (restart, crash, timeout kill) stops heartbeating and
+is picked up by another worker, which resumes it from the last stored result.
+
+Endpoints (blueprint scan_jobs):
+- POST   /api/swing-trading/jobs                  submit {"universe" | "tickers", "timeframe"}
+- GET    /api/swing-trading/jobs                  list recent jobs
+- GET    /api/swing-trading/jobs/<id>             job status and progress
+- GET    /api/swing-trading/jobs/<id>/results     paged results (offset, limit)
+- DELETE /api/swing-trading/jobs/<id>             cancel a queued or running job
+
+Key features:
+- Persistent SQLite job store (PYTRADE_SCAN_JOBS_DB)
+- Background worker pool per process (PYTRADE_SCAN_JOB_WORKERS)
+- Progress counters and results stored as each ticker completes
+- Cooperative cancellation from any worker
+- Heartbeats with takeover and resumption of orphaned jobs
+
+Author: PyTrade Development Team
+Version: 1.0.0
+Date: October 17, 2026
+License: Proprietary
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, request, jsonify, url_for
+from swing_trading_service import iter_swing_trading_batch
+from indicesdownload import get_index_constituents
+
+logger = logging.getLogger(__name__)
+
+# Constants
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+JOBS_DB_PATH = os.environ.get("PYTRADE_SCAN_JOBS_DB", os.path.join(BASE_DIR, "cache", "scan_jobs.db"))
+JOB_WORKERS = int(os.environ.get("PYTRADE_SCAN_JOB_WORKERS", 2))
+MAX_TICKERS = int(os.environ.get("PYTRADE_SCAN_MAX_TICKERS", 2000))
+# Finished jobs and their results are deleted after this many seconds
+JOB_RETENTION = int(os.environ.get("PYTRADE_SCAN_JOB_RETENTION", 7 * 86400))
+HEARTBEAT_INTERVAL = 15
+# A job not heartbeated for this long belongs to a dead worker and is taken over
+STALE_AFTER = int(os.environ.get("PYTRADE_SCAN_JOB_STALE_AFTER", 120))
+# Longest interval between two checks of a running job's cancel flag
+CANCEL_POLL_INTERVAL = 1.0
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+ACTIVE_STATUSES = ("queued", "running", "cancelling")
+FINISHED_STATUSES = ("completed", "cancelled", "failed")
+
+
+def normalize_timeframe(timeframe):
+    """
+    Map a free-form timeframe to 'short', 'medium' or 'long'.
+
+    Args:
+        timeframe (str): Requested timeframe
+
+    Returns:
+        str: Normalized timeframe
+    """
+    timeframe = str(timeframe or "short").lower().strip()
+    if "medium" in timeframe:
+        return "medium"
+    if "long" in timeframe:
+        return "long"
+    return "short"
+
+
+def _json_default(value):
+    # numpy scalars and timestamps in analysis results
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+class ScanJobStore:
+    """
+    Host-wide job store kept in a WAL-mode SQLite database.
+    """
+
+    def __init__(self, path=JOBS_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self):
+        # Connections must not cross fork or thread boundaries
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS scan_jobs ("
+            "id TEXT PRIMARY KEY, status TEXT NOT NULL, universe TEXT, tickers TEXT NOT NULL, "
+            "timeframe TEXT NOT NULL, total INTEGER NOT NULL, completed INTEGER NOT NULL DEFAULT 0, "
+            "failed INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL, started_at REAL, "
+            "finished_at REAL, error TEXT, owner TEXT, heartbeat REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS scan_jobs_status ON scan_jobs (status, heartbeat)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS scan_results ("
+            "job_id TEXT NOT NULL, idx INTEGER NOT NULL, ticker TEXT NOT NULL, result TEXT NOT NULL, "
+            "error TEXT, finished_at REAL NOT NULL, PRIMARY KEY (job_id, idx))"
+        )
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def create(self, tickers, timeframe, universe=None, owner=None):
+        """
+        Store a new queued job.
+
+        Args:
+            tickers (list): Ticker symbols to scan
+            timeframe (str): Trading timeframe
+            universe (str, optional): Index the tickers were taken from
+            owner (str, optional): Worker that will run the job
+
+        Returns:
+            str: Job id
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._connection().execute(
+            "INSERT INTO scan_jobs (id, status, universe, tickers, timeframe, total, created_at, owner, heartbeat) "
+            "VALUES (?, 'queued', ?, ?, ?, ?, ?, ?, ?)",
+            (job_id, universe, json.dumps(tickers), timeframe, len(tickers), now, owner, now)
+        )
+        return job_id
+
+    def get(self, job_id, with_tickers=False):
+        """
+        Get a job.
+
+        Args:
+            job_id (str): Job id
+            with_tickers (bool): Include the ticker list
+
+        Returns:
+            dict: Job fields, or None if the job does not exist
+        """
+        row = self._connection().execute("SELECT * FROM scan_jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        tickers = json.loads(job.pop("tickers"))
+        if with_tickers:
+            job["tickers"] = tickers
+        return job
+
+    def list_jobs(self, status=None, limit=50):
+        """
+        List the most recent jobs.
+
+        Args:
+            status (str, optional): Only jobs with this status
+            limit (int): Maximum number of jobs
+
+        Returns:
+            list: Job dicts, newest first
+        """
+        query = ("SELECT id, status, universe, timeframe, total, completed, failed, created_at, "
+                 "started_at, finished_at, error FROM scan_jobs")
+        params = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self._connection().execute(query, params)]
+
+    def claim(self, job_id, owner):
+        """
+        Move a queued job owned by this worker to running.
+
+        Returns:
+            bool: True if the job was claimed (False if it was cancelled meanwhile)
+        """
+        now = time.time()
+        cursor = self._connection().execute(
+            "UPDATE scan_jobs SET status = 'running', started_at = COALESCE(started_at, ?), heartbeat = ? "
+            "WHERE id = ? AND status = 'queued' AND owner = ?",
+            (now, now, job_id, owner)
+        )
+        return cursor.rowcount == 1
+
+    def take_over(self, job_id, status, heartbeat, owner):
+        """
+        Requeue an orphaned job for this worker, unless another worker got there first.
+
+        Returns:
+            bool: True if this worker now owns the job
+        """
+        cursor = self._connection().execute(
+            "UPDATE scan_jobs SET status = 'queued', owner = ?, heartbeat = ? "
+            "WHERE id = ? AND status = ? AND heartbeat = ?",
+            (owner, time.time(), job_id, status, heartbeat)
+        )
+        return cursor.rowcount == 1
+
+    def heartbeat(self, owner):
+        """Refresh the heartbeat of every active job owned by a worker."""
+        self._connection().execute(
+            f"UPDATE scan_jobs SET heartbeat = ? WHERE owner = ? AND status IN {ACTIVE_STATUSES}",
+            (time.time(), owner)
+        )
+
+    def stale_jobs(self, max_age=STALE_AFTER):
+        """
+        Find active jobs whose worker stopped heartbeating.
+
+        Returns:
+            list: (job id, status, heartbeat) tuples
+        """
+        rows = self._connection().execute(
+            f"SELECT id, status, heartbeat FROM scan_jobs WHERE status IN {ACTIVE_STATUSES} AND heartbeat < ?",
+            (time.time() - max_age,)
+        )
+        return [(row["id"], row["status"], row["heartbeat"]) for row in rows]
+
+    def add_result(self, job_id, index, ticker, result, error=None):
+        """
+        Store one ticker's result and update the job's progress counters.
+
+        Args:
+            job_id (str): Job id
+            index (int): Position of the ticker in the job
+            ticker (str): Ticker symbol
+            result: Analysis result
+            error (str, optional): Error message if the ticker failed
+        """
+        failed = 1 if error or (isinstance(result, dict) and result.get("error")) else 0
+        payload = json.dumps(result, default=_json_default)
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO scan_results (job_id, idx, ticker, result, error, finished_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, index, ticker, payload, error, time.time())
+            )
+            if cursor.rowcount == 1:
+                conn.execute("UPDATE scan_jobs SET completed = completed + 1, failed = failed + ? WHERE id = ?",
+                             (failed, job_id))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def completed_indices(self, job_id):
+        """Get the positions of the tickers that already have a stored result."""
+        rows = self._connection().execute("SELECT idx FROM scan_results WHERE job_id = ?", (job_id,))
+        return {row["idx"] for row in rows}
+
+    def results(self, job_id, offset=0, limit=DEFAULT_PAGE_SIZE):
+        """
+        Get a page of results in ticker order.
+
+        Args:
+            job_id (str): Job id
+            offset (int): Number of results to skip
+            limit (int): Page size
+
+        Returns:
+            list: Dicts with index, ticker, data and error
+        """
+        rows = self._connection().execute(
+            "SELECT idx, ticker, result, error FROM scan_results WHERE job_id = ? ORDER BY idx LIMIT ? OFFSET ?",
+            (job_id, limit, offset)
+        )
+        return [{"index": row["idx"], "ticker": row["ticker"], "data": json.loads(row["result"]),
+                 "error": row["error"]} for row in rows]
+
+    def status(self, job_id):
+        """Get the current status of a job (None if it does not exist)."""
+        row = self._connection().execute("SELECT status FROM scan_jobs WHERE id = ?", (job_id,)).fetchone()
+        return row["status"] if row else None
+
+    def request_cancel(self, job_id):
+        """
+        Cancel a job: queued jobs are cancelled at once, running jobs are flagged
+        and stop at their next cancel check.
+
+        Returns:
+            str: The job's status after the request, or None if it does not exist
+        """
+        conn = self._connection()
+        conn.execute("UPDATE scan_jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status = 'queued'",
+                     (time.time(), job_id))
+        conn.execute("UPDATE scan_jobs SET status = 'cancelling' WHERE id = ? AND status = 'running'", (job_id,))
+        return self.status(job_id)
+
+    def finish(self, job_id, status, error=None):
+        """Mark an active job as completed, cancelled or failed."""
+        self._connection().execute(
+            f"UPDATE scan_jobs SET status = ?, error = ?, finished_at = ? WHERE id = ? AND status IN {ACTIVE_STATUSES}",
+            (status, error, time.time(), job_id)
+        )
+
+    def purge(self, max_age=JOB_RETENTION):
+        """
+        Delete finished jobs older than max_age seconds, with their results.
+
+        Returns:
+            int: Number of jobs deleted
+        """
+        conn = self._connection()
+        cutoff = time.time() - max_age
+        old = [row["id"] for row in conn.execute(
+            f"SELECT id FROM scan_jobs WHERE status IN {FINISHED_STATUSES} AND finished_at < ?", (cutoff,))]
+        for job_id in old:
+            conn.execute("DELETE FROM scan_results WHERE job_id = ?", (job_id,))
+            conn.execute("DELETE FROM scan_jobs WHERE id = ?", (job_id,))
+        return len(old)
+
+
+class ScanJobRunner:
+    """
+    Runs scan jobs on a per-process background pool and keeps them heartbeated.
+    """
+
+    def __init__(self, store, workers=JOB_WORKERS, scan=iter_swing_trading_batch):
+        self.store = store
+        self.workers = max(1, workers)
+        self.scan = scan
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def owner(self):
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def start(self):
+        """Start the worker pool and heartbeat thread in this process (idempotent)."""
+        with self._lock:
+            if self._pid == os.getpid():
+                return self._pool
+            # Pools and threads do not survive fork; recreate them per worker
+            self._pid = os.getpid()
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scan-job")
+            threading.Thread(target=self._heartbeat_loop, name="scan-job-heartbeat", daemon=True).start()
+            logger.info(f"Scan job runner started in {self.owner} with {self.workers} workers")
+            return self._pool
+
+    def submit(self, tickers, timeframe, universe=None):
+        """
+        Queue a scan on this worker.
+
+        Args:
+            tickers (list): Ticker symbols to scan
+            timeframe (str): Trading timeframe
+            universe (str, optional): Index the tickers were taken from
+
+        Returns:
+            str: Job id
+        """
+        pool = self.start()
+        job_id = self.store.create(tickers, timeframe, universe, owner=self.owner)
+        pool.submit(self._run, job_id)
+        logger.info(f"Queued scan job {job_id}: {len(tickers)} tickers ({universe or 'custom'}, {timeframe})")
+        return job_id
+
+    def _run(self, job_id):
+        if not self.store.claim(job_id, self.owner):
+            logger.info(f"Scan job {job_id} was cancelled before it started")
+            return
+        job = self.store.get(job_id, with_tickers=True)
+        done = self.store.completed_indices(job_id)
+        remaining = [(index, ticker) for index, ticker in enumerate(job["tickers"]) if index not in done]
+        if done:
+            logger.info(f"Resuming scan job {job_id}: {len(remaining)} of {job['total']} tickers left")
+
+        start = time.monotonic()
+        cancelled = False
+        records = self.scan([ticker for _, ticker in remaining], job["timeframe"])
+        try:
+            last_check = time.monotonic()
+            for position, ticker, result, error in records:
+                self.store.add_result(job_id, remaining[position][0], ticker, result, error)
+                if time.monotonic() - last_check >= CANCEL_POLL_INTERVAL:
+                    last_check = time.monotonic()
+                    if self.store.status(job_id) == "cancelling":
+                        cancelled = True
+                        break
+        except Exception as e:
+            logger.error(f"Scan job {job_id} failed: {e}")
+            self.store.finish(job_id, "failed", error=str(e))
+            return
+        finally:
+            # Closing the scan cancels the tickers that have not started yet
+            records.close()
+
+        if cancelled or self.store.status(job_id) == "cancelling":
+            self.store.finish(job_id, "cancelled")
+            logger.info(f"Scan job {job_id} cancelled after {time.monotonic() - start:.1f}s")
+        else:
+            self.store.finish(job_id, "completed")
+            logger.info(f"Scan job {job_id} completed in {time.monotonic() - start:.1f}s")
+
+    def _heartbeat_loop(self):
+        pid = os.getpid()
+        last_purge = 0.0
+        while self._pid == pid:
+            try:
+                self.store.heartbeat(self.owner)
+                self.recover_stale_jobs()
+                if time.monotonic() - last_purge > 3600:
+                    last_purge = time.monotonic()
+                    purged = self.store.purge()
+                    if purged:
+                        logger.info(f"Purged {purged} finished scan jobs")
+            except Exception as e:
+                logger.error(f"Scan job heartbeat failed: {e}")
+            time.sleep(HEARTBEAT_INTERVAL)
+
+    def recover_stale_jobs(self):
+        """
+        Take over jobs whose worker stopped heartbeating and resume them here.
+
+        Returns:
+            int: Number of jobs taken over
+        """
+        taken = 0
+        for job_id, status, heartbeat in self.store.stale_jobs():
+            if status == "cancelling":
+                self.store.finish(job_id, "cancelled")
+            elif self.store.take_over(job_id, status, heartbeat, self.owner):
+                logger.warning(f"Taking over orphaned scan job {job_id} ({status})")
+                self._pool.submit(self._run, job_id)
+                taken += 1
+        return taken
+
+
+def _job_response(job):
+    total = job["total"] or 0
+    job["progress"] = round(100.0 * job["completed"] / total, 1) if total else 100.0
+    job.pop("owner", None)
+    job.pop("heartbeat", None)
+    return job
+
+
+store = ScanJobStore()
+runner = ScanJobRunner(store)
+
+scan_jobs = Blueprint("scan_jobs", __name__)
+
+
+@scan_jobs.before_app_request
+def _start_runner():
+    # Orphaned jobs are resumed by any worker that serves requests
+    runner.start()
+
+
+@scan_jobs.route('/api/swing-trading/jobs', methods=['POST'])
+def submit_scan():
+    """
+    Submit a swing trading scan.
+
+    Request JSON:
+        universe (str, optional): Index name, e.g. "NIFTY 500"
+        tickers (list, optional): Ticker symbols (used when no universe is given)
+        timeframe (str): 'short', 'medium' or 'long' (default: short)
+
+    Returns:
+        JSON: Job id and status URL (HTTP 202)
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        universe = data.get("universe")
+        tickers = data.get("tickers") or []
+        timeframe = normalize_timeframe(data.get("timeframe"))
+
+        if universe:
+            tickers = [c["symbol"] if isinstance(c, dict) else str(c) for c in get_index_constituents(universe)]
+            if not tickers:
+                return jsonify({"error": f"No constituents found for {universe}"}), 404
+        else:
+            tickers = [t["symbol"] if isinstance(t, dict) and "symbol" in t else str(t) for t in tickers]
+
+        if not tickers:
+            return jsonify({"error": "Provide a universe or a list of tickers"}), 400
+        if len(tickers) > MAX_TICKERS:
+            return jsonify({"error": f"At most {MAX_TICKERS} tickers per scan"}), 400
+
+        job_id = runner.submit(tickers, timeframe, universe)
+        status_url = url_for("scan_jobs.scan_status", job_id=job_id)
+        response = jsonify({"job_id": job_id, "status": "queued", "total": len(tickers),
+                            "timeframe": timeframe, "universe": universe, "status_url": status_url})
+        response.headers["Location"] = status_url
+        return response, 202
+
+    except Exception as e:
+        logger.error(f"Error submitting scan job: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@scan_jobs.route('/api/swing-trading/jobs', methods=['GET'])
+def list_scans():
+    """
+    List recent scan jobs.
+
+    Query Parameters:
+        status (str, optional): Only jobs with this status
+        limit (int, optional): Maximum number of jobs (default: 50)
+
+    Returns:
+        JSON: Jobs, newest first
+    """
+    try:
+        limit = min(max(request.args.get("limit", 50, type=int), 1), MAX_PAGE_SIZE)
+        jobs = [_job_response(job) for job in store.list_jobs(request.args.get("status"), limit)]
+        return jsonify({"jobs": jobs})
+    except Exception as e:
+        logger.error(f"Error listing scan jobs: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@scan_jobs.route('/api/swing-trading/jobs/<job_id>', methods=['GET'])
+def scan_status(job_id):
+    """
+    Get the status and progress of a scan job.
+
+    Args:
+        job_id (str): Job id
+
+    Returns:
+        JSON: Job status, counters and progress percentage
+    """
+    try:
+        job = store.get(job_id)
+        if job is None:
+            return jsonify({"error": "Job not found"}), 404
+        return jsonify(_job_response(job))
+    except Exception as e:
+        logger.error(f"Error getting scan job {job_id}: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@scan_jobs.route('/api/swing-trading/jobs/<job_id>/results', methods=['GET'])
+def scan_results(job_id):
+    """
+    Get a page of a scan job's results, in ticker order.
+
+    Results are available while the job is still running.
+
+    Args:
+        job_id (str): Job id
+
+    Query Parameters:
+        offset (int, optional): Number of results to skip (default: 0)
+        limit (int, optional): Page size (default: 100, max: 1000)
+
+    Returns:
+        JSON: Job status, paging information and results
+    """
+    try:
+        job = store.get(job_id)
+        if job is None:
+            return jsonify({"error": "Job not found"}), 404
+        offset = max(request.args.get("offset", 0, type=int), 0)
+        limit = min(max(request.args.get("limit", DEFAULT_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+        results = store.results(job_id, offset, limit)
+        next_offset = offset + len(results)
+        return jsonify({
+            "job_id": job_id,
+            "status": job["status"],
+            "total": job["total"],
+            "available": job["completed"],
+            "offset": offset,
+            "limit": limit,
+            "next_offset": next_offset if next_offset < job["completed"] else None,
+            "results": results
+        })
+    except Exception as e:
+        logger.error(f"Error getting results of scan job {job_id}: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@scan_jobs.route('/api/swing-trading/jobs/<job_id>', methods=['DELETE'])
+@scan_jobs.route('/api/swing-trading/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_scan(job_id):
+    """
+    Cancel a queued or running scan job. Results stored so far are kept.
+
+    Args:
+        job_id (str): Job id
+
+    Returns:
+        JSON: Job id and status after the request
+    """
+    try:
+        status = store.request_cancel(job_id)
+        if status is None:
+            return jsonify({"error": "Job not found"}), 404
+        return jsonify({"job_id": job_id, "status": status})
+    except Exception as e:
+        logger.error(f"Error cancelling scan job {job_id}: {e}")
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,175 @@
+"""
+PyTrade - Screener Module
+
+This module serves queries over the precomputed end-of-day score table (see
+eod_scores). Filters are passed as query parameters: min_<column> and max_<column>
+bound numeric columns, <column>=a,b matches text columns, and index restricts the
+results to the constituents of supported indices. The screener page's POST body
+(filters with min/max bounds, sort field and direction, page and limit) is
+accepted as well. For example, "combined score above 70 and ATR% between 1.5 and 4
+in the NIFTY 500":
+
+    GET /api/screener?min_combined_overall_score=70&min_atr_pct=1.5&max_atr_pct=4&index=NIFTY 500
+
+Key features:
+- Numeric range and text filters over every score table column
+- GET query parameters or the screener page's JSON request
+- Index membership filter
+- Sorting, paging and column selection
+- Table metadata endpoint (as-of date, row count, columns)
+
+Author: PyTrade Development Team
+Version: 1.0.0
+Date: October 17, 2026
+License: Proprietary
+"""
+
+import time
+import logging
+from flask import Blueprint, request, jsonify
+from eod_scores import score_table, refresher, FLOAT_COLUMNS, STRING_COLUMNS, INT_COLUMNS, SUPPORTED_INDICES
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+RESERVED_PARAMS = ("index", "sort", "offset", "limit", "fields")
+
+screener = Blueprint("screener", __name__)
+
+
+@screener.before_app_request
+def _start_refresher():
+    # The post-close rebuild runs in the background of whichever worker gets the lock
+    refresher.start()
+
+
+def _query_from_args(args):
+    minimums, maximums, equals = {}, {}, {}
+    for name, value in args.items():
+        if name in RESERVED_PARAMS:
+            continue
+        if name.startswith("min_"):
+            minimums[name[4:]] = float(value)
+        elif name.startswith("max_"):
+            maximums[name[4:]] = float(value)
+        else:
+            equals[name] = [v.strip() for v in value.split(",") if v.strip()]
+    fields = args.get("fields")
+    index = args.get("index")
+    return {
+        "minimums": minimums,
+        "maximums": maximums,
+        "equals": equals,
+        "indices": [i.strip() for i in index.split(",")] if index else None,
+        "sort": args.get("sort", "-combined_overall_score"),
+        "offset": args.get("offset", 0, type=int),
+        "limit": args.get("limit", DEFAULT_LIMIT, type=int),
+        "fields": [f.strip() for f in fields.split(",")] if fields else None
+    }
+
+
+def _collect_filters(filters, minimums, maximums, equals):
+    # Filters may be grouped ({"technical": {"rsi": {"min": 30}}}) as the screener page sends them
+    for name, value in filters.items():
+        if isinstance(value, dict) and ("min" in value or "max" in value):
+            if value.get("min") is not None:
+                minimums[name] = float(value["min"])
+            if value.get("max") is not None:
+                maximums[name] = float(value["max"])
+        elif isinstance(value, dict):
+            _collect_filters(value, minimums, maximums, equals)
+        elif isinstance(value, list):
+            if value:
+                equals[name] = value
+        elif value is not None:
+            equals[name] = [value]
+
+
+def _query_from_json(data):
+    minimums, maximums, equals = {}, {}, {}
+    _collect_filters(data.get("filters") or {}, minimums, maximums, equals)
+    sort = data.get("sort") or "-combined_overall_score"
+    if isinstance(sort, dict):
+        sort = ("-" if sort.get("direction", "desc") == "desc" else "") + sort.get("field", "combined_overall_score")
+    limit = int(data.get("limit", DEFAULT_LIMIT))
+    offset = int(data.get("offset", (int(data.get("page", 1)) - 1) * limit))
+    return {
+        "minimums": minimums,
+        "maximums": maximums,
+        "equals": equals,
+        "indices": data.get("indices") or None,
+        "sort": sort,
+        "offset": offset,
+        "limit": limit,
+        "fields": data.get("fields")
+    }
+
+
+@screener.route('/api/screener', methods=['GET', 'POST'])
+def screen():
+    """
+    Filter, sort and page the end-of-day score table.
+
+    Query Parameters (GET):
+        min_<column>, max_<column> (float, optional): Inclusive bounds on a numeric column
+        <column> (str, optional): Comma-separated accepted values of a text column
+        index (str, optional): Comma-separated indices; constituents of any of them match
+        sort (str, optional): Sort column, "-" prefix for descending
+            (default: -combined_overall_score)
+        offset (int, optional): Rows to skip (default: 0)
+        limit (int, optional): Page size (default: 50, max: 1000)
+        fields (str, optional): Comma-separated columns to return
+
+    Request JSON (POST):
+        filters (dict): Column to {"min", "max"} bounds or accepted values, optionally
+            grouped one level deeper
+        sort (dict or str): {"field", "direction"} or a sort column as for GET
+        page (int) or offset (int), limit (int), indices (list), fields (list)
+
+    Returns:
+        JSON: Matching row count, paging information and the matching stocks
+    """
+    start = time.perf_counter()
+    try:
+        if request.method == 'POST':
+            query = _query_from_json(request.get_json(silent=True) or {})
+        else:
+            query = _query_from_args(request.args)
+        query["offset"] = max(query["offset"], 0)
+        query["limit"] = min(max(query["limit"], 1), MAX_LIMIT)
+
+        result = score_table.query(**query)
+        result["query_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return jsonify(result)
+
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 503
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error in screener endpoint: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@screener.route('/api/screener/meta', methods=['GET'])
+def screener_meta():
+    """
+    Describe the end-of-day score table.
+
+    Returns:
+        JSON: Build metadata, filterable columns and supported indices
+    """
+    try:
+        available = score_table.load()
+        return jsonify({
+            "available": available,
+            "meta": score_table.meta,
+            "numeric_columns": list(FLOAT_COLUMNS),
+            "text_columns": list(STRING_COLUMNS),
+            "other_columns": list(INT_COLUMNS),
+            "indices": list(SUPPORTED_INDICES)
+        })
+    except Exception as e:
+        logger.error(f"Error in screener meta endpoint: {e}")
+        return jsonify({"error": str(e)}), 500
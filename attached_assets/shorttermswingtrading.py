@@ -1,4 +1,5 @@
 # ...existing code...
+from indicator_memo import memo as indicator_memo
 
 def get_shorttermswingsignal(ticker, timeframe='short'):
     """
@@ -38,9 +39,13 @@ def get_shorttermswingsignal(ticker, timeframe='short'):
         # Log data retrieval success
         logger.info(f"Successfully retrieved {len(history)} historical data points for {ticker}")
             
-        # Calculate technical indicators
-        history['SMA_50'] = history['Close'].rolling(window=50).mean()
-        history['SMA_200'] = history['Close'].rolling(window=200).mean()
+        # Calculate technical indicators (reused until a new bar or price arrives)
+        moving_averages = indicator_memo.get_or_compute(
+            ticker, history,
+            lambda h: {length: h['Close'].rolling(window=length).mean().to_numpy() for length in (50, 200)},
+            name="sma", params={"lengths": (50, 200)})
+        history['SMA_50'] = moving_averages[50]
+        history['SMA_200'] = moving_averages[200]
         
         # Get the latest data point
         latest_data = history.iloc[-1]
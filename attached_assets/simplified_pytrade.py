@@ -44,7 +44,6 @@ import threading
 import uuid
 import hashlib
 import secrets
-import functools
 import time
 from nsepython import nsefetch
 from utils import get_nse_indices as indices
@@ -57,46 +56,15 @@ from dotenv import load_dotenv
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
 from flask_wtf import CSRFProtect
 from websocket_server import run_websocket_server
+from ws_broadcast import broadcaster as ws_broadcaster
 from indicesdownload import get_indices_list as download_indices_list
 from indicesdownload import get_index_history
-
-# Simple in-memory cache implementation
-cache = {}
-def cache_with_timeout(timeout=300):  # Default 5 minute cache timeout
-    """
-    Function decorator that provides caching with a specified timeout.
-    
-    Args:
-        timeout (int): Cache timeout in seconds (default: 300 seconds / 5 minutes)
-    
-    Returns:
-        Function wrapper implementing the caching behavior
-    """
-    def decorator(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            # Create a unique cache key based on function name and arguments
-            key_parts = [func.__name__]
-            key_parts.extend([str(arg) for arg in args])
-            key_parts.extend([f"{k}:{v}" for k, v in sorted(kwargs.items())])
-            cache_key = ":".join(key_parts)
-            
-            # Check if we have a valid cached result
-            if cache_key in cache:
-                result, timestamp = cache[cache_key]
-                if time.time() - timestamp < timeout:
-                    logger.debug(f"Cache hit for {cache_key}")
-                    return result
-                
-            # Call the original function
-            logger.debug(f"Cache miss for {cache_key}, calling original function")
-            result = func(*args, **kwargs)
-            
-            # Cache the result with current timestamp
-            cache[cache_key] = (result, time.time())
-            return result
-        return wrapper
-    return decorator
+from ohlcv_store import get_history as get_ohlcv_history
+from singleflight import single_flight, get_single_flight_stats
+from symbol_resolver import resolver as symbol_resolver
+from streaming_indicators import registry as indicator_registry, SEED_PERIOD as INDICATOR_SEED_PERIOD
+from stage_timing import histograms as stage_histograms
+from response_cache import cache_response, response_cache
 
 # Load environment variables from .env file
 load_dotenv()
@@ -354,6 +322,22 @@ except ImportError as e:
     logger.warning(f"Google OAuth blueprint could not be imported: {e}")
     logger.warning("Google OAuth functionality will not be available")
 
+# Import and register the background scan job API (index-wide swing trading scans)
+try:
+    from scan_jobs import scan_jobs
+    app.register_blueprint(scan_jobs)
+    logger.info("Scan job blueprint registered successfully")
+except ImportError as e:
+    logger.warning(f"Scan job blueprint could not be imported: {e}")
+
+# Import and register the screener over the precomputed end-of-day score table
+try:
+    from screener import screener
+    app.register_blueprint(screener)
+    logger.info("Screener blueprint registered successfully")
+except ImportError as e:
+    logger.warning(f"Screener blueprint could not be imported: {e}")
+
 # Social Login API endpoints
 @app.route('/api/auth/social/google')
 def social_google_login():
@@ -700,6 +684,7 @@ def fetch_popular_stocks():
     ]
     return popular_stocks
 
+@single_flight()
 def fetch_yahoo_finance_company_overview(symbol):
     """
     Fetch company overview from Yahoo Finance.
@@ -735,38 +720,28 @@ def fetch_yahoo_finance_company_overview(symbol):
         }
     
     try:
-        # First try with .NS suffix for Indian stocks
-        indian_symbol = f"{symbol}.NS"
-        ticker = yf.Ticker(indian_symbol)
-        info = None
-        
-        try:
-            info = ticker.info
-            if info and 'longName' in info:
-                logger.info(f"Found Indian stock data for {symbol} (NSE)")
-                return {
-                    "symbol": symbol,
-                    "company": info.get("longName", info.get("shortName", f"{symbol} Ltd.")),
-                    "exchange": "NSE",
-                    "sector": info.get("sector", ""),
-                    "industry": info.get("industry", ""),
-                    "description": info.get("longBusinessSummary", f"Indian company listed on NSE."),
-                    "website": info.get("website", ""),
-                    "logoUrl": info.get("logo_url", f"/assets/sample-logos/{symbol.lower()}.png"),
-                    "country": "India",
-                    "currency": "INR"
-                }
-        except Exception as e:
-            logger.warning(f"Error fetching NSE data for {symbol}: {e}")
-        
-        # If NSE failed, try without suffix
-        ticker = yf.Ticker(symbol)
-        try:
-            info = ticker.info
-        except Exception as e:
-            logger.warning(f"Error fetching ticker info for {symbol}: {e}")
-        
-        if info and 'longName' in info:
+        def probe(yahoo_ticker):
+            info = yf.Ticker(yahoo_ticker).info
+            return info if info and 'longName' in info else None
+
+        # Try the NSE listing first unless the symbol is known to resolve elsewhere
+        yahoo_ticker, info = symbol_resolver.resolve(symbol, probe, suffixes=(".NS", ""))
+
+        if info and yahoo_ticker.endswith(".NS"):
+            logger.info(f"Found Indian stock data for {symbol} (NSE)")
+            return {
+                "symbol": symbol,
+                "company": info.get("longName", info.get("shortName", f"{symbol} Ltd.")),
+                "exchange": "NSE",
+                "sector": info.get("sector", ""),
+                "industry": info.get("industry", ""),
+                "description": info.get("longBusinessSummary", f"Indian company listed on NSE."),
+                "website": info.get("website", ""),
+                "logoUrl": info.get("logo_url", f"/assets/sample-logos/{symbol.lower()}.png"),
+                "country": "India",
+                "currency": "INR"
+            }
+        elif info:
             return {
                 "symbol": symbol,
                 "company": info.get("longName", info.get("shortName", f"Company for {symbol}")),
@@ -808,6 +783,7 @@ def fetch_yahoo_finance_company_overview(symbol):
             "currency": "USD"
         }
 
+@single_flight()
 def fetch_yahoo_finance_time_series(symbol, period='1y'):
     """
     Fetch time series data from Yahoo Finance.
@@ -852,37 +828,22 @@ def fetch_yahoo_finance_time_series(symbol, period='1y'):
         
         yf_period, yf_interval = period_mapping.get(period, ('1y', '1d'))
         
-        # First try with the .NS suffix for Indian stocks
-        history = None
-        company_details = None
-        is_indian_stock = False
-        
-        # Try with NSE suffix
-        try:
-            indian_symbol = f"{symbol}.NS"
-            logger.info(f"Trying to fetch time series for Indian stock: {indian_symbol}")
-            
-            ticker_ns = yf.Ticker(indian_symbol)
-            history = ticker_ns.history(period=yf_period, interval=yf_interval)
-            
-            if not history.empty:
-                logger.info(f"Successfully fetched time series data for Indian stock: {indian_symbol}")
-                is_indian_stock = True
-                # Get the company details with proper Indian info
-                company_details = fetch_yahoo_finance_company_overview(symbol)
-            else:
-                logger.warning(f"No data found for Indian stock: {indian_symbol}")
-        except Exception as e:
-            logger.warning(f"Error fetching Indian stock data for {symbol}: {e}")
-        
-        # If no Indian stock data, try without suffix
-        if history is None or history.empty:
-            logger.info(f"Falling back to non-Indian stock lookup for {symbol}")
-            ticker = yf.Ticker(symbol)
-            history = ticker.history(period=yf_period, interval=yf_interval)
-            if not history.empty:
-                company_details = fetch_yahoo_finance_company_overview(symbol)
-        
+        def probe(yahoo_ticker):
+            logger.info(f"Trying to fetch time series for {yahoo_ticker}")
+            data = get_ohlcv_history(yahoo_ticker, yf_period, yf_interval)
+            return data if not data.empty else None
+
+        # Try the NSE listing first unless the symbol is known to resolve elsewhere.
+        # Ticker.history returns an empty frame on upstream errors, so an empty
+        # result is not cached as a failure.
+        yahoo_ticker, history = symbol_resolver.resolve(symbol, probe, suffixes=(".NS", ""), negative_cache=False)
+
+        if history is not None:
+            logger.info(f"Successfully fetched time series data for {yahoo_ticker}")
+            company_details = fetch_yahoo_finance_company_overview(symbol)
+        else:
+            history = pd.DataFrame()
+
         if not history.empty:
             # Convert to list format
             prices = []
@@ -1348,7 +1309,7 @@ def generate_sample_index_data():
 
 # API Endpoints
 @app.route('/api/stocks', methods=['GET'])
-@cache_with_timeout(timeout=600)  # Cache stock list for 10 minutes
+@cache_response(timeout=600)  # Cache stock list for 10 minutes
 def get_stocks():
     """
     Get a list of stocks.
@@ -1379,7 +1340,7 @@ def search_stocks():
     return jsonify(results)
 
 @app.route('/api/company/<symbol>', methods=['GET'])
-@cache_with_timeout(timeout=3600)  # Cache company details for 1 hour
+@cache_response(timeout=3600)  # Cache company details for 1 hour
 def get_company_details(symbol):
     """
     Get details for a specific company.
@@ -1407,7 +1368,7 @@ def get_stock_details(symbol):
     return get_company_details(symbol)
 
 @app.route('/api/stock/<symbol>/history', methods=['GET'])
-@cache_with_timeout(timeout=1800)  # Cache historical data for 30 minutes
+@cache_response(timeout=1800)  # Cache historical data for 30 minutes
 def get_stock_history(symbol):
     """
     Get historical price data for a specific stock.
@@ -1442,7 +1403,7 @@ def get_stock_data(symbol):
     return get_stock_history(symbol)
 
 @app.route('/api/indices', methods=['GET'])
-@cache_with_timeout(timeout=300)  # Cache indices data for 5 minutes
+@cache_response(timeout=300, stale_ttl=900)  # Fresh for 5 minutes, served stale for 15 more while refreshing
 def get_indices():
     """
     Get a list of market indices.
@@ -1566,7 +1527,7 @@ def get_indices():
         return jsonify(generate_sample_index_data())
 
 @app.route('/api/index/<index_name>/history', methods=['GET'])
-@cache_with_timeout(timeout=600)  # Cache history data for 10 minutes
+@cache_response(timeout=600, stale_ttl=1800)  # Fresh for 10 minutes, served stale for 30 more while refreshing
 def get_index_history_endpoint(index_name):
     """
     Get historical data for a specific index.
@@ -1655,11 +1616,9 @@ def get_index_history_endpoint(index_name):
                 return {}
             
             try:
-                # Fetch data using yfinance
-                import yfinance as yf
+                # Fetch data through the incremental OHLCV store (only bars after the watermark hit yfinance)
                 logger.info(f"Using yfinance to fetch data for {index_name} ({ticker}) with period {period}")
-                index_ticker = yf.Ticker(ticker)
-                hist = index_ticker.history(period=period)
+                hist = get_ohlcv_history(ticker, period, "1d", force_refresh=force_refresh)
                 
                 if hist.empty:
                     logger.warning(f"No historical data found for {index_name} ({ticker})")
@@ -1725,7 +1684,7 @@ def get_index_history_endpoint(index_name):
         })
 
 @app.route('/api/index/<index_name>/constituents', methods=['GET'])
-@cache_with_timeout(timeout=600)  # Cache constituents data for 10 minutes
+@cache_response(timeout=600)  # Cache constituents data for 10 minutes
 def get_index_constituents(index_name):
     """
     Get the constituents of a specific index.
@@ -2539,7 +2498,7 @@ def get_index_constituents(index_name):
         return jsonify([])
 
 @app.route('/api/stock/<symbol>/technical', methods=['GET'])
-@cache_with_timeout(timeout=1800)  # Cache technical indicators for 30 minutes
+@cache_response(timeout=60)  # Live indicators move with every quote, cache briefly
 def get_technical_indicators(symbol):
     """
     Get technical indicators for a specific stock.
@@ -2552,7 +2511,53 @@ def get_technical_indicators(symbol):
     company_details = fetch_yahoo_finance_company_overview(symbol)
     is_indian_stock = company_details.get("exchange") == "NSE" and company_details.get("currency") == "INR"
     
-    # Generate random technical indicator values
+    # Serve the incrementally maintained indicators (seeded once from history,
+    # advanced by live quotes) instead of recomputing the whole series
+    try:
+        live = None
+        for yahoo_ticker in symbol_resolver.candidates(symbol, (".NS", "")):
+            if not indicator_registry.needs_seed(yahoo_ticker):
+                live = indicator_registry.get(yahoo_ticker)
+                break
+        if live is None:
+            def probe(yahoo_ticker):
+                history = get_ohlcv_history(yahoo_ticker, INDICATOR_SEED_PERIOD, "1d")
+                return history if not history.empty else None
+
+            # Resolve with the history probe (an empty result may be an upstream
+            # error, so it is not negatively cached), then seed from that history
+            yahoo_ticker, history = symbol_resolver.resolve(symbol, probe, suffixes=(".NS", ""),
+                                                            negative_cache=False)
+            if history is not None:
+                live = indicator_registry.get(yahoo_ticker, loader=lambda: history)
+        values = live.snapshot() if live else None
+    except Exception as e:
+        logger.error(f"Error getting live indicators for {symbol}: {e}")
+        values = None
+    
+    if values:
+        def rounded(name):
+            return round(values[name], 2) if values.get(name) is not None else None
+        
+        return jsonify({
+            "symbol": symbol,
+            "rsi": rounded("rsi"),
+            "macd": rounded("macd"),
+            "signal": rounded("macd_signal"),
+            "histogram": rounded("macd_hist"),
+            "ema50": rounded("ema_long"),
+            "ema200": rounded("ema_trend"),
+            "sma50": rounded("sma_long"),
+            "sma200": rounded("sma_trend"),
+            "atr": rounded("atr"),
+            "upperBollingerBand": rounded("bb_upper"),
+            "lowerBollingerBand": rounded("bb_lower"),
+            "middleBollingerBand": rounded("bb_middle"),
+            "exchange": company_details.get("exchange", ""),
+            "currency": company_details.get("currency", "USD")
+        })
+    
+    # No history available: fall back to generated values around the last price
     import random
     
     rsi = round(random.uniform(30, 70), 2)
@@ -2603,7 +2608,7 @@ def get_technical_indicators(symbol):
     })
 
 @app.route('/api/stock/<symbol>/fundamental', methods=['GET'])
-@cache_with_timeout(timeout=3600)  # Cache fundamental data for 1 hour
+@cache_response(timeout=3600)  # Cache fundamental data for 1 hour
 def get_fundamental_data(symbol):
     """
     Get fundamental data for a specific stock.
@@ -2709,7 +2714,7 @@ def get_fundamental_data(symbol):
     })
 
 @app.route('/api/stock/<symbol>/prediction', methods=['GET'])
-@cache_with_timeout(timeout=3600)  # Cache prediction data for 1 hour
+@cache_response(timeout=3600)  # Cache prediction data for 1 hour
 def get_prediction_data(symbol):
     """
     Get prediction data for a specific stock.
@@ -2758,7 +2763,7 @@ def get_prediction_data(symbol):
     })
 
 @app.route('/api/stock/<symbol>/news', methods=['GET'])
-@cache_with_timeout(timeout=900)  # Cache stock news for 15 minutes
+@cache_response(timeout=900)  # Cache stock news for 15 minutes
 def get_stock_news(symbol):
     """
     Get news for a specific stock.
@@ -2834,7 +2839,7 @@ def get_stock_news(symbol):
         return jsonify([])
 
 @app.route('/api/market/news', methods=['GET'])
-@cache_with_timeout(timeout=1800)  # Cache market news for 30 minutes
+@cache_response(timeout=1800)  # Cache market news for 30 minutes
 def get_market_news():
     """
     Get general market news.
@@ -2894,7 +2899,7 @@ def get_market_news():
         return jsonify([])
 
 @app.route('/api/market/<market>/top', methods=['GET'])
-@cache_with_timeout(timeout=1800)  # Cache top stocks for 30 minutes
+@cache_response(timeout=1800, stale_ttl=3600)  # Fresh for 30 minutes, served stale for 1 hour more while refreshing
 def get_top_stocks_by_market(market):
     """
     Get top stocks for a specific market.
@@ -2994,7 +2999,7 @@ def get_top_stocks_by_market(market):
         return jsonify([]), 500
 
 @app.route('/api/stock/<symbol>/shorttermswing', methods=['GET'])
-@cache_with_timeout(timeout=1800)  # Cache trading signals for 30 minutes
+@cache_response(timeout=1800)  # Cache trading signals for 30 minutes
 def get_shorttermswingsignal(symbol):
     """
     Get short-term swing trading signal for a specific stock.
@@ -3052,6 +3057,29 @@ def get_shorttermswingsignal(symbol):
         "reason": f"Based on technical analysis, the {strength.lower()} {signal.lower()} signal is generated for {symbol}."
     })
 
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Get internal performance counters for this worker.
+    Returns:
+        JSON: Single-flight coalescing statistics per fetcher, response
+              cache statistics, symbol resolution table counts, the
+              number of symbols with live indicator state, the per-stage
+              analysis latency histograms and the WebSocket broadcast metrics
+              (fan-out time, conflation, slow-client evictions).
+    """
+    return jsonify({
+        "singleflight": get_single_flight_stats(),
+        "response_cache": response_cache.stats(),
+        "symbol_resolver": symbol_resolver.stats(),
+        "streaming_indicators": indicator_registry.stats(),
+        "stage_timings": stage_histograms.stats(),
+        "websocket_broadcast": ws_broadcaster.stats()
+    })
+
+# Extend the symbol resolution table with the full NSE equity list in the background
+threading.Thread(target=symbol_resolver.seed_from_nse_list, daemon=True).start()
+
 # Main entry point
 if __name__ == "__main__":
     # Always start WebSocket server in a separate thread
@@ -0,0 +1,165 @@
+"""
+PyTrade - Single-Flight Module
+
+This module provides request coalescing for upstream data fetches. When several
+callers ask for the same key at the same time (for example the company overview of
+one symbol requested by six dashboard routes at once), only the first caller runs
+the upstream request; the others wait for it and receive the same result.
+
+Key features:
+- Per-key coalescing of concurrent identical calls
+- Decorator for wrapping existing fetch functions without changing callers
+- Errors are propagated to every waiting caller
+- Counters for calls, upstream executions and de-duplicated calls
+
+Author: PyTrade Development Team
+Version: 1.0.0
+Date: October 17, 2026
+License: Proprietary
+"""
+
+import copy
+import logging
+import functools
+import threading
+from ttl_cache import make_cache_key
+
+logger = logging.getLogger(__name__)
+
+# Registry of single-flight groups by name, used for statistics reporting
+_groups = {}
+_groups_lock = threading.Lock()
+
+
+class _Call:
+    """An in-flight upstream call that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share the same key into one execution.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "executions": 0, "deduplicated": 0, "errors": 0}
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Run fn for key, or wait for an identical call that is already in flight.
+
+        Args:
+            key (str): Key identifying identical calls
+            fn (callable): Function performing the upstream request
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            The result of fn. Callers that joined an in-flight call receive a
+            deep copy so they cannot mutate each other's data.
+        """
+        with self._lock:
+            self._stats["calls"] += 1
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+            else:
+                call.waiters += 1
+                self._stats["deduplicated"] += 1
+                leader = False
+
+        if not leader:
+            logger.debug(f"Single-flight [{self.name}] joined in-flight call for {key}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            with self._lock:
+                self._stats["executions"] += 1
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+            if call.waiters:
+                logger.debug(f"Single-flight [{self.name}] shared result for {key} with {call.waiters} callers")
+
+    def stats(self):
+        """
+        Get the counters for this group.
+
+        Returns:
+            dict: calls, executions, deduplicated, errors and in_flight counts
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+        return stats
+
+
+def get_group(name):
+    """
+    Get (or create) the named single-flight group.
+
+    Args:
+        name (str): Group name
+
+    Returns:
+        SingleFlight: The shared group instance
+    """
+    with _groups_lock:
+        if name not in _groups:
+            _groups[name] = SingleFlight(name)
+        return _groups[name]
+
+
+def single_flight(name=None):
+    """
+    Function decorator that coalesces concurrent calls with identical arguments.
+
+    Args:
+        name (str, optional): Group name (default: the function name)
+
+    Returns:
+        Function wrapper implementing the coalescing behavior
+    """
+    def decorator(func):
+        group = get_group(name or func.__name__)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # Key on the function name and call arguments (ttl_cache.make_cache_key)
+            key = make_cache_key(func.__name__, args, kwargs)
+            return group.do(key, func, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_single_flight_stats():
+    """
+    Get counters for every single-flight group.
+
+    Returns:
+        dict: Mapping of group name to its statistics
+    """
+    with _groups_lock:
+        groups = list(_groups.values())
+    return {group.name: group.stats() for group in groups}
@@ -0,0 +1,221 @@
+"""
+PyTrade - Stage Timing Module
+
+This module instruments the stages of a ticker analysis (history fetch, nsepython
+fallback, company info, indicators, fundamentals, news) and counts the upstream calls
+each analysis makes. An analysis runs inside track(), which makes a StageTimer the
+current timer of its thread; stage() and count_call() anywhere below it (including
+the data-layer modules) record into that timer without it being passed around.
+
+Every stage duration and upstream call is also aggregated into process-wide
+histograms, whether or not an analysis is being tracked, so production load can be
+profiled from /api/metrics. The per-analysis breakdown can be returned to the client
+as a "_timings" field.
+
+Key features:
+- Nested stage timers per analysis (context-local, thread and greenlet safe)
+- Upstream call counters (Yahoo history, bulk downloads, company info, NSE)
+- Process-wide latency histograms with percentile estimates per stage
+- JSON-ready per-analysis breakdown for the "_timings" field
+
+Author: PyTrade Development Team
+Version: 1.0.0
+Date: October 17, 2026
+License: Proprietary
+"""
+
+import time
+import bisect
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the histogram buckets in milliseconds (the last bucket is open)
+BUCKET_BOUNDS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+PERCENTILES = (50, 90, 95, 99)
+
+_current_timer = contextvars.ContextVar("pytrade_stage_timer", default=None)
+
+
+class StageHistograms:
+    """
+    Process-wide latency histograms per stage and upstream call totals.
+    """
+
+    def __init__(self, bounds=BUCKET_BOUNDS_MS):
+        self.bounds = tuple(bounds)
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._calls = {}
+
+    def observe(self, name, seconds):
+        """
+        Record one stage duration.
+
+        Args:
+            name (str): Stage name
+            seconds (float): Duration in seconds
+        """
+        ms = seconds * 1000
+        bucket = bisect.bisect_left(self.bounds, ms)
+        with self._lock:
+            stage = self._stages.get(name)
+            if stage is None:
+                stage = self._stages[name] = {"count": 0, "sum": 0.0, "max": 0.0,
+                                              "buckets": [0] * (len(self.bounds) + 1)}
+            stage["count"] += 1
+            stage["sum"] += ms
+            stage["max"] = max(stage["max"], ms)
+            stage["buckets"][bucket] += 1
+
+    def count_call(self, name, amount=1):
+        """Add to the process-wide total of an upstream call."""
+        with self._lock:
+            self._calls[name] = self._calls.get(name, 0) + amount
+
+    def _percentile(self, buckets, count, percentile):
+        # Upper bound of the bucket holding the percentile (the maximum for the open bucket)
+        rank = count * percentile / 100.0
+        seen = 0
+        for index, bucket_count in enumerate(buckets):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return self.bounds[index] if index < len(self.bounds) else None
+        return None
+
+    def stats(self):
+        """
+        Get the histograms.
+
+        Returns:
+            dict: {"stages": {name: count, mean/max/percentile estimates in ms and
+                  bucket counts}, "upstream_calls": {name: total}}
+        """
+        with self._lock:
+            stages = {name: dict(stage, buckets=list(stage["buckets"])) for name, stage in self._stages.items()}
+            calls = dict(self._calls)
+
+        labels = [f"<={bound:g}ms" for bound in self.bounds] + [f">{self.bounds[-1]:g}ms"]
+        result = {}
+        for name, stage in sorted(stages.items()):
+            entry = {
+                "count": stage["count"],
+                "mean_ms": round(stage["sum"] / stage["count"], 2),
+                "max_ms": round(stage["max"], 2),
+                "buckets": {label: n for label, n in zip(labels, stage["buckets"]) if n}
+            }
+            for percentile in PERCENTILES:
+                estimate = self._percentile(stage["buckets"], stage["count"], percentile)
+                entry[f"p{percentile}_ms"] = estimate if estimate is not None else round(stage["max"], 2)
+            result[name] = entry
+        return {"stages": result, "upstream_calls": calls}
+
+    def reset(self):
+        """Clear all histograms and counters."""
+        with self._lock:
+            self._stages.clear()
+            self._calls.clear()
+
+
+# Process-wide histograms
+histograms = StageHistograms()
+
+
+class StageTimer:
+    """
+    Stage durations and upstream call counts of one analysis.
+    """
+
+    def __init__(self, label=None):
+        self.label = label
+        self.stages = {}
+        self.calls = {}
+        self._start = time.perf_counter()
+
+    def add(self, name, seconds):
+        """Add a stage duration (repeated stages accumulate)."""
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def count(self, name, amount=1):
+        """Count an upstream call."""
+        self.calls[name] = self.calls.get(name, 0) + amount
+
+    def elapsed(self):
+        """Seconds since the timer started."""
+        return time.perf_counter() - self._start
+
+    def as_dict(self):
+        """
+        Get the breakdown for the "_timings" field.
+
+        Returns:
+            dict: total_ms, stages (ms per stage; nested stages are also part of
+                  their parent) and upstream_calls
+        """
+        return {
+            "total_ms": round(self.elapsed() * 1000, 2),
+            "stages": {name: round(seconds * 1000, 2) for name, seconds in self.stages.items()},
+            "upstream_calls": dict(self.calls)
+        }
+
+
+@contextmanager
+def track(label=None, name="analysis"):
+    """
+    Track one analysis: stages and calls below this block record into a new timer.
+
+    Args:
+        label (str, optional): Label of the analysis (e.g. the ticker)
+        name (str): Histogram name of the whole analysis
+
+    Yields:
+        StageTimer: The analysis timer
+    """
+    timer = StageTimer(label)
+    token = _current_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _current_timer.reset(token)
+        histograms.observe(name, timer.elapsed())
+
+
+@contextmanager
+def stage(name):
+    """
+    Time a stage into the current analysis timer and the process-wide histograms.
+
+    Args:
+        name (str): Stage name
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        timer = _current_timer.get()
+        if timer is not None:
+            timer.add(name, elapsed)
+        histograms.observe(name, elapsed)
+
+
+def count_call(name, amount=1):
+    """
+    Count an upstream call in the current analysis timer and the process-wide totals.
+
+    Args:
+        name (str): Upstream call name
+        amount (int): Number of calls
+    """
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.count(name, amount)
+    histograms.count_call(name, amount)
+
+
+def current_timer():
+    """Get the timer of the analysis running in this context, or None."""
+    return _current_timer.get()
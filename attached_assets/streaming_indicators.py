@@ -0,0 +1,556 @@
+"""
+PyTrade - Streaming Indicators Module
+
+This module keeps technical indicators up to date incrementally. Each indicator is a
+small state object that is seeded once from history and then updated in constant
+time per new bar, so live quotes from the WebSocket server and requests to
+/api/stock/<symbol>/technical can be answered without recomputing the whole series.
+
+Completed bars are committed with update(); the bar that is still forming (today's
+daily bar while the market is open) is evaluated with peek(), which returns the value
+the indicator would have if the bar closed at the current price without changing the
+state. The results match indicator_engine (pandas_ta conventions) bar for bar.
+
+Key features:
+- O(1) EMA, Wilder RMA, RSI, MACD and ATR states
+- Rolling mean/variance for Bollinger Bands and SMAs with periodic exact re-summing
+- Monotonic-deque rolling max/min for market structure detection
+- Per-symbol registry that seeds from the OHLCV store and rolls bars on new sessions
+
+Author: PyTrade Development Team
+Version: 1.0.0
+Date: October 17, 2026
+License: Proprietary
+"""
+
+import os
+import math
+import time
+import logging
+import threading
+from collections import deque
+import pandas as pd
+from indicator_engine import DEFAULT_PARAMS
+from ohlcv_store import get_history
+
+logger = logging.getLogger(__name__)
+
+# Indicator parameters for the live set (swing trading set plus long-term averages)
+STREAMING_PARAMS = dict(DEFAULT_PARAMS, ema_trend=200, sma_long=50, sma_trend=200)
+# Seconds after which a registry entry is re-seeded from history
+RESEED_SECONDS = int(os.environ.get("PYTRADE_STREAMING_RESEED_SECONDS", 3600))
+# History period used to seed daily indicators (enough bars for the 200-bar averages)
+SEED_PERIOD = "2y"
+
+
+def _valid(value):
+    return value is not None and not (isinstance(value, float) and math.isnan(value))
+
+
+class EMAState:
+    """Exponential moving average seeded with the SMA of the first `length` values."""
+
+    def __init__(self, length):
+        self.length = length
+        self.alpha = 2.0 / (length + 1)
+        self.count = 0
+        self.seed_sum = 0.0
+        self.value = None
+
+    def update(self, x):
+        if not _valid(x):
+            return self.value
+        if self.value is None:
+            self.count += 1
+            self.seed_sum += x
+            if self.count == self.length:
+                self.value = self.seed_sum / self.length
+        else:
+            self.value = self.alpha * x + (1.0 - self.alpha) * self.value
+        return self.value
+
+    def peek(self, x):
+        if not _valid(x):
+            return self.value
+        if self.value is None:
+            return (self.seed_sum + x) / self.length if self.count + 1 == self.length else None
+        return self.alpha * x + (1.0 - self.alpha) * self.value
+
+
+class RMAState:
+    """Wilder's moving average (adjusted EWM with alpha = 1 / length)."""
+
+    def __init__(self, length):
+        self.length = length
+        self.decay = 1.0 - 1.0 / length
+        self.weighted = None
+        self.old_wt = 1.0
+        self.nobs = 0
+
+    def _next(self, x):
+        if self.weighted is None:
+            return x, 1.0
+        old_wt = self.old_wt * self.decay
+        return (old_wt * self.weighted + x) / (old_wt + 1.0), old_wt + 1.0
+
+    @property
+    def value(self):
+        return self.weighted if self.nobs >= self.length else None
+
+    def update(self, x):
+        if _valid(x):
+            self.weighted, self.old_wt = self._next(x)
+            self.nobs += 1
+        return self.value
+
+    def peek(self, x):
+        if not _valid(x):
+            return self.value
+        weighted, _ = self._next(x)
+        return weighted if self.nobs + 1 >= self.length else None
+
+
+class RSIState:
+    """Relative Strength Index with Wilder smoothing."""
+
+    def __init__(self, length=14):
+        self.gain = RMAState(length)
+        self.loss = RMAState(length)
+        self.prev_close = None
+
+    @staticmethod
+    def _rsi(avg_gain, avg_loss):
+        if avg_gain is None or avg_loss is None or avg_gain + avg_loss == 0:
+            return None
+        return 100.0 * avg_gain / (avg_gain + avg_loss)
+
+    def update(self, close):
+        if self.prev_close is not None:
+            change = close - self.prev_close
+            self.gain.update(max(change, 0.0))
+            self.loss.update(max(-change, 0.0))
+        self.prev_close = close
+        return self._rsi(self.gain.value, self.loss.value)
+
+    def peek(self, close):
+        if self.prev_close is None:
+            return None
+        change = close - self.prev_close
+        return self._rsi(self.gain.peek(max(change, 0.0)), self.loss.peek(max(-change, 0.0)))
+
+
+class MACDState:
+    """MACD line, signal line and histogram."""
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = EMAState(fast)
+        self.slow = EMAState(slow)
+        self.signal = EMAState(signal)
+        self.value = (None, None, None)
+
+    @staticmethod
+    def _combine(macd_line, signal_line):
+        histogram = macd_line - signal_line if macd_line is not None and signal_line is not None else None
+        return macd_line, signal_line, histogram
+
+    def update(self, close):
+        fast, slow = self.fast.update(close), self.slow.update(close)
+        if fast is not None and slow is not None:
+            macd_line = fast - slow
+            self.value = self._combine(macd_line, self.signal.update(macd_line))
+        return self.value
+
+    def peek(self, close):
+        fast, slow = self.fast.peek(close), self.slow.peek(close)
+        if fast is None or slow is None:
+            return None, None, None
+        macd_line = fast - slow
+        return self._combine(macd_line, self.signal.peek(macd_line))
+
+
+class ATRState:
+    """Average True Range with Wilder smoothing."""
+
+    def __init__(self, length=14):
+        self.rma = RMAState(length)
+        self.prev_close = None
+
+    def _true_range(self, high, low):
+        return max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+
+    def update(self, high, low, close):
+        if self.prev_close is not None:
+            self.rma.update(self._true_range(high, low))
+        self.prev_close = close
+        return self.rma.value
+
+    def peek(self, high, low, close):
+        if self.prev_close is None:
+            return None
+        return self.rma.peek(self._true_range(high, low))
+
+
+class RollingStatsState:
+    """Rolling mean and population standard deviation over a fixed window."""
+
+    def __init__(self, length):
+        self.length = length
+        self.window = deque()
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.updates = 0
+
+    def update(self, x):
+        self.window.append(x)
+        self.total += x
+        self.total_sq += x * x
+        if len(self.window) > self.length:
+            old = self.window.popleft()
+            self.total -= old
+            self.total_sq -= old * old
+        self.updates += 1
+        if self.updates % self.length == 0:
+            # Re-sum exactly from time to time so floating point drift cannot accumulate
+            self.total = math.fsum(self.window)
+            self.total_sq = math.fsum(v * v for v in self.window)
+        return self.stats()
+
+    def _stats(self, total, total_sq, count):
+        if count < self.length:
+            return None, None
+        mean = total / count
+        return mean, math.sqrt(max(total_sq / count - mean * mean, 0.0))
+
+    def stats(self):
+        return self._stats(self.total, self.total_sq, len(self.window))
+
+    def peek(self, x):
+        total, total_sq, count = self.total + x, self.total_sq + x * x, len(self.window) + 1
+        if count > self.length:
+            old = self.window[0]
+            total, total_sq, count = total - old, total_sq - old * old, self.length
+        return self._stats(total, total_sq, count)
+
+
+class RollingExtremaState:
+    """Rolling maximum or minimum using a monotonic deque (amortized O(1))."""
+
+    def __init__(self, length, mode="max"):
+        self.length = length
+        self.better = (lambda a, b: a >= b) if mode == "max" else (lambda a, b: a <= b)
+        self.candidates = deque()  # (bar index, value), best value first
+        self.index = -1
+
+    def update(self, x):
+        self.index += 1
+        while self.candidates and self.better(x, self.candidates[-1][1]):
+            self.candidates.pop()
+        self.candidates.append((self.index, x))
+        while self.candidates[0][0] <= self.index - self.length:
+            self.candidates.popleft()
+        return self.value
+
+    @property
+    def value(self):
+        return self.candidates[0][1] if self.index + 1 >= self.length else None
+
+    def peek(self, x):
+        if self.index + 2 < self.length:
+            return None
+        evicted = self.index + 1 - self.length
+        remaining = [value for idx, value in list(self.candidates)[:2] if idx > evicted]
+        if remaining and not self.better(x, remaining[0]):
+            return remaining[0]
+        return x
+
+
+class MarketStructureState:
+    """Higher-highs/higher-lows and lower-highs/lower-lows over the last bars."""
+
+    def __init__(self, window=3, lookback=5):
+        self.highs = RollingExtremaState(window, "max")
+        self.lows = RollingExtremaState(window, "min")
+        self.recent_highs = deque(maxlen=lookback + 1)
+        self.recent_lows = deque(maxlen=lookback + 1)
+        self.lookback = lookback
+
+    def _trend(self, highs, lows):
+        if len(highs) < self.lookback + 1 or any(v is None for v in list(highs) + list(lows)):
+            return False, False
+        high_changes = [b - a for a, b in zip(list(highs)[:-1], list(highs)[1:])]
+        low_changes = [b - a for a, b in zip(list(lows)[:-1], list(lows)[1:])]
+        is_uptrend = all(c > 0 for c in high_changes) and all(c > 0 for c in low_changes)
+        is_downtrend = all(c < 0 for c in high_changes) and all(c < 0 for c in low_changes)
+        return is_uptrend, is_downtrend
+
+    def update(self, high, low):
+        self.recent_highs.append(self.highs.update(high))
+        self.recent_lows.append(self.lows.update(low))
+        return self._trend(self.recent_highs, self.recent_lows)
+
+    def peek(self, high, low):
+        highs = list(self.recent_highs)[1:] + [self.highs.peek(high)]
+        lows = list(self.recent_lows)[1:] + [self.lows.peek(low)]
+        return self._trend(highs, lows)
+
+
+class IndicatorSet:
+    """
+    The full live indicator set for one symbol and interval.
+    """
+
+    def __init__(self, params=None):
+        p = dict(STREAMING_PARAMS)
+        if params:
+            p.update(params)
+        self.params = p
+        self.rsi = RSIState(p["rsi_length"])
+        self.macd = MACDState(p["macd_fast"], p["macd_slow"], p["macd_signal"])
+        self.atr = ATRState(p["atr_length"])
+        self.emas = {name: EMAState(p[name]) for name in ("ema_short", "ema_long", "ema_trend")}
+        self.smas = {name: RollingStatsState(p[name]) for name in ("sma_long", "sma_trend")}
+        self.bb = RollingStatsState(p["bb_length"])
+        self.structure = MarketStructureState(p["ms_window"], p["ms_lookback"])
+        self.bars = 0
+
+    def update(self, high, low, close):
+        """
+        Commit a completed bar.
+
+        Args:
+            high (float): Bar high
+            low (float): Bar low
+            close (float): Bar close
+        """
+        self.rsi.update(close)
+        self.macd.update(close)
+        self.atr.update(high, low, close)
+        for state in self.emas.values():
+            state.update(close)
+        for state in self.smas.values():
+            state.update(close)
+        self.bb.update(close)
+        self.structure.update(high, low)
+        self.bars += 1
+
+    def values(self, high, low, close):
+        """
+        Evaluate every indicator as if the forming bar closed at `close`.
+
+        Args:
+            high (float): Forming bar high so far
+            low (float): Forming bar low so far
+            close (float): Latest price
+
+        Returns:
+            dict: Indicator values (None while an indicator is warming up)
+        """
+        macd_line, signal_line, histogram = self.macd.peek(close)
+        bb_middle, bb_std = self.bb.peek(close)
+        is_uptrend, is_downtrend = self.structure.peek(high, low)
+        values = {
+            "close": close,
+            "rsi": self.rsi.peek(close),
+            "macd": macd_line,
+            "macd_signal": signal_line,
+            "macd_hist": histogram,
+            "atr": self.atr.peek(high, low, close),
+            "bb_middle": bb_middle,
+            "bb_lower": bb_middle - self.params["bb_std"] * bb_std if bb_middle is not None else None,
+            "bb_upper": bb_middle + self.params["bb_std"] * bb_std if bb_middle is not None else None,
+            "is_uptrend": is_uptrend,
+            "is_downtrend": is_downtrend
+        }
+        for name, state in self.emas.items():
+            values[name] = state.peek(close)
+        for name, state in self.smas.items():
+            values[name] = state.peek(close)[0]
+        return values
+
+
+class StreamingIndicators:
+    """
+    Live indicators for one symbol: committed history plus the forming bar.
+    """
+
+    def __init__(self, symbol, interval="1d", params=None):
+        self.symbol = symbol
+        self.interval = interval
+        self.params = params
+        self.indicators = IndicatorSet(params)
+        self.bar = None  # Forming bar: {"time", "high", "low", "close"}
+        self.seeded_at = None
+        self.updated_at = None
+        # Ticks arrive on the WebSocket thread while API threads read snapshots
+        self._lock = threading.RLock()
+
+    def seed(self, hist):
+        """
+        Seed the indicator states from history.
+
+        All bars except the last are committed; the last bar becomes the forming
+        bar, since a daily history fetched during the session ends with today's
+        incomplete bar.
+
+        Args:
+            hist (pd.DataFrame): OHLCV history with High, Low and Close columns
+        """
+        indicators = IndicatorSet(self.params)
+        hist = hist.dropna(subset=["High", "Low", "Close"])
+        for high, low, close in zip(hist["High"].iloc[:-1], hist["Low"].iloc[:-1], hist["Close"].iloc[:-1]):
+            indicators.update(float(high), float(low), float(close))
+        bar = None
+        if len(hist):
+            last = hist.iloc[-1]
+            bar = {"time": hist.index[-1], "high": float(last["High"]),
+                   "low": float(last["Low"]), "close": float(last["Close"])}
+        with self._lock:
+            self.indicators, self.bar = indicators, bar
+            self.seeded_at = self.updated_at = time.time()
+
+    def _same_bar(self, timestamp):
+        bar_time = pd.Timestamp(self.bar["time"])
+        timestamp = pd.Timestamp(timestamp)
+        if bar_time.tzinfo is not None:
+            timestamp = timestamp.tz_localize(bar_time.tzinfo) if timestamp.tzinfo is None else timestamp.tz_convert(bar_time.tzinfo)
+        if self.interval in ("1d", "1wk", "1mo"):
+            return timestamp.date() <= bar_time.date()
+        return timestamp <= bar_time
+
+    def on_tick(self, price, high=None, low=None, timestamp=None):
+        """
+        Apply a live price to the forming bar, rolling to a new bar on a new session.
+
+        Args:
+            price (float): Latest traded price
+            high (float, optional): Session high reported by the quote source
+            low (float, optional): Session low reported by the quote source
+            timestamp (datetime, optional): Market time of the quote's last trade.
+                Without it the wall clock is used, and a new calendar day only
+                starts a bar once the price moves, so weekend and holiday polls that
+                repeat the last close do not commit phantom bars.
+
+        Returns:
+            dict: Current indicator values
+        """
+        with self._lock:
+            market_time = timestamp is not None
+            if timestamp is None:
+                tz = pd.Timestamp(self.bar["time"]).tzinfo if self.bar else None
+                timestamp = pd.Timestamp.now(tz=tz)
+            if self.bar is not None and not self._same_bar(timestamp) \
+                    and (market_time or price != self.bar["close"]):
+                # A new session started: the forming bar is complete
+                self.indicators.update(self.bar["high"], self.bar["low"], self.bar["close"])
+                self.bar = None
+            if self.bar is None:
+                self.bar = {"time": pd.Timestamp(timestamp), "high": price, "low": price, "close": price}
+
+            self.bar["close"] = price
+            self.bar["high"] = max(self.bar["high"], price, high if _valid(high) else price)
+            self.bar["low"] = min(self.bar["low"], price, low if _valid(low) else price)
+            self.updated_at = time.time()
+            return self.snapshot()
+
+    def snapshot(self):
+        """
+        Get the current indicator values.
+
+        Returns:
+            dict: Indicator values including the forming bar, or None before seeding
+        """
+        with self._lock:
+            if self.bar is None:
+                return None
+            values = self.indicators.values(self.bar["high"], self.bar["low"], self.bar["close"])
+            values["bar_time"] = str(self.bar["time"])
+            return values
+
+
+class IndicatorRegistry:
+    """
+    Process-wide registry of live indicator states keyed by symbol and interval.
+    """
+
+    def __init__(self, reseed_seconds=RESEED_SECONDS):
+        self.reseed_seconds = reseed_seconds
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, symbol, interval="1d", loader=None):
+        """
+        Get the live indicators for a symbol, seeding them from history if needed.
+
+        Args:
+            symbol (str): Yahoo Finance ticker
+            interval (str): Bar interval
+            loader (callable, optional): Returns the OHLCV history DataFrame used for
+                seeding (default: SEED_PERIOD of history from the OHLCV store)
+
+        Returns:
+            StreamingIndicators: Seeded indicator state, or None if no history is available
+        """
+        key = (symbol, interval)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and time.time() - entry.seeded_at < self.reseed_seconds:
+            return entry
+
+        hist = loader() if loader else get_history(symbol, SEED_PERIOD, interval)
+        if hist is None or hist.empty:
+            return entry
+        fresh = StreamingIndicators(symbol, interval)
+        fresh.seed(hist)
+        with self._lock:
+            self._entries[key] = fresh
+        logger.info(f"Seeded streaming indicators for {symbol} ({interval}) from {len(hist)} bars")
+        return fresh
+
+    def needs_seed(self, symbol, interval="1d"):
+        """
+        Check whether a symbol has no live indicators yet or is due for re-seeding.
+
+        Args:
+            symbol (str): Yahoo Finance ticker
+            interval (str): Bar interval
+
+        Returns:
+            bool: True if the next get() would load history
+        """
+        with self._lock:
+            entry = self._entries.get((symbol, interval))
+        return entry is None or time.time() - entry.seeded_at >= self.reseed_seconds
+
+    def on_tick(self, symbol, price, high=None, low=None, interval="1d", timestamp=None):
+        """
+        Apply a live quote to a symbol's indicators, seeding them first if needed.
+
+        Args:
+            symbol (str): Yahoo Finance ticker
+            price (float): Latest price
+            high (float, optional): Session high
+            low (float, optional): Session low
+            interval (str): Bar interval
+            timestamp (datetime, optional): Market time of the quote's last trade
+
+        Returns:
+            dict: Current indicator values, or None if the symbol has no history
+        """
+        entry = self.get(symbol, interval)
+        if entry is None:
+            return None
+        return entry.on_tick(price, high, low, timestamp)
+
+    def stats(self):
+        """
+        Get registry statistics.
+
+        Returns:
+            dict: Number of symbols tracked
+        """
+        with self._lock:
+            return {"symbols": len(self._entries)}
+
+
+# Shared registry used by the WebSocket server and the technical indicators endpoint
+registry = IndicatorRegistry()
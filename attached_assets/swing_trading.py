@@ -26,6 +26,13 @@ import json
 # Import our clean implementation from swing_trading_service
 from swing_trading_service import analyze_swing_trading as service_analyze_swing_trading
 from swing_trading_service import analyze_swing_trading_batch as service_analyze_swing_trading_batch
+from swing_trading_service import iter_swing_trading_batch as service_iter_swing_trading_batch
+from swing_trading_service import analyze_swing_trading_multi as service_analyze_swing_trading_multi
+from swing_trading_service import TIMEFRAMES
+from batch_stream import requested_stream_format, stream_batch
+from stage_timing import histograms as stage_histograms
+from scan_jobs import scan_jobs
+from screener import screener
 
 # Configure logging
 logging.basicConfig(
@@ -238,13 +245,14 @@ def calculate_percentage_change(current, reference):
     """
     return ((current - reference) / reference) * 100
 
-def analyze_swing_trading(ticker, timeframe='short'):
+def analyze_swing_trading(ticker, timeframe='short', timings=False):
     """
     Perform swing trading analysis for a given ticker.
     
     Args:
         ticker (str): Stock ticker symbol
         timeframe (str): Trading timeframe ('short', 'medium', 'long')
+        timings (bool): Add the per-stage breakdown as a "_timings" field
         
     Returns:
         dict: Analysis results
@@ -253,7 +261,7 @@ def analyze_swing_trading(ticker, timeframe='short'):
         logger.info(f"Starting swing trading analysis for {ticker}, timeframe: {timeframe}")
         
         # Call the service implementation
-        return service_analyze_swing_trading(ticker, timeframe)
+        return service_analyze_swing_trading(ticker, timeframe, timings=timings)
         
         # Get current price
         current_price = history['Close'].iloc[-1]
@@ -623,19 +631,81 @@ def analyze_swing_trading(ticker, timeframe='short'):
         logger.error(traceback.format_exc())
         return {"error": str(e)}
 
-def analyze_tickers(tickers, timeframe='short'):
+def analyze_tickers(tickers, timeframe='short', timings=False):
     """
     Analyze multiple tickers for swing trading.
     
     Args:
         tickers (list): List of stock ticker symbols
         timeframe (str): Trading timeframe ('short', 'medium', 'long')
+        timings (bool): Add each ticker's per-stage breakdown as a "_timings" field
         
     Returns:
         list: List of analysis results for each ticker
     """
     # Call the service implementation
-    return service_analyze_swing_trading_batch(tickers, timeframe)
+    return service_analyze_swing_trading_batch(tickers, timeframe, timings)
+
+def analyze_timeframes(ticker, timeframes=TIMEFRAMES, timings=False):
+    """
+    Analyze a ticker for several timeframes from a single history fetch.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        timeframes (iterable): Timeframes to analyze ('short', 'medium', 'long')
+        timings (bool): Add the per-stage breakdown as a "_timings" field
+        
+    Returns:
+        dict: {"ticker", "company_name", "timeframes": {timeframe: analysis}}
+    """
+    return service_analyze_swing_trading_multi(ticker, timeframes, timings=timings)
+
+def requested_timeframes(args):
+    """
+    Get the timeframes of a multi-timeframe request.
+    
+    Args:
+        args: Request query arguments
+        
+    Returns:
+        list: Timeframes from ?timeframes=short,long (or all of them for
+              ?timeframe=all), or None for a single-timeframe request
+    """
+    timeframes = args.get('timeframes')
+    if timeframes:
+        return [tf.strip() for tf in timeframes.split(',') if tf.strip()]
+    if args.get('timeframe', '').lower().strip() == 'all':
+        return list(TIMEFRAMES)
+    return None
+
+def requested_timings(args, data=None):
+    """
+    Check whether the client asked for the per-stage "_timings" breakdown.
+    
+    Args:
+        args: Request query arguments (?timings=true)
+        data (dict, optional): Request JSON body ({"timings": true})
+        
+    Returns:
+        bool: True if timings were requested
+    """
+    if data and isinstance(data.get('timings'), bool):
+        return data['timings']
+    return args.get('timings', '').lower() in ('1', 'true', 'yes')
+
+def iter_analyze_tickers(tickers, timeframe='short', timings=False):
+    """
+    Analyze multiple tickers for swing trading, yielding results as they finish.
+    
+    Args:
+        tickers (list): List of stock ticker symbols
+        timeframe (str): Trading timeframe ('short', 'medium', 'long')
+        timings (bool): Add each ticker's per-stage breakdown as a "_timings" field
+        
+    Yields:
+        tuple: (index, ticker, analysis result, error message or None)
+    """
+    return service_iter_swing_trading_batch(tickers, timeframe, timings)
 
 def create_app():
     """
@@ -652,13 +722,20 @@ def create_app():
         """
         API endpoint for swing trading analysis.
         
+        Query Parameters:
+            stream (str, optional): true/ndjson or sse to stream results as they finish
+                (also selected by Accept: application/x-ndjson or text/event-stream)
+            timings (str, optional): true to add each ticker's per-stage "_timings"
+                (also {"timings": true} in the request body)
+        
         Returns:
-            JSON: Analysis results
+            JSON: Analysis results, or a stream of result records ending with a summary
         """
         try:
             data = request.json
             tickers = data.get('tickers', [])
             timeframe = data.get('timeframe', 'short')
+            timings = requested_timings(request.args, data)
             
             # Normalize timeframe for consistency
             timeframe = timeframe.lower().strip()
@@ -676,13 +753,30 @@ def create_app():
             if not tickers:
                 return jsonify({"error": "No tickers provided"}), 400
             
-            results = analyze_tickers(tickers, timeframe)
+            # Stream each ticker's analysis as it completes (NDJSON or SSE) when requested
+            stream_format = requested_stream_format()
+            if stream_format:
+                return stream_batch(iter_analyze_tickers(tickers, timeframe, timings), stream_format,
+                                    label="Swing trading stream")
+            
+            results = analyze_tickers(tickers, timeframe, timings)
             return jsonify(results)
         
         except Exception as e:
             logger.error(f"Error in swing trading endpoint: {e}")
             return jsonify({"error": str(e)}), 500
     
+    @app.route('/api/metrics', methods=['GET'])
+    def metrics():
+        """
+        Get the swing trading stage latency histograms and upstream call totals
+        of this worker.
+        
+        Returns:
+            JSON: Per-stage histograms and upstream call counters
+        """
+        return jsonify({"stage_timings": stage_histograms.stats()})
+    
     @app.route('/api/swing-trading/<ticker>', methods=['GET'])
     def swing_trading_single(ticker):
         """
@@ -691,10 +785,23 @@ def create_app():
         Args:
             ticker (str): Stock ticker symbol
             
+        Query Parameters:
+            timeframe (str, optional): 'short', 'medium', 'long' or 'all'
+            timeframes (str, optional): Comma-separated timeframes analyzed together
+                from one history fetch
+            timings (str, optional): true to add the per-stage "_timings" breakdown
+            
         Returns:
-            JSON: Analysis results
+            JSON: Analysis results (keyed by timeframe for multi-timeframe requests)
         """
         try:
+            timings = requested_timings(request.args)
+            
+            # All requested timeframes from one history fetch and one indicator pass
+            timeframes = requested_timeframes(request.args)
+            if timeframes:
+                return jsonify(analyze_timeframes(ticker, timeframes, timings))
+            
             timeframe = request.args.get('timeframe', 'short')
             
             # Normalize timeframe for consistency
@@ -710,7 +817,7 @@ def create_app():
                 
             logger.info(f"Analyzing ticker {ticker} with normalized timeframe: {timeframe}")
             
-            result = analyze_swing_trading(ticker, timeframe)
+            result = analyze_swing_trading(ticker, timeframe, timings)
             return jsonify(result)
         
         except Exception as e:
@@ -727,6 +834,12 @@ def create_app():
             logger.error(f"Error in swing trading endpoint: {e}")
             return jsonify({"error": str(e)}), 500
     
+    # Index-wide scans run as background jobs (submit, poll, page results, cancel)
+    app.register_blueprint(scan_jobs)
+    
+    # Queries over the precomputed end-of-day score table
+    app.register_blueprint(screener)
+    
     return app
 
 # Create Flask app
@@ -29,6 +29,14 @@ import json
 import random
 import datetime
 from nsepython import equity_history, nse_eq, indices
+from market_data import download_history_batch, is_indian_ticker, to_yahoo_ticker
+from ohlcv_store import get_history as get_ohlcv_history, slice_history
+from indicator_memo import memo as indicator_memo
+from indicator_engine import screen_histories
+from batch_executor import executor as batch_executor
+import stage_timing
+from stage_timing import stage, count_call
+import functools
 
 # Configure logging
 logging.basicConfig(
@@ -41,52 +49,177 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-def analyze_swing_trading_batch(tickers, timeframe='short'):
+# Timeframes returned by the multi-timeframe analysis
+TIMEFRAMES = ('short', 'medium', 'long')
+
+# Weights of the technical sub-scores in the overall technical score
+INDICATOR_WEIGHTS = {
+    "RSI": 0.15,
+    "MACD": 0.2,
+    "ATR": 0.05,
+    "EMA": 0.25,
+    "Fibonacci": 0.1,
+    "BB": 0.1,
+    "MS": 0.15
+}
+
+# Blend of the technical, fundamental and news scores in the combined score
+COMBINED_WEIGHTS = {"technical": 0.80, "fundamental": 0.15, "news": 0.05}
+
+# Combined score thresholds of the Buy and DBuy (don't buy) signals
+BUY_THRESHOLD = 70
+DBUY_THRESHOLD = 30
+
+def analyze_swing_trading_batch(tickers, timeframe='short', timings=False):
     """
     Process a batch of tickers for swing trading analysis.
     
+    Historical data for the whole batch is acquired up front with one bulk
+    download per provider group, and each ticker's analysis receives its
+    pre-sliced DataFrame instead of issuing its own history request. The
+    per-ticker analyses then run in parallel on the batch executor.
+    
     Args:
         tickers (list): List of ticker symbols
         timeframe (str): Trading timeframe ('short', 'medium', 'long')
+        timings (bool): Add each ticker's per-stage breakdown as a "_timings" field
         
     Returns:
-        list: List of analysis results
+        list: List of analysis results, in request order (failed or timed-out
+              tickers are returned as {"ticker", "error"} entries)
+    """
+    results = [None] * len(tickers)
+    for index, _, result, _ in iter_swing_trading_batch(tickers, timeframe, timings):
+        results[index] = result
+    return results
+
+def iter_swing_trading_batch(tickers, timeframe='short', timings=False):
     """
-    results = []
+    Analyze a batch of tickers, yielding each result as soon as it is ready.
     
-    # Iterate over each ticker and analyze
+    Args:
+        tickers (list): List of ticker symbols
+        timeframe (str): Trading timeframe ('short', 'medium', 'long')
+        timings (bool): Add each ticker's per-stage breakdown as a "_timings" field
+            (the shared bulk download and indicator stages are only recorded in
+            the process-wide histograms)
+        
+    Yields:
+        tuple: (index in tickers, ticker symbol, analysis result, error message or
+               None), in completion order
+    """
+    # Normalize ticker inputs before the batch data-acquisition stage
+    ticker_symbols = []
     for ticker in tickers:
-        try:
-            # Handle case where ticker might be a dictionary or other object
-            if isinstance(ticker, dict) and 'symbol' in ticker:
-                ticker_symbol = ticker['symbol']
-            elif not isinstance(ticker, str):
-                ticker_symbol = str(ticker)
-            else:
-                ticker_symbol = ticker
-                
-            # Get analysis for single ticker
-            result = analyze_swing_trading(ticker_symbol, timeframe)
-            results.append(result)
-        except Exception as e:
-            logger.error(f"Error analyzing {ticker}: {e}")
-            logger.error(traceback.format_exc())
-            # Append error information
-            results.append({"ticker": ticker, "error": str(e)})
+        # Handle case where ticker might be a dictionary or other object
+        if isinstance(ticker, dict) and 'symbol' in ticker:
+            ticker_symbols.append(ticker['symbol'])
+        elif not isinstance(ticker, str):
+            ticker_symbols.append(str(ticker))
+        else:
+            ticker_symbols.append(ticker)
     
-    return results
+    # Fetch history for all tickers in bulk; missing tickers fall back to a per-ticker fetch
+    period, _ = resolve_timeframe_period(timeframe)
+    try:
+        with stage("batch.history_download"):
+            histories = download_history_batch(ticker_symbols, period=period, interval="1d")
+    except Exception as e:
+        logger.error(f"Bulk history download failed, falling back to per-ticker fetch: {e}")
+        histories = {}
+    
+    # Compute the latest indicator values for the whole batch in one vectorized pass,
+    # reusing memoized values for tickers whose history has not changed (large
+    # batches are split across the process pool when one is configured)
+    def compute_indicators(missing, params):
+        return batch_executor.run_chunked(functools.partial(screen_histories, params=params), missing)
+    
+    try:
+        with stage("batch.indicators"):
+            indicators = indicator_memo.latest_values_batch(histories, compute=compute_indicators)
+    except Exception as e:
+        logger.error(f"Vectorized indicator computation failed, computing per ticker: {e}")
+        indicators = {}
+    
+    # Analyze the tickers in parallel (company info, news and fundamentals are network
+    # bound); failures and timeouts are reported per ticker
+    def analyze(ticker_symbol):
+        return analyze_swing_trading(ticker_symbol, timeframe, hist=histories.get(ticker_symbol),
+                                     indicators=indicators.get(ticker_symbol), timings=timings)
+    
+    for index, result, error in batch_executor.iter_completed(analyze, ticker_symbols,
+                                                              label=f"Swing trading batch ({timeframe})"):
+        yield index, ticker_symbols[index], result, error
+
+def resolve_timeframe_period(timeframe):
+    """
+    Map a trading timeframe to the history period used for analysis.
+    
+    Args:
+        timeframe (str): Trading timeframe ('short', 'medium', 'long')
+        
+    Returns:
+        tuple: (Yahoo Finance period, normalized timeframe)
+    """
+    # Normalize timeframe to handle case sensitivity and string variations
+    timeframe_str = str(timeframe).lower().strip() if timeframe else "short-term"
+    
+    # Handle various timeframe formats including those with hyphens
+    if "short" in timeframe_str or "short-term" in timeframe_str:
+        return "60d", "short"  # 60 days for short-term
+    elif "medium" in timeframe_str or "medium-term" in timeframe_str:
+        return "120d", "medium"  # 120 days for medium-term
+    elif "long" in timeframe_str or "long-term" in timeframe_str:
+        return "250d", "long"  # 250 days for long-term
+    
+    # Default to short-term if unrecognized
+    logger.warning(f"UNKNOWN timeframe '{timeframe}', using SHORT-TERM (60d) as default")
+    return "60d", "short"
 
-def analyze_swing_trading(ticker, timeframe='short'):
+def nse_history_period(timeframe):
+    """
+    Map a trading timeframe to the period of the nsepython history.
+    
+    Same as resolve_timeframe_period, except that unrecognized timeframes fetch the
+    long-term window (250d) from NSE, as the NSE path always has.
+    
+    Args:
+        timeframe (str): Trading timeframe ('short', 'medium', 'long')
+        
+    Returns:
+        str: History period
+    """
+    timeframe_str = str(timeframe).lower().strip() if timeframe else "short-term"
+    if "short" in timeframe_str or "medium" in timeframe_str:
+        return resolve_timeframe_period(timeframe)[0]
+    return "250d"
+
+def analyze_swing_trading(ticker, timeframe='short', hist=None, indicators=None, timings=False):
     """
     Analyze a single ticker for swing trading opportunities.
     
+    Stage durations and upstream calls are always recorded in the process-wide
+    stage_timing histograms.
+    
     Args:
         ticker (str): Stock ticker symbol
         timeframe (str): Trading timeframe ('short', 'medium', 'long')
+        hist (pd.DataFrame, optional): Pre-fetched OHLCV history. When provided
+            (e.g. from a batch download), no history request is made.
+        indicators (dict, optional): Latest indicator values for hist, computed
+            by the vectorized indicator engine for the whole batch
+        timings (bool): Add the per-stage breakdown as a "_timings" field
         
     Returns:
         dict: Analysis results including signals and indicators
     """
+    with stage_timing.track(ticker) as timer:
+        result = _analyze_swing_trading(ticker, timeframe, hist, indicators)
+    if timings and isinstance(result, dict):
+        result["_timings"] = timer.as_dict()
+    return result
+
+def _analyze_swing_trading(ticker, timeframe, hist, indicators):
     try:
         logger.info(f"Starting swing trading analysis for ticker {ticker} with timeframe {timeframe}")
         
@@ -95,217 +228,339 @@ def analyze_swing_trading(ticker, timeframe='short'):
             ticker = str(ticker)
         
         # Normalize timeframe to handle case sensitivity and string variations
-        timeframe_str = str(timeframe).lower().strip() if timeframe else "short-term"
-        
-        # Improved timeframe handling with better pattern matching
-        # Add extensive logging to help identify issues
         logger.info(f"Original timeframe value: '{timeframe}'")
-        logger.info(f"Normalized timeframe string: '{timeframe_str}'")
-        
-        # Handle various timeframe formats including those with hyphens
-        if "short" in timeframe_str or "short-term" in timeframe_str:
-            period = "60d"  # 60 days for short-term
-            timeframe_lower = "short"
-            logger.info(f"Identified as SHORT-TERM, using period={period} for ticker {ticker}")
-        elif "medium" in timeframe_str or "medium-term" in timeframe_str:
-            period = "120d"  # 120 days for medium-term
-            timeframe_lower = "medium"
-            logger.info(f"Identified as MEDIUM-TERM, using period={period} for ticker {ticker}")
-        elif "long" in timeframe_str or "long-term" in timeframe_str:
-            period = "250d"  # 250 days for long-term
-            timeframe_lower = "long"
-            logger.info(f"Identified as LONG-TERM, using period={period} for ticker {ticker}")
-        else:
-            # Default to short-term if unrecognized
-            logger.warning(f"UNKNOWN timeframe '{timeframe}', using SHORT-TERM (60d) as default")
-            period = "60d"
-            timeframe_lower = "short"
+        period, timeframe_lower = resolve_timeframe_period(timeframe)
+        logger.info(f"Identified as {timeframe_lower.upper()}-TERM, using period={period} for ticker {ticker}")
         
         interval = "1d"  # Daily data
         
-        # Check if ticker is an Indian stock (NSE)
-        is_indian_stock = ticker in ["RELIANCE", "TCS", "HDFCBANK", "ICICIBANK", "SBIN", 
-                                     "BHARTIARTL", "ITC", "KOTAKBANK", "HCLTECH", "HINDUNILVR", 
-                                     "MARUTI", "ONGC", "TATAMOTORS", "ADANIPORTS"] or ticker.endswith(".NS")
-        
         # Ensure NSE tickers have .NS suffix for Yahoo Finance
-        yahoo_ticker = ticker
-        if is_indian_stock and not ticker.endswith(".NS"):
-            yahoo_ticker = f"{ticker}.NS"
+        yahoo_ticker = to_yahoo_ticker(ticker)
+        if yahoo_ticker != ticker:
             logger.info(f"Adding .NS suffix to Indian stock: {ticker} -> {yahoo_ticker}")
         
+        stock = yf.Ticker(yahoo_ticker)
+        
         # Get historical data
-        if is_indian_stock:
-            try:
-                # Try to get data from NSE Python
-                symbol = ticker.replace(".NS", "")
-                logger.info(f"Getting data for Indian stock {symbol} using nsepython")
-                
-                # For NSE stocks, fetch data using nsepython's equity_history
-                # We'll create a DataFrame similar to what yfinance returns
-                import datetime as dt
-                
-                # Calculate from_date based on timeframe
-                # Use the already normalized timeframe_str from above
-                timeframe_str_local = str(timeframe).lower().strip() if timeframe else "short-term"
-                logger.info(f"NSE data timeframe local: '{timeframe_str_local}'")
-                
-                if "short" in timeframe_str_local or "short-term" in timeframe_str_local:
-                    days_back = 60
-                    logger.info(f"Using short-term (60 days) for NSE data")
-                elif "medium" in timeframe_str_local or "medium-term" in timeframe_str_local:
-                    days_back = 120
-                    logger.info(f"Using medium-term (120 days) for NSE data")
-                else:
-                    days_back = 250
-                    logger.info(f"Using long-term (250 days) for NSE data")
-                
-                from_date = (dt.datetime.now() - dt.timedelta(days=days_back)).strftime('%d-%b-%Y')
-                to_date = dt.datetime.now().strftime('%d-%b-%Y')
-                
-                # Get stock data from NSE
-                try:
-                    nse_data = equity_history(symbol=symbol, from_date=from_date, to_date=to_date)
-                    
-                    # Convert NSE data to format similar to yfinance
-                    hist = pd.DataFrame()
-                    
-                    if nse_data is not None and not nse_data.empty:
-                        hist['Open'] = nse_data['OPEN']
-                        hist['High'] = nse_data['HIGH'] 
-                        hist['Low'] = nse_data['LOW']
-                        hist['Close'] = nse_data['CLOSE']
-                        hist['Volume'] = nse_data['VOLUME']
-                        hist.index = pd.to_datetime(nse_data['DATE'])
-                    else:
-                        # Fallback to Yahoo Finance if NSE data is empty
-                        logger.warning(f"NSE data empty for {symbol}, falling back to Yahoo Finance")
-                        stock = yf.Ticker(yahoo_ticker)
-                        hist = stock.history(period=period, interval=interval)
-                except Exception as e:
-                    logger.error(f"Error fetching NSE data for {symbol}: {e}")
-                    # Fallback to Yahoo Finance
-                    stock = yf.Ticker(yahoo_ticker)
-                    hist = stock.history(period=period, interval=interval)
-            except Exception as e:
-                logger.error(f"Error with NSE Python for {ticker}: {e}")
-                # Fallback to Yahoo Finance
-                stock = yf.Ticker(yahoo_ticker)
-                hist = stock.history(period=period, interval=interval)
+        if hist is not None and not hist.empty:
+            logger.info(f"Using pre-fetched history for {ticker} ({len(hist)} bars)")
         else:
-            # For non-Indian stocks, use Yahoo Finance
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period=period, interval=interval)
+            with stage("history"):
+                hist = fetch_analysis_history(ticker, period, interval,
+                                              nse_period=nse_history_period(timeframe))
         
         if hist.empty:
             return {"ticker": ticker, "error": "No historical data available"}
         
         # Get company info
-        try:
-            company_name = stock.info.get('shortName', ticker)
-        except:
-            company_name = ticker
+        company_name = fetch_company_name(stock, ticker)
+        
+        # Add news sentiment (simplified) and fundamental score (simplified)
+        with stage("news"):
+            news_sentiment = analyze_news_sentiment(ticker)
+        with stage("fundamentals"):
+            fundamental_analysis = analyze_fundamentals(stock)
+        
+        return build_swing_analysis(ticker, timeframe, hist, indicators, company_name,
+                                    fundamental_analysis, news_sentiment)
+        
+    except Exception as e:
+        logger.error(f"Error in swing trading analysis for {ticker}: {e}")
+        logger.error(traceback.format_exc())
+        return {"ticker": ticker, "error": str(e)}
+
+def analyze_swing_trading_multi(ticker, timeframes=TIMEFRAMES, hist=None, timings=False):
+    """
+    Analyze a single ticker for several timeframes in one call.
+    
+    The history of the longest timeframe is fetched once and sliced to each
+    timeframe's period, and company info, fundamentals and news are fetched once.
+    Indicators are computed over each timeframe's slice, like the single-timeframe
+    analysis of that timeframe.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        timeframes (iterable): Timeframes to analyze ('short', 'medium', 'long')
+        hist (pd.DataFrame, optional): Pre-fetched OHLCV history covering the
+            longest timeframe
+        timings (bool): Add the per-stage breakdown as a "_timings" field
+        
+    Returns:
+        dict: {"ticker", "company_name", "timeframes": {timeframe: analysis}}
+    """
+    with stage_timing.track(ticker, name="analysis_multi") as timer:
+        result = _analyze_swing_trading_multi(ticker, timeframes, hist)
+    if timings and isinstance(result, dict):
+        result["_timings"] = timer.as_dict()
+    return result
+
+def _analyze_swing_trading_multi(ticker, timeframes, hist):
+    try:
+        if not isinstance(ticker, str):
+            ticker = str(ticker)
+        
+        # Normalized timeframe to history period, in request order
+        resolved = dict(resolve_timeframe_period(tf)[::-1] for tf in timeframes)
+        if not resolved:
+            return {"ticker": ticker, "error": "No timeframes requested"}
+        longest = max(resolved.values(), key=lambda period: int(period.rstrip("d")))
+        logger.info(f"Multi-timeframe analysis for {ticker}: {list(resolved)} from one {longest} history")
+        
+        stock = yf.Ticker(to_yahoo_ticker(ticker))
+        if hist is None or hist.empty:
+            with stage("history"):
+                hist = fetch_analysis_history(ticker, longest)
+        if hist.empty:
+            return {"ticker": ticker, "error": "No historical data available"}
+        
+        company_name = fetch_company_name(stock, ticker)
+        with stage("news"):
+            news_sentiment = analyze_news_sentiment(ticker)
+        with stage("fundamentals"):
+            fundamental_analysis = analyze_fundamentals(stock)
         
-        # Analyze technical indicators
-        analysis = analyze_technical_indicators(hist, ticker, timeframe)
+        # Indicators are computed over each timeframe's own window (memoized per
+        # window), so every timeframe matches the single-timeframe analysis
+        analyses = {}
+        for timeframe, period in resolved.items():
+            window = slice_history(hist, period)
+            if window.empty:
+                window = hist
+            analyses[timeframe] = build_swing_analysis(ticker, timeframe, window, None, company_name,
+                                                       fundamental_analysis, news_sentiment)
         
-        # Add company and ticker info
-        analysis["ticker"] = ticker
-        analysis["company_name"] = company_name
+        return {"ticker": ticker, "company_name": company_name, "timeframes": analyses}
+    
+    except Exception as e:
+        logger.error(f"Error in multi-timeframe swing trading analysis for {ticker}: {e}")
+        logger.error(traceback.format_exc())
+        return {"ticker": ticker, "error": str(e)}
+
+def count_info_fetch(stock):
+    """
+    Count a Yahoo Finance info request, unless the Ticker already holds the info.
+    
+    yfinance caches Ticker.info after the first request, so the company name and
+    the fundamentals of one analysis share a single upstream call.
+    
+    Args:
+        stock (yf.Ticker): Yahoo Finance Ticker object
+    """
+    quote = getattr(stock, "_quote", None)
+    if getattr(quote, "_info", None) is None:
+        count_call("yahoo_info")
+
+def fetch_company_name(stock, ticker):
+    """
+    Get a company's short name from Yahoo Finance.
+    
+    Args:
+        stock (yf.Ticker): Yahoo Finance Ticker object
+        ticker (str): Stock ticker symbol (returned if the lookup fails)
         
-        # Generate sample prediction data (this would be replaced with actual ML model predictions)
+    Returns:
+        str: Company name
+    """
+    count_info_fetch(stock)
+    with stage("company_info"):
         try:
-            current_price = hist['Close'].iloc[-1]
-            if not isinstance(current_price, (int, float)) or math.isnan(current_price):
-                logger.warning(f"Invalid current price for {ticker}: {current_price}, using default value")
-                current_price = 100.0  # Default fallback value
+            return stock.info.get('shortName', ticker)
+        except:
+            return ticker
+
+def fetch_analysis_history(ticker, period, interval="1d", nse_period=None):
+    """
+    Fetch the daily history used by the swing trading analysis.
+    
+    NSE stocks are fetched through nsepython first; everything else (and any NSE
+    failure) goes through the local OHLCV store backed by Yahoo Finance.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        period (str): History period (e.g. 60d, 120d, 250d)
+        interval (str): Bar interval (default: 1d)
+        nse_period (str, optional): Period of the nsepython history (default: period)
+        
+    Returns:
+        pd.DataFrame: OHLCV history (may be empty)
+    """
+    yahoo_ticker = to_yahoo_ticker(ticker)
+    hist = pd.DataFrame()
+    if is_indian_ticker(ticker):
+        try:
+            # Try to get data from NSE Python
+            symbol = ticker.replace(".NS", "")
+            logger.info(f"Getting data for Indian stock {symbol} using nsepython")
             
-            # Generate prediction dates
-            try:
-                analysis["prediction_dates"] = generate_future_dates(timeframe)
-            except Exception as e:
-                logger.error(f"Error generating prediction dates for {ticker}: {e}")
-                # Provide default dates
-                today = datetime.date.today()
-                dates = []
-                for i in range(1, 6):  # Default to 5 days
-                    future_date = today + datetime.timedelta(days=i)
-                    dates.append(future_date.strftime("%Y-%m-%d"))
-                analysis["prediction_dates"] = dates
+            # For NSE stocks, fetch data using nsepython's equity_history
+            # We'll create a DataFrame similar to what yfinance returns
+            import datetime as dt
+            
+            # Calculate from_date based on the requested period
+            days_back = int((nse_period or period).rstrip("d"))
+            logger.info(f"Using {days_back} days of NSE data")
+            
+            from_date = (dt.datetime.now() - dt.timedelta(days=days_back)).strftime('%d-%b-%Y')
+            to_date = dt.datetime.now().strftime('%d-%b-%Y')
             
-            # Generate prediction prices
+            # Get stock data from NSE
             try:
-                overall_ta_score = analysis.get("overall_ta_score", 50)  # Default to neutral if not available
-                analysis["prediction_prices"] = generate_prediction_prices(current_price, overall_ta_score, timeframe)
+                count_call("nse_history")
+                with stage("history.nsepython"):
+                    nse_data = equity_history(symbol=symbol, from_date=from_date, to_date=to_date)
+                
+                # Convert NSE data to format similar to yfinance
+                hist = pd.DataFrame()
+                
+                if nse_data is not None and not nse_data.empty:
+                    hist['Open'] = nse_data['OPEN']
+                    hist['High'] = nse_data['HIGH'] 
+                    hist['Low'] = nse_data['LOW']
+                    hist['Close'] = nse_data['CLOSE']
+                    hist['Volume'] = nse_data['VOLUME']
+                    hist.index = pd.to_datetime(nse_data['DATE'])
+                else:
+                    # Fallback to Yahoo Finance if NSE data is empty
+                    logger.warning(f"NSE data empty for {symbol}, falling back to Yahoo Finance")
+                    hist = get_ohlcv_history(yahoo_ticker, period, interval)
             except Exception as e:
-                logger.error(f"Error generating prediction prices for {ticker}: {e}")
-                # Provide default prices
-                analysis["prediction_prices"] = [current_price] * len(analysis["prediction_dates"])
+                logger.error(f"Error fetching NSE data for {symbol}: {e}")
+                # Fallback to Yahoo Finance
+                hist = get_ohlcv_history(yahoo_ticker, period, interval)
         except Exception as e:
-            logger.error(f"Error in prediction generation: {e}")
-            # Set default prediction data if outer try block fails
+            logger.error(f"Error with NSE Python for {ticker}: {e}")
+            # Fallback to Yahoo Finance
+            hist = get_ohlcv_history(yahoo_ticker, period, interval)
+    else:
+        # For non-Indian stocks, use Yahoo Finance
+        hist = get_ohlcv_history(yahoo_ticker, period, interval)
+    
+    return hist
+
+def build_swing_analysis(ticker, timeframe, hist, indicators, company_name, fundamental_analysis, news_sentiment):
+    """
+    Build the swing trading analysis of one ticker for one timeframe from data that
+    has already been acquired.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        timeframe (str): Trading timeframe ('short', 'medium', 'long')
+        hist (pd.DataFrame): OHLCV history for the timeframe's period
+        indicators (dict, optional): Latest indicator values (computed from hist if None)
+        company_name (str): Company name
+        fundamental_analysis (dict): Result of analyze_fundamentals
+        news_sentiment (dict): Result of analyze_news_sentiment
+        
+    Returns:
+        dict: Analysis results including signals and indicators
+    """
+    # Analyze technical indicators
+    with stage("technical_indicators"):
+        analysis = analyze_technical_indicators(hist, ticker, timeframe, latest=indicators)
+    
+    # Add company and ticker info
+    analysis["ticker"] = ticker
+    analysis["company_name"] = company_name
+    
+    # Generate sample prediction data (this would be replaced with actual ML model predictions)
+    try:
+        current_price = hist['Close'].iloc[-1]
+        if not isinstance(current_price, (int, float)) or math.isnan(current_price):
+            logger.warning(f"Invalid current price for {ticker}: {current_price}, using default value")
+            current_price = 100.0  # Default fallback value
+        
+        # Generate prediction dates
+        try:
+            analysis["prediction_dates"] = generate_future_dates(timeframe)
+        except Exception as e:
+            logger.error(f"Error generating prediction dates for {ticker}: {e}")
+            # Provide default dates
             today = datetime.date.today()
             dates = []
             for i in range(1, 6):  # Default to 5 days
                 future_date = today + datetime.timedelta(days=i)
                 dates.append(future_date.strftime("%Y-%m-%d"))
             analysis["prediction_dates"] = dates
-            analysis["prediction_prices"] = [100.0] * 5  # Default prices
         
-        # Add stop loss and take profit targets
+        # Generate prediction prices
         try:
-            volatility = hist['Close'].pct_change().std() * 100
-            if math.isnan(volatility):
-                volatility = 2.0  # Default volatility if calculation fails
+            overall_ta_score = analysis.get("overall_ta_score", 50)  # Default to neutral if not available
+            analysis["prediction_prices"] = generate_prediction_prices(current_price, overall_ta_score, timeframe)
         except Exception as e:
-            logger.error(f"Error calculating volatility: {e}")
-            volatility = 2.0  # Default volatility
-        
-        # Make sure current_price is defined
-        if 'current_price' not in locals() or not isinstance(current_price, (int, float)) or math.isnan(current_price):
-            current_price = 100.0  # Default price if not set in try block
-            
-        analysis["stoploss"] = round(current_price * (1 - volatility / 100), 2)
-        analysis["takeprofit"] = round(current_price * (1 + 2 * volatility / 100), 2)
-        
-        # Add news sentiment (simplified)
-        news_sentiment = analyze_news_sentiment(ticker)
-        analysis["news"] = news_sentiment["news"]
-        analysis["news_sentiment_score"] = news_sentiment["score"]
-        
-        # Calculate fundamental score (simplified)
-        fundamental_analysis = analyze_fundamentals(stock)
-        analysis["fundamental_analysis"] = fundamental_analysis
-        
-        # Calculate combined score (80% technical, 15% fundamental, 5% news)
-        technical_weight = 0.80
-        fundamental_weight = 0.15
-        news_weight = 0.05
-        
-        combined_score = (
-            technical_weight * analysis["overall_ta_score"] +
-            fundamental_weight * fundamental_analysis["overall_fa_score"] +
-            news_weight * news_sentiment["score"]
-        )
-        
-        analysis["combined_overall_score"] = round(combined_score, 2)
-        
-        # Determine combined signal
-        if combined_score >= 70:
-            analysis["combined_overall_signal"] = "Buy"
-        elif combined_score <= 30:
-            analysis["combined_overall_signal"] = "DBuy"  # Don't Buy
-        else:
-            analysis["combined_overall_signal"] = "Neutral"
+            logger.error(f"Error generating prediction prices for {ticker}: {e}")
+            # Provide default prices
+            analysis["prediction_prices"] = [current_price] * len(analysis["prediction_dates"])
+    except Exception as e:
+        logger.error(f"Error in prediction generation: {e}")
+        # Set default prediction data if outer try block fails
+        today = datetime.date.today()
+        dates = []
+        for i in range(1, 6):  # Default to 5 days
+            future_date = today + datetime.timedelta(days=i)
+            dates.append(future_date.strftime("%Y-%m-%d"))
+        analysis["prediction_dates"] = dates
+        analysis["prediction_prices"] = [100.0] * 5  # Default prices
+    
+    # Add stop loss and take profit targets
+    try:
+        volatility = hist['Close'].pct_change().std() * 100
+        if math.isnan(volatility):
+            volatility = 2.0  # Default volatility if calculation fails
+    except Exception as e:
+        logger.error(f"Error calculating volatility: {e}")
+        volatility = 2.0  # Default volatility
+    
+    # Make sure current_price is defined
+    if 'current_price' not in locals() or not isinstance(current_price, (int, float)) or math.isnan(current_price):
+        current_price = 100.0  # Default price if not set in try block
         
-        return analysis
+    analysis["stoploss"] = round(current_price * (1 - volatility / 100), 2)
+    analysis["takeprofit"] = round(current_price * (1 + 2 * volatility / 100), 2)
+    
+    # Add news sentiment
+    analysis["news"] = news_sentiment["news"]
+    analysis["news_sentiment_score"] = news_sentiment["score"]
+    
+    # Add fundamental analysis
+    analysis["fundamental_analysis"] = fundamental_analysis
+    
+    # Calculate combined score and signal
+    combined_score, combined_signal = combine_scores(analysis["overall_ta_score"],
+                                                     fundamental_analysis["overall_fa_score"],
+                                                     news_sentiment["score"])
+    analysis["combined_overall_score"] = combined_score
+    analysis["combined_overall_signal"] = combined_signal
+    
+    return analysis
+
+def combine_scores(ta_score, fa_score, news_score):
+    """
+    Combine the technical, fundamental and news scores (80% technical,
+    15% fundamental, 5% news).
+    
+    Args:
+        ta_score (float): Overall technical analysis score (0-100)
+        fa_score (float): Overall fundamental analysis score (0-100)
+        news_score (float): News sentiment score (0-100)
         
-    except Exception as e:
-        logger.error(f"Error in swing trading analysis for {ticker}: {e}")
-        logger.error(traceback.format_exc())
-        return {"ticker": ticker, "error": str(e)}
+    Returns:
+        tuple: (combined score rounded to 2 decimals, signal "Buy", "DBuy" or "Neutral")
+    """
+    combined_score = (
+        COMBINED_WEIGHTS["technical"] * ta_score +
+        COMBINED_WEIGHTS["fundamental"] * fa_score +
+        COMBINED_WEIGHTS["news"] * news_score
+    )
+    
+    if combined_score >= BUY_THRESHOLD:
+        signal = "Buy"
+    elif combined_score <= DBUY_THRESHOLD:
+        signal = "DBuy"  # Don't Buy
+    else:
+        signal = "Neutral"
+    return round(combined_score, 2), signal
 
-def analyze_technical_indicators(hist, ticker, timeframe):
+def analyze_technical_indicators(hist, ticker, timeframe, latest=None):
     """
     Calculate and analyze technical indicators for swing trading.
     
@@ -313,46 +568,29 @@ def analyze_technical_indicators(hist, ticker, timeframe):
         hist (pd.DataFrame): Historical price data
         ticker (str): Stock ticker symbol
         timeframe (str): Trading timeframe
+        latest (dict, optional): Latest indicator values already computed for this
+            ticker by the vectorized indicator engine (e.g. for a whole batch)
         
     Returns:
         dict: Technical analysis results
     """
-    # Make a copy of the dataframe to avoid modifying the original
-    df = hist.copy()
-    
-    # Calculate RSI using pandas_ta
-    df.ta.rsi(length=14, append=True)
-    rsi_col = [col for col in df.columns if 'RSI' in col][0]
-    last_rsi = df[rsi_col].iloc[-1]
-    
-    # Calculate MACD using pandas_ta
-    df.ta.macd(fast=12, slow=26, signal=9, append=True)
-    macd_cols = [col for col in df.columns if 'MACD' in col]
-    last_macd = df[macd_cols[0]].iloc[-1]  # MACD
-    last_macd_signal = df[macd_cols[1]].iloc[-1]  # MACDs
-    last_macd_hist = df[macd_cols[2]].iloc[-1]  # MACDh
-    
-    # Calculate ATR using pandas_ta
-    df.ta.atr(length=14, append=True)
-    atr_col = [col for col in df.columns if 'ATR' in col][0]
-    last_atr = df[atr_col].iloc[-1]
-    
-    # Calculate EMAs using pandas_ta
-    df.ta.ema(length=20, append=True)
-    df.ta.ema(length=50, append=True)
-    last_ema_short = df['EMA_20'].iloc[-1]
-    last_ema_long = df['EMA_50'].iloc[-1]
-    
-    # Calculate Bollinger Bands using pandas_ta
-    df.ta.bbands(length=20, std=2, append=True)
-    bb_cols = [col for col in df.columns if 'BBL' in col or 'BBM' in col or 'BBU' in col]
-    last_lower = df[[col for col in bb_cols if 'BBL' in col][0]].iloc[-1]
-    last_middle = df[[col for col in bb_cols if 'BBM' in col][0]].iloc[-1]
-    last_upper = df[[col for col in bb_cols if 'BBU' in col][0]].iloc[-1]
+    if latest is None:
+        latest = indicator_memo.latest_values(ticker, hist)
+    
+    last_rsi = latest["rsi"]
+    last_macd = latest["macd"]
+    last_macd_signal = latest["macd_signal"]
+    last_macd_hist = latest["macd_hist"]
+    last_atr = latest["atr"]
+    last_ema_short = latest["ema_short"]
+    last_ema_long = latest["ema_long"]
+    last_lower = latest["bb_lower"]
+    last_middle = latest["bb_middle"]
+    last_upper = latest["bb_upper"]
     
     # Calculate Fibonacci retracement levels
-    high_price = hist['High'].max()
-    low_price = hist['Low'].min()
+    high_price = latest["period_high"]
+    low_price = latest["period_low"]
     
     fib_levels = {
         "0.0": low_price,
@@ -364,7 +602,7 @@ def analyze_technical_indicators(hist, ticker, timeframe):
         "1.0": high_price
     }
     
-    current_price = hist['Close'].iloc[-1]
+    current_price = latest["close"]
     
     # Analyze technical indicators
     
@@ -448,15 +686,10 @@ def analyze_technical_indicators(hist, ticker, timeframe):
     # Market Structure Analysis (simplified)
     ms_score = 0
     
-    # Calculate highest high and lowest low for last 10 days
-    recent_highs = hist['High'].rolling(window=3).max().diff().iloc[-5:]
-    recent_lows = hist['Low'].rolling(window=3).min().diff().iloc[-5:]
-    
-    # Check if price is making higher highs and higher lows (uptrend)
-    is_uptrend = (recent_highs > 0).all() and (recent_lows > 0).all()
-    
-    # Check if price is making lower highs and lower lows (downtrend)
-    is_downtrend = (recent_highs < 0).all() and (recent_lows < 0).all()
+    # Higher highs and higher lows (uptrend) or lower highs and lower lows (downtrend)
+    # over the last bars, as computed by the indicator engine
+    is_uptrend = latest["is_uptrend"]
+    is_downtrend = latest["is_downtrend"]
     
     if is_uptrend:
         ms_signal = "Buy"
@@ -469,15 +702,7 @@ def analyze_technical_indicators(hist, ticker, timeframe):
         ms_score = 50
     
     # Calculate overall technical score
-    indicator_weights = {
-        "RSI": 0.15,
-        "MACD": 0.2,
-        "ATR": 0.05,
-        "EMA": 0.25,
-        "Fibonacci": 0.1,
-        "BB": 0.1,
-        "MS": 0.15
-    }
+    indicator_weights = INDICATOR_WEIGHTS
     
     overall_ta_score = (
         indicator_weights["RSI"] * rsi_score +
@@ -551,6 +776,7 @@ def analyze_fundamentals(stock):
         dict: Fundamental analysis results
     """
     try:
+        count_info_fetch(stock)
         info = stock.info
         
         # Extract fundamental metrics
@@ -0,0 +1,312 @@
+"""
+PyTrade - Symbol Resolver Module
+
+This module maintains a persistent table that maps bare stock symbols to the Yahoo
+Finance ticker variant that actually returns data (SYMBOL.NS, SYMBOL.BO or the bare
+symbol). Without it, every lookup for a US ticker first probes the .NS and .BO
+variants and waits for them to fail before trying the bare symbol.
+
+The table is pre-seeded from the BSE symbol lists shipped with the project, the
+cached NIFTY constituents and the NSE equity symbol list. Confirmed resolutions are
+written back to disk so that every worker and restart benefits from them. Symbols for
+which no variant returns data are negatively cached for a limited time, per set of
+probed suffixes: a symbol that failed a (.NS, "") probe is still tried as .BO by
+callers that probe BSE.
+
+Key features:
+- Persistent symbol -> Yahoo ticker resolution table
+- Seeding from bse_500_symbols.txt, bse_100_symbols.txt and NSE symbol lists
+- Negative cache with a configurable TTL, keyed by the probed suffix set
+- Transient upstream errors are never cached as failures
+
+Author: PyTrade Development Team
+Version: 1.0.0
+Date: October 17, 2026
+License: Proprietary
+"""
+
+import os
+import json
+import glob
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Constants
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(BASE_DIR)
+RESOLUTION_FILE = os.environ.get(
+    "PYTRADE_SYMBOL_RESOLUTION_FILE",
+    os.path.join(BASE_DIR, "cache", "symbol_resolution.json")
+)
+BSE_SYMBOL_FILES = [
+    os.path.join(PROJECT_DIR, "bse_500_symbols.txt"),
+    os.path.join(PROJECT_DIR, "bse_100_symbols.txt"),
+]
+CONSTITUENTS_DIR = os.path.join(BASE_DIR, "cache", "constituents")
+# Seconds a symbol stays negatively cached after every variant failed
+NEGATIVE_TTL = int(os.environ.get("PYTRADE_SYMBOL_NEGATIVE_TTL", 3600))
+# Minimum delay between writes of the resolution table
+SAVE_DELAY = 5
+
+# Default probe order used by the fetchers
+DEFAULT_SUFFIXES = (".NS", ".BO", "")
+
+
+class SymbolResolver:
+    """
+    Persistent mapping of bare symbols to working Yahoo Finance ticker variants.
+    """
+
+    def __init__(self, path=RESOLUTION_FILE, negative_ttl=NEGATIVE_TTL):
+        self.path = path
+        self.negative_ttl = negative_ttl
+        self._entries = {}
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._save_timer = None
+
+    # ------------------------------------------------------------------
+    # Loading, seeding and persistence
+    # ------------------------------------------------------------------
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            self._seed_from_files()
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, "r") as f:
+                        self._entries.update(json.load(f))
+                except Exception as e:
+                    logger.error(f"Error loading symbol resolution table from {self.path}: {e}")
+            logger.info(f"Symbol resolver loaded with {len(self._entries)} entries")
+
+    def _seed(self, symbol, suffix):
+        symbol = symbol.strip().upper()
+        if symbol and symbol not in self._entries:
+            self._entries[symbol] = {"suffix": suffix, "confirmed": False, "updated": 0}
+
+    def _seed_from_files(self):
+        """Seed Indian symbols from the cached index constituents and the BSE symbol lists."""
+        for path in glob.glob(os.path.join(CONSTITUENTS_DIR, "*.json")):
+            try:
+                with open(path, "r") as f:
+                    for item in json.load(f):
+                        symbol = item.get("symbol", "") if isinstance(item, dict) else ""
+                        for suffix in (".NS", ".BO"):
+                            if symbol.endswith(suffix):
+                                self._seed(symbol[:-len(suffix)], suffix)
+            except Exception as e:
+                logger.warning(f"Could not seed symbols from {path}: {e}")
+
+        for path in BSE_SYMBOL_FILES:
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, "r") as f:
+                    for line in f:
+                        # Most BSE constituents are also listed on NSE, which the fetchers prefer
+                        self._seed(line, ".NS")
+            except Exception as e:
+                logger.warning(f"Could not seed symbols from {path}: {e}")
+
+    def seed_from_nse_list(self):
+        """
+        Seed the table from the live NSE equity symbol list (network call).
+        """
+        try:
+            from utils import get_nse_symbols
+            symbols = get_nse_symbols() or []
+        except Exception as e:
+            logger.warning(f"Could not fetch NSE symbol list for seeding: {e}")
+            return
+        self._ensure_loaded()
+        with self._lock:
+            for item in symbols:
+                symbol = item.get("symbol", "") if isinstance(item, dict) else str(item)
+                self._seed(symbol, ".NS")
+        logger.info(f"Seeded symbol resolver with {len(symbols)} NSE symbols")
+
+    def _schedule_save(self):
+        with self._lock:
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(SAVE_DELAY, self.save)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def save(self):
+        """
+        Write confirmed and negative entries to disk, merging with other workers' writes.
+        """
+        with self._lock:
+            self._save_timer = None
+            entries = {symbol: dict(entry) for symbol, entry in self._entries.items() if entry.get("updated")}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            on_disk = {}
+            if os.path.exists(self.path):
+                with open(self.path, "r") as f:
+                    on_disk = json.load(f)
+            for symbol, entry in entries.items():
+                if entry["updated"] >= on_disk.get(symbol, {}).get("updated", 0):
+                    on_disk[symbol] = entry
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(on_disk, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error saving symbol resolution table to {self.path}: {e}")
+
+    # ------------------------------------------------------------------
+    # Resolution API
+    # ------------------------------------------------------------------
+    def candidates(self, symbol, suffixes=DEFAULT_SUFFIXES):
+        """
+        Get the Yahoo Finance tickers to try for a symbol, best guess first.
+
+        Args:
+            symbol (str): Bare stock symbol
+            suffixes (tuple): Suffixes the caller is willing to probe, in default order
+
+        Returns:
+            list: Yahoo tickers to try (empty while the symbol is negatively cached)
+        """
+        if "." in symbol or symbol.startswith("^"):
+            # Already exchange-qualified (e.g. HSBA.L, TCS.NS) or an index
+            return [symbol]
+
+        self._ensure_loaded()
+        with self._lock:
+            entry = self._entries.get(symbol.upper())
+        ordered = list(suffixes)
+        if entry:
+            failed_at = (entry.get("failed") or {}).get(self._suffix_key(suffixes), 0)
+            if time.time() - failed_at < self.negative_ttl:
+                return []
+            if entry.get("suffix") in ordered:
+                ordered.remove(entry["suffix"])
+                ordered.insert(0, entry["suffix"])
+        return [f"{symbol}{suffix}" for suffix in ordered]
+
+    def is_confirmed(self, symbol):
+        """
+        Check whether a symbol's working ticker variant has been confirmed.
+
+        Args:
+            symbol (str): Bare stock symbol
+
+        Returns:
+            bool: True for confirmed and exchange-qualified symbols, False for
+                seeded guesses and unknown symbols
+        """
+        if "." in symbol or symbol.startswith("^"):
+            return True
+        self._ensure_loaded()
+        with self._lock:
+            entry = self._entries.get(symbol.upper()) or {}
+        return bool(entry.get("confirmed")) and entry.get("suffix") is not None
+
+    @staticmethod
+    def _suffix_key(suffixes):
+        return ",".join(suffixes)
+
+    def record_success(self, symbol, yahoo_ticker):
+        """
+        Remember the ticker variant that returned data for a symbol.
+
+        Args:
+            symbol (str): Bare stock symbol
+            yahoo_ticker (str): Yahoo ticker that worked
+        """
+        if "." in symbol or symbol.startswith("^"):
+            return
+        suffix = yahoo_ticker[len(symbol):]
+        self._ensure_loaded()
+        with self._lock:
+            entry = self._entries.get(symbol.upper())
+            if entry and entry.get("suffix") == suffix and entry.get("confirmed"):
+                return
+            self._entries[symbol.upper()] = {"suffix": suffix, "confirmed": True, "updated": time.time()}
+        self._schedule_save()
+
+    def record_failure(self, symbol, suffixes=DEFAULT_SUFFIXES):
+        """
+        Negatively cache a symbol for which none of the probed variants returned data.
+
+        Args:
+            symbol (str): Bare stock symbol
+            suffixes (tuple): Suffixes that were all probed without data
+        """
+        if "." in symbol or symbol.startswith("^"):
+            return
+        self._ensure_loaded()
+        now = time.time()
+        with self._lock:
+            entry = dict(self._entries.get(symbol.upper()) or {"suffix": None, "confirmed": False})
+            failed = {key: at for key, at in (entry.get("failed") or {}).items() if now - at < self.negative_ttl}
+            failed[self._suffix_key(suffixes)] = now
+            entry.update(failed=failed, updated=now)
+            self._entries[symbol.upper()] = entry
+        self._schedule_save()
+
+    def resolve(self, symbol, probe, suffixes=DEFAULT_SUFFIXES, negative_cache=True):
+        """
+        Find the working Yahoo ticker for a symbol using as few probes as possible.
+
+        Args:
+            symbol (str): Bare stock symbol
+            probe (callable): Called with a Yahoo ticker; returns the fetched data,
+                or None if that variant has no data. Exceptions are treated as
+                transient errors.
+            suffixes (tuple): Suffixes to probe, in default order
+            negative_cache (bool): Negatively cache the symbol if every variant was
+                probed without data. Pass False for probes that cannot tell "no
+                data" from an upstream error (e.g. Ticker.history).
+
+        Returns:
+            tuple: (yahoo_ticker, data) for the first variant that returned data,
+                or (None, None) if none did
+        """
+        candidates = self.candidates(symbol, suffixes)
+        tried = 0
+        for yahoo_ticker in candidates:
+            try:
+                data = probe(yahoo_ticker)
+            except Exception as e:
+                logger.warning(f"Error probing {yahoo_ticker}: {e}")
+                continue
+            tried += 1
+            if data is not None:
+                self.record_success(symbol, yahoo_ticker)
+                return yahoo_ticker, data
+
+        # Only a clean miss on every variant counts as a failure
+        if negative_cache and candidates and tried == len(suffixes):
+            self.record_failure(symbol, suffixes)
+        return None, None
+
+    def stats(self):
+        """
+        Get a summary of the resolution table.
+
+        Returns:
+            dict: Counts of seeded, confirmed and negatively cached symbols
+        """
+        self._ensure_loaded()
+        with self._lock:
+            entries = list(self._entries.values())
+        return {
+            "symbols": len(entries),
+            "confirmed": sum(1 for entry in entries if entry.get("confirmed") and entry.get("suffix") is not None),
+            "negative": sum(1 for entry in entries
+                            if any(time.time() - at < self.negative_ttl for at in (entry.get("failed") or {}).values())),
+            "seeded": sum(1 for entry in entries if not entry.get("confirmed"))
+        }
+
+
+# Shared resolver used by the REST API and the WebSocket server
+resolver = SymbolResolver()
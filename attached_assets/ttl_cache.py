@@ -0,0 +1,262 @@
+"""
+PyTrade - TTL Cache Module
+
+This module provides the bounded in-process cache used by the API decorators. Each
+entry carries its own expiry time, the cache is limited both by entry count and by an
+approximate byte budget, and least recently used entries are evicted first when
+either limit is exceeded. A background thread sweeps expired entries so that memory
+is returned even for keys that are never requested again.
+
+Key features:
+- Per-entry TTL with lazy expiry on read and periodic background sweeping
+- LRU eviction bounded by maximum entries and maximum bytes
+- Thread-safe access for threaded and gevent workers
+- Hit, miss, expiry and eviction statistics for sizing
+
+Author: PyTrade Development Team
+Version: 1.0.0
+Date: October 17, 2026
+License: Proprietary
+"""
+
+import os
+import sys
+import time
+import pickle
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Default limits (overridable through the environment)
+DEFAULT_MAX_ENTRIES = int(os.environ.get("PYTRADE_CACHE_MAX_ENTRIES", 4096))
+DEFAULT_MAX_BYTES = int(os.environ.get("PYTRADE_CACHE_MAX_BYTES", 128 * 1024 * 1024))
+DEFAULT_SWEEP_INTERVAL = int(os.environ.get("PYTRADE_CACHE_SWEEP_INTERVAL", 60))
+
+
+def estimate_size(value):
+    """
+    Estimate the memory footprint of a cached value in bytes.
+
+    Args:
+        value: Cached value (bytes, string, Flask response or any picklable object)
+
+    Returns:
+        int: Approximate size in bytes
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8", errors="ignore"))
+    if hasattr(value, "get_data"):
+        # Flask/Werkzeug response objects
+        try:
+            return len(value.get_data())
+        except Exception:
+            pass
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+def make_cache_key(name, args, kwargs):
+    """
+    Build a cache key from a function name and its call arguments.
+
+    Arguments are rendered with repr() so that values of different types
+    (for example 1 and "1") do not share an entry.
+
+    Args:
+        name (str): Function name
+        args (tuple): Positional arguments
+        kwargs (dict): Keyword arguments
+
+    Returns:
+        str: Cache key
+    """
+    key_parts = [name]
+    key_parts.extend([repr(arg) for arg in args])
+    key_parts.extend([f"{k}={v!r}" for k, v in sorted(kwargs.items())])
+    return ":".join(key_parts)
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-entry TTL and entry/byte limits.
+    """
+
+    def __init__(self, name="cache", max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES,
+                 default_ttl=300, sweep_interval=DEFAULT_SWEEP_INTERVAL):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.sweep_interval = sweep_interval
+        # key -> (value, expires_at, size, stored_at); ordered from least to most recently used
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._sweeper_pid = None
+        self._stats = {"hits": 0, "misses": 0, "sets": 0, "expired": 0, "evictions": 0}
+
+    def _remove(self, key):
+        value, expires_at, size, stored_at = self._entries.pop(key)
+        self._bytes -= size
+
+    def _ensure_sweeper(self):
+        # Threads do not survive fork, so each gunicorn worker starts its own sweeper
+        if not self.sweep_interval or self._sweeper_pid == os.getpid():
+            return
+        self._sweeper_pid = os.getpid()
+        thread = threading.Thread(target=self._sweep_loop, name=f"{self.name}-sweeper", daemon=True)
+        thread.start()
+
+    def _sweep_loop(self):
+        while True:
+            time.sleep(self.sweep_interval)
+            try:
+                removed = self.sweep()
+                if removed:
+                    logger.debug(f"Cache [{self.name}] swept {removed} expired entries")
+            except Exception as e:
+                logger.error(f"Error sweeping cache [{self.name}]: {e}")
+
+    def get(self, key, default=None):
+        """
+        Get a live value from the cache.
+
+        Args:
+            key (str): Cache key
+            default: Value returned on a miss
+
+        Returns:
+            The cached value, or default if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return default
+            if entry[1] <= time.time():
+                self._remove(key)
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return default
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def get_entry(self, key):
+        """
+        Get a value together with its timestamps, including expired entries.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            tuple: (value, expires_at, stored_at) or None if the key is absent
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0], entry[1], entry[3]
+
+    def set(self, key, value, ttl=None, size=None):
+        """
+        Store a value in the cache, evicting least recently used entries if needed.
+
+        Args:
+            key (str): Cache key
+            value: Value to store
+            ttl (int, optional): Time to live in seconds (default: the cache default)
+            size (int, optional): Known size in bytes (estimated if omitted)
+        """
+        if size is None:
+            size = estimate_size(value)
+        if size > self.max_bytes:
+            logger.warning(f"Cache [{self.name}] value for {key} ({size} bytes) exceeds the byte budget, not cached")
+            return
+
+        now = time.time()
+        expires_at = now + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._ensure_sweeper()
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires_at, size, now)
+            self._bytes += size
+            self._stats["sets"] += 1
+
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self._stats["evictions"] += 1
+
+    def delete(self, key):
+        """
+        Remove a key from the cache.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            bool: True if the key was present
+        """
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+                return True
+            return False
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def sweep(self):
+        """
+        Remove all expired entries.
+
+        Returns:
+            int: Number of entries removed
+        """
+        now = time.time()
+        with self._lock:
+            expired = [key for key, entry in self._entries.items() if entry[1] <= now]
+            for key in expired:
+                self._remove(key)
+            self._stats["expired"] += len(expired)
+        return len(expired)
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[1] > time.time()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Counters plus current entry count, byte usage and hit ratio
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes
+            })
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
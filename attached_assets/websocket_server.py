@@ -11,6 +11,13 @@ Key features:
 - Automatic data refresh
 - Support for global markets, with special handling for Indian stocks (NSE/BSE)
 - Connection health monitoring with ping/pong
+- Encode-once broadcast through bounded per-client queues (see ws_broadcast)
+- Negotiated compact wire formats with delta frames (see ws_protocol); JSON by default
+- Subscriptions to lists of symbols or whole indices in one message, answered with a
+  consolidated snapshot and one batched update message per refresh cycle
+- Bulk quote polling per refresh cycle (upstream calls per chunk, not per symbol)
+- Upstream quote fetches on a bounded thread pool with per-call timeouts, so the
+  event loop keeps serving clients while Yahoo Finance responds
 
 Author: PyTrade Development Team
 Version: 1.0.0
@@ -23,10 +30,13 @@ import logging
 import websockets
 import random
 import time
-import yfinance as yf
 from datetime import datetime
 import argparse
 import os
+from concurrent.futures import ThreadPoolExecutor
+from quote_poller import poll_quotes
+from indicesdownload import get_index_constituents
+from ws_broadcast import broadcaster
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -39,6 +49,61 @@ subscriptions = {}
 # Store latest price data: { symbol: { price, change, ... } }
 latest_prices = {}
 
+# Blocking upstream calls (yfinance, history seeding) run on this many worker threads;
+# at most that many fetches are in flight and each may take FETCH_TIMEOUT seconds
+FETCH_WORKERS = int(os.environ.get("PYTRADE_WS_FETCH_WORKERS", 16))
+FETCH_TIMEOUT = float(os.environ.get("PYTRADE_WS_FETCH_TIMEOUT", 10))
+UPDATE_INTERVAL = float(os.environ.get("PYTRADE_WS_UPDATE_INTERVAL", 15))
+# Timeout of one refresh cycle's bulk quote poll
+POLL_TIMEOUT = float(os.environ.get("PYTRADE_WS_POLL_TIMEOUT", 60))
+# Symbols a single client may subscribe to
+MAX_SUBSCRIPTIONS = int(os.environ.get("PYTRADE_WS_MAX_SUBSCRIPTIONS", 1000))
+
+_fetch_executor = None
+_fetch_slots = None
+# Running refresh task per symbol, shared by concurrent requests for the same symbol
+_inflight = {}
+fetch_stats = {"fetches": 0, "timeouts": 0, "errors": 0, "last_cycle_seconds": None, "last_cycle_symbols": 0}
+
+
+def _get_fetch_executor():
+    global _fetch_executor
+    if _fetch_executor is None:
+        _fetch_executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="ws-fetch")
+    return _fetch_executor
+
+
+async def run_blocking(func, *args, timeout=None):
+    """
+    Run a blocking call on the fetch pool without blocking the event loop.
+
+    Args:
+        func (callable): Blocking function
+        *args: Arguments of the function
+        timeout (float, optional): Seconds to wait once the call has a worker
+            (default: FETCH_TIMEOUT)
+
+    Returns:
+        The function's result
+
+    Raises:
+        asyncio.TimeoutError: If the call does not finish in time
+    """
+    global _fetch_slots
+    if _fetch_slots is None:
+        _fetch_slots = asyncio.Semaphore(FETCH_WORKERS)
+    await _fetch_slots.acquire()
+    try:
+        future = asyncio.get_running_loop().run_in_executor(_get_fetch_executor(), func, *args)
+    except Exception:
+        _fetch_slots.release()
+        raise
+    # The slot is freed when the worker finishes rather than when the caller gives up,
+    # so calls stuck past their timeout still count against the limit
+    future.add_done_callback(lambda _: _fetch_slots.release())
+    return await asyncio.wait_for(asyncio.shield(future), timeout or FETCH_TIMEOUT)
+
+
 async def handle_websocket_connection(websocket):
     """
     Handle a WebSocket connection.
@@ -49,8 +114,9 @@ async def handle_websocket_connection(websocket):
     client_id = id(websocket)
     logger.info(f"Client connected: {client_id}")
     
-    # Add client to connected clients
+    # Add client to connected clients; all sends go through its broadcast channel
     connected_clients.add(websocket)
+    broadcaster.register(websocket)
     client_subscriptions = set()
     
     try:
@@ -61,7 +127,18 @@ async def handle_websocket_connection(websocket):
                 action = data.get('action')
                 symbol = data.get('symbol')
                 
-                if action == 'subscribe' and symbol:
+                if action in ('subscribe', 'unsubscribe') and (data.get('symbols') or data.get('index')):
+                    # Subscribe or unsubscribe a list of symbols and/or an index's constituents
+                    await handle_bulk_subscription(websocket, data, client_subscriptions)
+                
+                elif action == 'subscribe' and symbol:
+                    if symbol not in client_subscriptions and len(client_subscriptions) >= MAX_SUBSCRIPTIONS:
+                        # Same per-client limit as bulk subscriptions
+                        broadcaster.send(websocket, {'type': 'error', 'symbol': symbol,
+                                                     'message': f"Subscription limit of {MAX_SUBSCRIPTIONS} symbols reached"})
+                        logger.warning(f"Client {client_id} rejected for {symbol}: subscription limit reached")
+                        continue
+                    
                     # Subscribe to a symbol
                     if symbol not in subscriptions:
                         subscriptions[symbol] = set()
@@ -70,15 +147,12 @@ async def handle_websocket_connection(websocket):
                     
                     # If we have latest data, send it immediately
                     if symbol in latest_prices:
-                        await websocket.send(json.dumps({
-                            'type': 'price_update',
-                            'symbol': symbol,
-                            'data': latest_prices[symbol]
-                        }))
+                        broadcaster.send_snapshot(websocket, {symbol: latest_prices[symbol]})
                     
-                    # Fetch initial data if needed
+                    # Fetch initial data if needed; the refresh broadcasts it to this
+                    # client when it completes, so keep reading messages meanwhile
                     if symbol not in latest_prices:
-                        await fetch_stock_data(symbol)
+                        schedule_refresh(symbol)
                     
                     logger.info(f"Client {client_id} subscribed to {symbol}")
                     
@@ -89,9 +163,15 @@ async def handle_websocket_connection(websocket):
                         client_subscriptions.discard(symbol)
                         logger.info(f"Client {client_id} unsubscribed from {symbol}")
                 
+                elif action == 'protocol':
+                    # Switch this client's price updates to another wire format
+                    ack = broadcaster.set_protocol(websocket, data.get('format', 'json'), data.get('delta', False),
+                                                   data.get('batch'))
+                    broadcaster.send(websocket, ack)
+                
                 elif action == 'ping':
                     # Ping to keep connection alive
-                    await websocket.send(json.dumps({'type': 'pong'}))
+                    broadcaster.send(websocket, {'type': 'pong'})
                     
             except json.JSONDecodeError:
                 logger.error(f"Invalid JSON received from client {client_id}")
@@ -106,95 +186,217 @@ async def handle_websocket_connection(websocket):
             if symbol in subscriptions and websocket in subscriptions[symbol]:
                 subscriptions[symbol].remove(websocket)
         connected_clients.discard(websocket)
+        broadcaster.unregister(websocket)
         logger.info(f"Client {client_id} disconnected, removed from {len(client_subscriptions)} subscriptions")
 
-async def fetch_stock_data(symbol):
+async def requested_symbols(data):
     """
-    Fetch stock data for a symbol.
+    Collect the symbols of a bulk subscribe or unsubscribe message.
     
     Args:
-        symbol (str): Stock symbol to fetch data for.
+        data (dict): Message with "symbols" (list) and/or "index" (index name,
+            e.g. "NIFTY 50")
+        
+    Returns:
+        list: Distinct symbols, in request order
+    """
+    symbols = data.get('symbols') or []
+    if isinstance(symbols, str):
+        symbols = [symbols]
+    symbols = list(symbols)
+    index_name = data.get('index')
+    if index_name:
+        # Constituents come from the daily cache file, or a fetch on a cache miss
+        constituents = await run_blocking(get_index_constituents, index_name)
+        if not constituents:
+            raise ValueError(f"No constituents found for {index_name}")
+        symbols.extend(c['symbol'] if isinstance(c, dict) else c for c in constituents)
+    return list(dict.fromkeys(str(symbol).strip() for symbol in symbols if symbol))
+
+async def handle_bulk_subscription(websocket, data, client_subscriptions):
+    """
+    Subscribe or unsubscribe a client to several symbols at once.
+    
+    Subscribing switches the client to batch mode (unless "batch" is false): it gets
+    one consolidated snapshot of the symbols with known prices and then one message
+    per refresh cycle with all of its updates. Symbols without a price yet are
+    fetched together in one refresh.
+    
+    Args:
+        websocket: The WebSocket connection.
+        data (dict): Message with "action", "symbols" and/or "index".
+        client_subscriptions (set): The client's subscribed symbols (updated).
     """
+    action = data.get('action')
     try:
-        # Try with suffix for Indian stocks first
-        ticker_symbol = symbol
-        if not "." in symbol:
-            # For Indian stocks, we'll try NSE by default
-            indian_exchanges = {".NS": "NSE", ".BO": "BSE"}
-            for suffix, exchange in indian_exchanges.items():
-                try:
-                    ticker = yf.Ticker(f"{symbol}{suffix}")
-                    info = ticker.info
-                    if info and 'regularMarketPrice' in info:
-                        ticker_symbol = f"{symbol}{suffix}"
-                        break
-                except Exception:
-                    continue
-        
-        ticker = yf.Ticker(ticker_symbol)
-        info = ticker.info
-        
-        if not info or 'regularMarketPrice' not in info:
-            logger.warning(f"No data available for {symbol}")
-            return
-        
-        price = info.get('regularMarketPrice')
-        previous_close = info.get('regularMarketPreviousClose')
-        change = price - previous_close if previous_close else 0
-        change_percent = (change / previous_close * 100) if previous_close else 0
-        
-        # Include date, time, and timezone information in the timestamp
-        current_time = datetime.now().strftime('%d/%m/%Y %H:%M:%S %Z')
+        symbols = await requested_symbols(data)
+    except asyncio.TimeoutError:
+        broadcaster.send(websocket, {'type': 'error', 'message': f"Timed out loading index {data.get('index')}"})
+        return
+    except ValueError as e:
+        broadcaster.send(websocket, {'type': 'error', 'message': str(e)})
+        return
+    
+    if action == 'unsubscribe':
+        removed = [symbol for symbol in symbols if symbol in client_subscriptions]
+        for symbol in removed:
+            subscriptions.get(symbol, set()).discard(websocket)
+            client_subscriptions.discard(symbol)
+        broadcaster.send(websocket, {'type': 'unsubscribed', 'symbols': removed, 'index': data.get('index')})
+        logger.info(f"Client {id(websocket)} unsubscribed from {len(removed)} symbols")
+        return
+    
+    # Enforce the per-client subscription limit
+    room = max(MAX_SUBSCRIPTIONS - len(client_subscriptions), 0)
+    new = [symbol for symbol in symbols if symbol not in client_subscriptions]
+    rejected = new[room:]
+    accepted = [symbol for symbol in symbols if symbol not in rejected]
+    for symbol in new[:room]:
+        subscriptions.setdefault(symbol, set()).add(websocket)
+        client_subscriptions.add(symbol)
+    
+    broadcaster.set_batch(websocket, data.get('batch', True))
+    broadcaster.send(websocket, {'type': 'subscribed', 'symbols': accepted, 'index': data.get('index'),
+                                 'rejected': rejected})
+    snapshot = {symbol: latest_prices[symbol] for symbol in accepted if symbol in latest_prices}
+    if snapshot:
+        broadcaster.send_snapshot(websocket, snapshot)
+    missing = [symbol for symbol in accepted if symbol not in latest_prices]
+    if missing:
+        schedule_refresh(missing)
+    logger.info(f"Client {id(websocket)} subscribed to {len(accepted)} symbols "
+                f"({len(snapshot)} in snapshot, {len(rejected)} over the limit)")
+
+def publish_prices(prices):
+    """
+    Store a cycle's price data and queue it for the subscribers.
+    
+    Batch-mode clients get one message with all of their symbols; the others one
+    message per symbol.
+    
+    Args:
+        prices (dict): Mapping of symbol to price data.
+    """
+    latest_prices.update(prices)
+    broadcaster.publish_many(prices, subscriptions)
+
+def publish_price(symbol, price_data):
+    """
+    Store a symbol's latest price data and queue it for its subscribers.
+    
+    The update is serialized once and queued on each subscriber's channel; slow
+    clients are conflated or evicted by the broadcaster instead of delaying others.
+    
+    Args:
+        symbol (str): Stock symbol.
+        price_data (dict): Price data to send.
+    """
+    latest_prices[symbol] = price_data
+    
+    # Broadcast to subscribed clients
+    if symbol in subscriptions:
+        broadcaster.publish(symbol, price_data, subscriptions[symbol])
+
+async def _refresh_symbols(symbols):
+    try:
+        fetch_stats["fetches"] += 1
+        quotes = await run_blocking(poll_quotes, symbols, timeout=POLL_TIMEOUT if len(symbols) > 1 else None)
+        for symbol in symbols:
+            if symbol not in quotes:
+                logger.warning(f"No data available for {symbol}")
+        if quotes:
+            publish_prices(quotes)
+            logger.info(f"Updated prices for {len(quotes)}/{len(symbols)} symbols")
+        return quotes
+    
+    except asyncio.TimeoutError:
+        fetch_stats["timeouts"] += 1
+        logger.warning(f"Timed out fetching data for {len(symbols)} symbols")
+        return {}
+    except Exception as e:
+        fetch_stats["errors"] += 1
+        logger.error(f"Error fetching data for {symbols}: {e}")
+        return {}
+
+def schedule_refresh(symbols):
+    """
+    Start refreshing symbols that are not already being refreshed, in one poll.
+    
+    Args:
+        symbols (str or list): Stock symbol(s) to refresh.
         
-        price_data = {
-            'price': price,
-            'change': change,
-            'changePercent': change_percent,
-            'high': info.get('dayHigh', price),
-            'low': info.get('dayLow', price),
-            'volume': info.get('regularMarketVolume', 0),
-            'timestamp': current_time,  # Show full date, time and timezone
-            'currency': info.get('currency', 'USD')
-        }
+    Returns:
+        set: The running refresh tasks covering the symbols (each returns a
+             mapping of symbol to price data)
+    """
+    if isinstance(symbols, str):
+        symbols = [symbols]
+    symbols = list(dict.fromkeys(symbols))
+    tasks = {_inflight[symbol] for symbol in symbols if symbol in _inflight}
+    pending = [symbol for symbol in symbols if symbol not in _inflight]
+    if pending:
+        task = asyncio.ensure_future(_refresh_symbols(pending))
+        for symbol in pending:
+            _inflight[symbol] = task
         
-        latest_prices[symbol] = price_data
+        def _done(_):
+            for symbol in pending:
+                if _inflight.get(symbol) is task:
+                    del _inflight[symbol]
         
-        # Broadcast to subscribed clients
-        if symbol in subscriptions:
-            message = json.dumps({
-                'type': 'price_update',
-                'symbol': symbol,
-                'data': price_data
-            })
-            
-            await asyncio.gather(
-                *[client.send(message) for client in subscriptions[symbol]],
-                return_exceptions=True
-            )
-            
-        logger.info(f"Updated price for {symbol}: {price}")
-        return price_data
+        task.add_done_callback(_done)
+        tasks.add(task)
+    return tasks
+
+async def fetch_stock_data(symbol):
+    """
+    Fetch stock data for a symbol and broadcast it to its subscribers.
     
-    except Exception as e:
-        logger.error(f"Error fetching data for {symbol}: {e}")
-        return None
+    The upstream calls run on the fetch pool; concurrent calls for the same symbol
+    share one fetch.
+    
+    Args:
+        symbol (str): Stock symbol to fetch data for.
+        
+    Returns:
+        dict: Price data, or None if the fetch failed or timed out
+    """
+    task, = schedule_refresh(symbol)
+    # Shielded so a cancelled caller does not cancel a fetch other callers share
+    quotes = await asyncio.shield(task)
+    return quotes.get(symbol)
 
 async def update_prices():
     """
     Update prices periodically for all subscribed symbols.
+    
+    Each cycle polls the quotes of every subscribed symbol together (one upstream
+    call per chunk of symbols, see quote_poller) and fans them out to subscribers.
     """
+    loop = asyncio.get_running_loop()
     while True:
-        update_tasks = []
-        for symbol in list(subscriptions.keys()):
-            # Only update if there are subscribers
-            if subscriptions[symbol]:
-                update_tasks.append(fetch_stock_data(symbol))
+        started = loop.time()
+        # Only update symbols that have subscribers
+        symbols = [symbol for symbol, clients in list(subscriptions.items()) if clients]
         
-        if update_tasks:
-            await asyncio.gather(*update_tasks, return_exceptions=True)
+        if symbols:
+            try:
+                fetch_stats["fetches"] += 1
+                quotes = await run_blocking(poll_quotes, symbols, timeout=POLL_TIMEOUT)
+                # One batched message per batch-mode client for the whole cycle
+                publish_prices(quotes)
+                fetch_stats["last_cycle_seconds"] = round(loop.time() - started, 3)
+                fetch_stats["last_cycle_symbols"] = len(symbols)
+                logger.info(f"Refreshed {len(quotes)}/{len(symbols)} symbols in {fetch_stats['last_cycle_seconds']}s")
+            except asyncio.TimeoutError:
+                fetch_stats["timeouts"] += 1
+                logger.warning(f"Timed out polling quotes for {len(symbols)} symbols after {POLL_TIMEOUT}s")
+            except Exception as e:
+                fetch_stats["errors"] += 1
+                logger.error(f"Error polling quotes: {e}")
         
-        # Wait before next update (15 seconds)
-        await asyncio.sleep(15)
+        # Wait for the rest of the update interval (15 seconds by default)
+        await asyncio.sleep(max(UPDATE_INTERVAL - (loop.time() - started), 0))
 
 def parse_args():
     """Parse command line arguments."""
@@ -268,6 +470,8 @@ def run_websocket_server():
     except KeyboardInterrupt:
         logger.info("WebSocket server stopped by user")
     finally:
+        if _fetch_executor is not None:
+            _fetch_executor.shutdown(wait=False)
         loop.close()
 
 if __name__ == "__main__":
@@ -0,0 +1,499 @@
+"""
+PyTrade - WebSocket Broadcast Module
+
+This module fans price updates out to WebSocket clients without letting a slow
+client hold up the others. Each update is serialized once and the same message is
+offered to every subscriber's channel. A channel is a bounded per-client queue
+drained by its own writer task, so publishing never awaits a socket: fan-out costs
+one queue append per client however slow the clients are.
+
+While a client keeps up, its queue delivers every message in order. When the queue
+overflows, the channel conflates: it keeps only the latest pending message per
+symbol (replacing older ones in place) until the writer has drained it. A client
+that stays behind for longer than the eviction threshold, or whose conflated backlog
+grows past the pending-message cap, is disconnected and counted in the metrics.
+
+Price updates are SymbolUpdate objects from ws_protocol, encoded lazily at most once
+per wire format. Each channel picks the frame of its negotiated format; delta frames
+are only queued when the client was queued the symbol's preceding update and the
+channel is not conflating, and a replaced delta is swapped for the full frame.
+
+Clients in batch mode receive all of a cycle's updates (publish_many) and the
+snapshot of a subscription as one message. While such a client is behind, its
+updates are queued as single-symbol full batches keyed by symbol, so they conflate
+like any other update.
+
+Key features:
+- Encode-once fan-out to all subscribers of a symbol
+- Bounded per-client queues with a dedicated writer task per client
+- Conflation to the latest value per symbol on overflow
+- Slow-consumer eviction after a time limit or a backlog cap
+- Per-client wire formats (JSON, MessagePack, binary) with delta frames
+- Batched multi-symbol updates per refresh cycle and consolidated snapshots
+- Fan-out timing, conflation and eviction metrics
+
+Author: PyTrade Development Team
+Version: 1.0.0
+Date: October 17, 2026
+License: Proprietary
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+from collections import deque, OrderedDict
+from ws_protocol import SymbolTable, negotiate, protocol_ack, encode_batch, symbols_announcement
+
+logger = logging.getLogger(__name__)
+
+# Messages a client may have queued before its channel starts conflating
+QUEUE_SIZE = int(os.environ.get("PYTRADE_WS_QUEUE_SIZE", 64))
+# Pending messages (distinct symbols) a conflating client may accumulate before eviction
+MAX_PENDING = int(os.environ.get("PYTRADE_WS_MAX_PENDING", 2048))
+# Seconds a client may stay behind (conflating) before it is disconnected
+EVICT_AFTER = float(os.environ.get("PYTRADE_WS_EVICT_AFTER", 30))
+# WebSocket close code sent to evicted clients ("try again later")
+EVICT_CLOSE_CODE = 1013
+
+
+class ClientChannel:
+    """
+    Bounded outgoing message queue and writer task of one WebSocket client.
+    """
+
+    def __init__(self, websocket, broadcaster, queue_size=QUEUE_SIZE, max_pending=MAX_PENDING,
+                 evict_after=EVICT_AFTER):
+        self.websocket = websocket
+        self.broadcaster = broadcaster
+        self.queue_size = queue_size
+        self.max_pending = max_pending
+        self.evict_after = evict_after
+        self.behind_since = None
+        self.closed = False
+        self.sent = 0
+        self.conflated = 0
+        # Negotiated wire format, symbols announced to the client and the sequence
+        # number of the last update queued per symbol
+        self.format = "json"
+        self.delta = False
+        # Batch mode: one message per publish cycle instead of one per symbol
+        self.batch = False
+        self.announced = set()
+        self.symbol_seq = {}
+        self._queue = deque()
+        # Latest pending message per key while conflating (None in normal mode)
+        self._latest = None
+        self._unkeyed = 0
+        self._ready = asyncio.Event()
+        self._writer = None
+
+    def start(self):
+        """Start the writer task."""
+        self._writer = asyncio.ensure_future(self._write_loop())
+
+    def depth(self):
+        """Number of pending messages."""
+        return len(self._latest) if self._latest is not None else len(self._queue)
+
+    def _conflate(self):
+        # Switch to conflating mode: keep the latest message per key, in first-seen order
+        latest = OrderedDict()
+        for key, message, full in self._queue:
+            if key is None:
+                self._unkeyed += 1
+                key = ("_", self._unkeyed)
+            elif key in latest:
+                self.conflated += 1
+                self.broadcaster.metrics["conflated"] += 1
+                # The delta's predecessor was dropped: send the whole state instead
+                message = full or message
+            latest[key] = message
+        self._queue.clear()
+        self._latest = latest
+        self.behind_since = time.monotonic()
+
+    def offer(self, message, key=None, full=None):
+        """
+        Queue a message without waiting for the socket.
+
+        Args:
+            message (str or bytes): Serialized message
+            key (str, optional): Conflation key (the symbol); unkeyed messages are
+                never replaced
+            full (bytes, optional): Full frame replacing a delta message if it is
+                conflated with a later one
+
+        Returns:
+            bool: False if the client is closed or was evicted
+        """
+        if self.closed:
+            return False
+        if self._latest is None and len(self._queue) >= self.queue_size:
+            self._conflate()
+
+        if self._latest is None:
+            self._queue.append((key, message, full))
+        else:
+            if key is None:
+                self._unkeyed += 1
+                key = ("_", self._unkeyed)
+            elif key in self._latest:
+                self.conflated += 1
+                self.broadcaster.metrics["conflated"] += 1
+            self._latest[key] = message
+            if len(self._latest) > self.max_pending:
+                self.broadcaster.evict(self, "backlog")
+                return False
+            if time.monotonic() - self.behind_since > self.evict_after:
+                self.broadcaster.evict(self, "lagging")
+                return False
+        self._ready.set()
+        return True
+
+    def offer_update(self, update):
+        """
+        Queue a price update in the client's wire format.
+
+        Args:
+            update (SymbolUpdate): Published update
+
+        Returns:
+            bool: False if the client is closed or was evicted
+        """
+        if self.format == "json":
+            return self.offer(update.frame("json"), update.symbol)
+        if update.symbol not in self.announced:
+            if not self.offer(update.announcement()):
+                return False
+            self.announced.add(update.symbol)
+        # Deltas need the preceding update in order, so not while conflating
+        in_order = self._latest is None and len(self._queue) < self.queue_size
+        previous_seq = self.symbol_seq.get(update.symbol)
+        self.symbol_seq[update.symbol] = update.seq
+        if self.delta and in_order and previous_seq == update.seq - 1:
+            return self.offer(update.frame(self.format, delta=True), update.symbol,
+                              full=update.frame(self.format))
+        return self.offer(update.frame(self.format), update.symbol)
+
+    def offer_batch(self, updates, snapshot=False):
+        """
+        Queue several price updates as one message in the client's wire format.
+
+        Args:
+            updates (list): SymbolUpdate objects, one per symbol
+            snapshot (bool): Send them as a subscription snapshot (full frames)
+
+        Returns:
+            bool: False if the client is closed or was evicted
+        """
+        if not updates:
+            return not self.closed
+        if self.format != "json":
+            new = [update for update in updates if update.symbol not in self.announced]
+            if new:
+                if not self.offer(symbols_announcement(new)):
+                    return False
+                self.announced.update(update.symbol for update in new)
+
+        if self._latest is not None or len(self._queue) >= self.queue_size:
+            # Behind: per-symbol full batches that conflate by symbol
+            for update in updates:
+                self.symbol_seq[update.symbol] = update.seq
+                if not self.offer(encode_batch([(update, False)], self.format, snapshot), update.symbol):
+                    return False
+            return True
+
+        entries = []
+        for update in updates:
+            previous_seq = self.symbol_seq.get(update.symbol)
+            self.symbol_seq[update.symbol] = update.seq
+            entries.append((update, self.delta and not snapshot and previous_seq == update.seq - 1))
+        return self.offer(encode_batch(entries, self.format, snapshot))
+
+    def set_protocol(self, fmt, delta):
+        """
+        Switch the wire format of later updates (starting again from full frames).
+
+        Pending per-symbol frames are dropped: while conflating, a later update of the
+        same symbol would take over their queue position, ahead of the symbol's
+        announcement in the new format. The next update of each symbol is sent in full.
+        """
+        self.format = fmt
+        self.delta = delta
+        self.announced.clear()
+        self.symbol_seq.clear()
+        if self._latest is not None:
+            for key in [key for key in self._latest if not isinstance(key, tuple)]:
+                del self._latest[key]
+        else:
+            self._queue = deque(entry for entry in self._queue if entry[0] is None)
+
+    def _pop(self):
+        if self._latest is not None:
+            if self._latest:
+                return self._latest.popitem(last=False)[1]
+            # Caught up: back to in-order delivery
+            self._latest = None
+            self.behind_since = None
+            return None
+        return self._queue.popleft()[1] if self._queue else None
+
+    async def _write_loop(self):
+        try:
+            while not self.closed:
+                message = self._pop()
+                if message is None:
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+                await self.websocket.send(message)
+                self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Connection closed or failed; the connection handler cleans up
+            logger.debug(f"Writer for client {id(self.websocket)} stopped: {e}")
+            self.closed = True
+
+    def close(self):
+        """Stop the writer and drop pending messages."""
+        self.closed = True
+        self._queue.clear()
+        self._latest = None
+        if self._writer is not None and not self._writer.done():
+            self._writer.cancel()
+
+
+class Broadcaster:
+    """
+    Registry of client channels and encode-once fan-out of updates.
+    """
+
+    def __init__(self, queue_size=QUEUE_SIZE, max_pending=MAX_PENDING, evict_after=EVICT_AFTER):
+        self.queue_size = queue_size
+        self.max_pending = max_pending
+        self.evict_after = evict_after
+        self.symbols = SymbolTable()
+        self._channels = {}
+        self._closing = set()
+        self.metrics = {
+            "published": 0,
+            "deliveries": 0,
+            "batches": 0,
+            "conflated": 0,
+            "evicted": 0,
+            "evicted_lagging": 0,
+            "evicted_backlog": 0,
+            "last_fanout_ms": 0.0,
+            "max_fanout_ms": 0.0
+        }
+
+    def register(self, websocket):
+        """
+        Create and start the channel of a new client.
+
+        Args:
+            websocket: Client connection
+
+        Returns:
+            ClientChannel: The client's channel
+        """
+        channel = ClientChannel(websocket, self, self.queue_size, self.max_pending, self.evict_after)
+        self._channels[websocket] = channel
+        channel.start()
+        return channel
+
+    def unregister(self, websocket):
+        """
+        Remove a client's channel (on disconnect).
+
+        Args:
+            websocket: Client connection
+        """
+        channel = self._channels.pop(websocket, None)
+        if channel is not None:
+            channel.close()
+
+    def send(self, websocket, message, key=None):
+        """
+        Queue a message for one client.
+
+        Args:
+            websocket: Client connection
+            message (dict, str or bytes): Message (serialized to JSON if a dict)
+            key (str, optional): Conflation key
+
+        Returns:
+            bool: False if the client has no open channel
+        """
+        channel = self._channels.get(websocket)
+        if channel is None:
+            return False
+        if isinstance(message, dict):
+            message = json.dumps(message)
+        return channel.offer(message, key)
+
+    def set_protocol(self, websocket, fmt="json", delta=False, batch=None):
+        """
+        Negotiate a client's wire format.
+
+        Args:
+            websocket: Client connection
+            fmt (str): "json", "msgpack" or "binary"
+            delta (bool): Whether the client wants delta frames
+            batch (bool, optional): Switch batch mode on or off (unchanged if None)
+
+        Returns:
+            dict: Protocol acknowledgement, or an error message
+        """
+        channel = self._channels.get(websocket)
+        if channel is None:
+            return {'type': 'error', 'message': 'Client is not connected'}
+        try:
+            fmt, delta = negotiate(fmt, delta)
+        except ValueError as e:
+            return {'type': 'error', 'message': str(e)}
+        channel.set_protocol(fmt, delta)
+        if batch is not None:
+            channel.batch = bool(batch)
+        logger.info(f"Client {id(websocket)} switched to {fmt} frames{' with deltas' if delta else ''}")
+        return dict(protocol_ack(fmt, delta), batch=channel.batch)
+
+    def set_batch(self, websocket, enabled=True):
+        """
+        Switch a client's batch mode.
+
+        Args:
+            websocket: Client connection
+            enabled (bool): Whether updates are batched per publish cycle
+        """
+        channel = self._channels.get(websocket)
+        if channel is not None:
+            channel.batch = bool(enabled)
+
+    def send_snapshot(self, websocket, prices):
+        """
+        Queue the latest state of symbols for one client (e.g. a new subscriber).
+
+        Batch-mode clients receive one consolidated snapshot message.
+
+        Args:
+            websocket: Client connection
+            prices (dict): Mapping of symbol to its latest price data
+
+        Returns:
+            bool: False if the client has no open channel
+        """
+        channel = self._channels.get(websocket)
+        if channel is None:
+            return False
+        # Reuse the last published updates so other clients' sequences do not advance
+        updates = [self.symbols.last(symbol) or self.symbols.update(symbol, data)
+                   for symbol, data in prices.items()]
+        if channel.batch:
+            return channel.offer_batch(updates, snapshot=True)
+        return all(channel.offer_update(update) for update in updates)
+
+    def publish(self, symbol, data, clients):
+        """
+        Record a price update and queue it for every subscriber (encoded once per format).
+
+        Args:
+            symbol (str): Stock symbol
+            data (dict): Price data
+            clients (iterable): Subscribed client connections
+
+        Returns:
+            int: Number of clients the update was queued for
+        """
+        return self.publish_many({symbol: data}, {symbol: clients})
+
+    def publish_many(self, prices, subscriptions):
+        """
+        Record a cycle's price updates and queue them for their subscribers.
+
+        Batch-mode clients get one message with all of their symbols' updates; the
+        others get one message per symbol. Each update is encoded once per format.
+
+        Args:
+            prices (dict): Mapping of symbol to price data
+            subscriptions (dict): Mapping of symbol to subscribed client connections
+
+        Returns:
+            int: Number of (client, symbol) updates queued
+        """
+        start = time.perf_counter()
+        delivered = 0
+        batches = {}
+        for symbol, data in prices.items():
+            update = self.symbols.update(symbol, data)
+            for websocket in list(subscriptions.get(symbol, ())):
+                channel = self._channels.get(websocket)
+                if channel is None:
+                    continue
+                if channel.batch:
+                    batches.setdefault(channel, []).append(update)
+                elif channel.offer_update(update):
+                    delivered += 1
+        for channel, updates in batches.items():
+            if channel.offer_batch(updates):
+                delivered += len(updates)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.metrics["published"] += len(prices)
+        self.metrics["deliveries"] += delivered
+        self.metrics["batches"] += len(batches)
+        self.metrics["last_fanout_ms"] = round(elapsed_ms, 3)
+        self.metrics["max_fanout_ms"] = round(max(self.metrics["max_fanout_ms"], elapsed_ms), 3)
+        return delivered
+
+    def evict(self, channel, reason):
+        """
+        Disconnect a client that cannot keep up.
+
+        Args:
+            channel (ClientChannel): The client's channel
+            reason (str): "lagging" or "backlog"
+        """
+        websocket = channel.websocket
+        behind = time.monotonic() - channel.behind_since if channel.behind_since else 0.0
+        logger.warning(f"Evicting slow client {id(websocket)} ({reason}, {channel.depth()} pending, "
+                       f"behind for {behind:.1f}s)")
+        self._channels.pop(websocket, None)
+        channel.close()
+        self.metrics["evicted"] += 1
+        self.metrics[f"evicted_{reason}"] += 1
+        # Close in the background; the close handshake must not hold up the publisher
+        task = asyncio.ensure_future(websocket.close(code=EVICT_CLOSE_CODE, reason="Client too slow"))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def stats(self):
+        """
+        Get broadcast metrics.
+
+        Returns:
+            dict: Connected clients and their wire formats, queue depths, fan-out
+                  timing, conflation and eviction counters
+        """
+        channels = list(self._channels.values())
+        depths = [channel.depth() for channel in channels]
+        formats = {}
+        for channel in channels:
+            name = f"{channel.format}+delta" if channel.delta else channel.format
+            formats[name] = formats.get(name, 0) + 1
+        return dict(
+            self.metrics,
+            clients=len(channels),
+            batch_clients=sum(1 for channel in channels if channel.batch),
+            client_formats=formats,
+            conflating_clients=sum(1 for channel in channels if channel.behind_since is not None),
+            pending_messages=sum(depths),
+            max_queue_depth=max(depths) if depths else 0
+        )
+
+
+# Broadcaster used by the WebSocket server
+broadcaster = Broadcaster()
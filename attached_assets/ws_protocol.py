@@ -0,0 +1,427 @@
+"""
+PyTrade - WebSocket Protocol Module
+
+This module defines the wire formats of WebSocket price updates. JSON text messages
+remain the default; a client can switch its connection to a compact format with
+
+    {"action": "protocol", "format": "msgpack" | "binary" | "json", "delta": true}
+
+and the server acknowledges with a JSON text message listing the update fields in
+order: {"type": "protocol", "format": ..., "delta": ..., "fields": [...]}.
+
+Compact formats send price updates as binary WebSocket frames that refer to a symbol
+by a numeric id. Before the first update for a symbol, the connection receives
+{"type": "symbol", "id": ..., "symbol": ..., "currency": ...} as a JSON text message,
+so each client only learns the ids of its own symbols. Ids are allocated
+process-wide so that one encoded frame serves every subscriber. The formatted
+timestamp string is replaced by the epoch seconds field "ts" and the live
+indicators are flattened into the field list.
+
+Frame kinds are 1 (full: every field) and 2 (delta: only the fields that changed
+since the previous update of the symbol, sequence number seq - 1). A client must
+apply deltas to the last state it holds for the symbol; the server only sends a
+delta when the connection was sent the preceding update, and sends a full frame
+otherwise (new subscriptions, conflated queues).
+
+- msgpack: [kind, symbol_id, seq, {field_index: value}] (None for missing values)
+- binary: little-endian header <B kind, I symbol_id, I seq, I field_mask> followed
+  by one float64 per set mask bit in field order (NaN for missing values, 1.0/0.0
+  for the trend flags)
+
+Connections in batch mode receive the updates of a refresh cycle (or the initial
+snapshot of a subscription) as one message instead of one per symbol. Symbol
+announcements are batched too: {"type": "symbols", "symbols": [{"id", "symbol",
+"currency"}, ...]}.
+
+- json: {"type": "price_updates" | "snapshot", "data": {symbol: price data, ...}}
+- msgpack: [kind, [frame, ...]] with kind 3 (updates) or 4 (snapshot)
+- binary: <B kind, I count> followed by the concatenated frames (each frame's
+  length follows from its field mask)
+
+Key features:
+- JSON (default), MessagePack and fixed binary layouts, negotiated per connection
+- Process-wide symbol ids with per-connection symbol announcements
+- Delta frames carrying only the changed fields, with sequence numbers
+- Encode-once frame caching per format for the broadcast layer
+- Batched multi-symbol update and snapshot messages
+- Benchmark of bytes per update and encode time against the JSON messages
+
+Author: PyTrade Development Team
+Version: 1.0.0
+Date: October 17, 2026
+License: Proprietary
+"""
+
+import math
+import json
+import time
+import struct
+import random
+import logging
+import argparse
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("json", "msgpack", "binary")
+FULL_FRAME = 1
+DELTA_FRAME = 2
+BATCH_FRAME = 3
+SNAPSHOT_FRAME = 4
+
+QUOTE_FIELDS = ("price", "change", "changePercent", "high", "low", "volume", "ts")
+INDICATOR_FIELDS = ("close", "rsi", "macd", "macd_signal", "macd_hist", "atr", "bb_middle", "bb_lower",
+                    "bb_upper", "is_uptrend", "is_downtrend", "ema_short", "ema_long", "ema_trend",
+                    "sma_long", "sma_trend")
+# Field order of compact frames (indicators are prefixed with "indicators.")
+FIELDS = QUOTE_FIELDS + tuple(f"indicators.{name}" for name in INDICATOR_FIELDS)
+
+BINARY_HEADER = struct.Struct("<BIII")
+BINARY_BATCH_HEADER = struct.Struct("<BI")
+
+
+def available_formats():
+    """
+    List the wire formats this server can encode.
+
+    Returns:
+        list: Format names (msgpack only when the msgpack package is installed)
+    """
+    return [name for name in FORMATS if name != "msgpack" or msgpack is not None]
+
+
+def flatten(data, ts=None):
+    """
+    Flatten price data into the compact field order.
+
+    Args:
+        data (dict): Price data as sent in JSON price_update messages
+        ts (float, optional): Epoch seconds of the update (default: now)
+
+    Returns:
+        tuple: Field values (None where missing)
+    """
+    indicators = data.get("indicators") or {}
+    values = [data.get(name) for name in QUOTE_FIELDS[:-1]]
+    values.append(round(ts if ts is not None else time.time(), 3))
+    values.extend(indicators.get(name) for name in INDICATOR_FIELDS)
+    return tuple(values)
+
+
+def _same(a, b):
+    if a is None or b is None:
+        return a is b
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    return a == b
+
+
+def _binary_value(value):
+    if value is None:
+        return math.nan
+    return float(value)
+
+
+class SymbolUpdate:
+    """
+    One published update of a symbol with lazily encoded frames (encoded once per format).
+    """
+
+    def __init__(self, symbol, data, symbol_id, seq, values, changed):
+        self.symbol = symbol
+        self.data = data
+        self.symbol_id = symbol_id
+        self.seq = seq
+        self.values = values
+        # Field indexes that differ from the previous update (all fields for the first)
+        self.changed = changed
+        self._frames = {}
+        self._json_data = None
+
+    def json_data(self):
+        """Price data serialized to JSON (cached; shared by single and batched messages)."""
+        if self._json_data is None:
+            self._json_data = json.dumps(self.data)
+        return self._json_data
+
+    def frame(self, fmt="json", delta=False):
+        """
+        Get the encoded message for a format.
+
+        Args:
+            fmt (str): "json", "msgpack" or "binary"
+            delta (bool): Encode a delta frame (compact formats only)
+
+        Returns:
+            str or bytes: JSON text message or binary frame
+        """
+        key = (fmt, bool(delta) and fmt != "json")
+        message = self._frames.get(key)
+        if message is None:
+            message = self._frames[key] = self._encode(*key)
+        return message
+
+    def _encode(self, fmt, delta):
+        if fmt == "json":
+            return f'{{"type": "price_update", "symbol": {json.dumps(self.symbol)}, "data": {self.json_data()}}}'
+        indexes = self.changed if delta else range(len(FIELDS))
+        kind = DELTA_FRAME if delta else FULL_FRAME
+        if fmt == "msgpack":
+            return msgpack.packb([kind, self.symbol_id, self.seq, {i: self.values[i] for i in indexes}])
+        mask = 0
+        for index in indexes:
+            mask |= 1 << index
+        payload = [_binary_value(self.values[index]) for index in indexes]
+        return BINARY_HEADER.pack(kind, self.symbol_id, self.seq, mask) + struct.pack(f"<{len(payload)}d", *payload)
+
+    def announcement(self):
+        """Symbol id announcement sent to a connection before its first compact frame."""
+        return json.dumps(dict(self.symbol_entry(), type="symbol"))
+
+    def symbol_entry(self):
+        """Symbol id, name and currency, as listed in announcements."""
+        return {"id": self.symbol_id, "symbol": self.symbol, "currency": self.data.get("currency")}
+
+
+class SymbolTable:
+    """
+    Process-wide symbol ids, sequence numbers and last published field values.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._last = {}
+
+    def symbol_id(self, symbol):
+        """Get (allocating if needed) the numeric id of a symbol."""
+        symbol_id = self._ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._ids[symbol] = len(self._ids) + 1
+        return symbol_id
+
+    def update(self, symbol, data, ts=None):
+        """
+        Record a new update of a symbol.
+
+        Args:
+            symbol (str): Stock symbol
+            data (dict): Price data
+            ts (float, optional): Epoch seconds of the update
+
+        Returns:
+            SymbolUpdate: The update, with the fields changed since the previous one
+        """
+        values = flatten(data, ts)
+        previous = self._last.get(symbol)
+        if previous is None:
+            seq, changed = 1, tuple(range(len(FIELDS)))
+        else:
+            seq = previous.seq + 1
+            changed = tuple(i for i, value in enumerate(values) if not _same(value, previous.values[i]))
+        update = SymbolUpdate(symbol, data, self.symbol_id(symbol), seq, values, changed)
+        self._last[symbol] = update
+        return update
+
+    def last(self, symbol):
+        """Get the last published update of a symbol, or None."""
+        return self._last.get(symbol)
+
+    def __len__(self):
+        return len(self._ids)
+
+
+def _msgpack_array_header(length):
+    if length < 16:
+        return bytes([0x90 | length])
+    if length < 1 << 16:
+        return b"\xdc" + struct.pack(">H", length)
+    return b"\xdd" + struct.pack(">I", length)
+
+
+def encode_batch(entries, fmt="json", snapshot=False):
+    """
+    Combine the frames of several symbols into one message.
+
+    The per-symbol frames come from each update's cache, so a batch costs one
+    concatenation per client rather than a new serialization.
+
+    Args:
+        entries (list): (SymbolUpdate, delta) pairs; delta is ignored for JSON
+        fmt (str): "json", "msgpack" or "binary"
+        snapshot (bool): Mark the batch as a subscription snapshot
+
+    Returns:
+        str or bytes: Batched message
+    """
+    if fmt == "json":
+        body = ", ".join(f"{json.dumps(update.symbol)}: {update.json_data()}" for update, _ in entries)
+        message_type = "snapshot" if snapshot else "price_updates"
+        return f'{{"type": "{message_type}", "data": {{{body}}}}}'
+    kind = SNAPSHOT_FRAME if snapshot else BATCH_FRAME
+    frames = b"".join(update.frame(fmt, delta) for update, delta in entries)
+    if fmt == "msgpack":
+        return b"\x92" + bytes([kind]) + _msgpack_array_header(len(entries)) + frames
+    return BINARY_BATCH_HEADER.pack(kind, len(entries)) + frames
+
+
+def symbols_announcement(updates):
+    """Batched symbol id announcement (JSON text)."""
+    return json.dumps({"type": "symbols", "symbols": [update.symbol_entry() for update in updates]})
+
+
+def negotiate(fmt, delta=False):
+    """
+    Validate a client's protocol request.
+
+    Args:
+        fmt (str): Requested format
+        delta (bool): Whether delta frames were requested
+
+    Returns:
+        tuple: (format, delta) to use
+
+    Raises:
+        ValueError: If the format is unknown or unavailable
+    """
+    fmt = str(fmt or "json").lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown protocol format '{fmt}', expected one of {list(FORMATS)}")
+    if fmt not in available_formats():
+        raise ValueError(f"Protocol format '{fmt}' is not available on this server")
+    return fmt, bool(delta) and fmt != "json"
+
+
+def protocol_ack(fmt, delta):
+    """Acknowledgement message of a protocol switch (JSON text)."""
+    return {"type": "protocol", "format": fmt, "delta": delta,
+            "fields": list(FIELDS) if fmt != "json" else None}
+
+
+def decode_binary(frame):
+    """
+    Decode a binary frame (reference implementation for clients and tests).
+
+    Args:
+        frame (bytes): Binary frame
+
+    Returns:
+        dict: {"kind", "symbol_id", "seq", "fields": {field name: value}}
+    """
+    kind, symbol_id, seq, mask = BINARY_HEADER.unpack_from(frame)
+    indexes = [i for i in range(len(FIELDS)) if mask >> i & 1]
+    values = struct.unpack_from(f"<{len(indexes)}d", frame, BINARY_HEADER.size)
+    return {"kind": kind, "symbol_id": symbol_id, "seq": seq,
+            "fields": {FIELDS[i]: value for i, value in zip(indexes, values)}}
+
+
+def decode_binary_batch(message):
+    """
+    Decode a batched binary message (reference implementation for clients and tests).
+
+    Args:
+        message (bytes): Batched binary message
+
+    Returns:
+        tuple: (kind, list of decoded frames as returned by decode_binary)
+    """
+    kind, count = BINARY_BATCH_HEADER.unpack_from(message)
+    offset = BINARY_BATCH_HEADER.size
+    frames = []
+    for _ in range(count):
+        mask = BINARY_HEADER.unpack_from(message, offset)[3]
+        size = BINARY_HEADER.size + 8 * bin(mask).count("1")
+        frames.append(decode_binary(message[offset:offset + size]))
+        offset += size
+    return kind, frames
+
+
+def _sample_updates(symbols, ticks, seed=7):
+    # Random-walk quotes with a live indicator snapshot, as the quote poller sends them:
+    # some polls return an unchanged price, the session high/low only extend and the
+    # indicators move with the price
+    rng = random.Random(seed)
+    state = {}
+    for i in range(symbols):
+        price = round(rng.uniform(100, 3000), 2)
+        state[f"SYM{i}.NS"] = {"price": price, "previous_close": round(price * rng.uniform(0.97, 1.03), 2),
+                               "high": price, "low": price, "volume": rng.randint(10000, 5000000),
+                               "indicators": None}
+    for _ in range(ticks):
+        for symbol, quote in state.items():
+            if quote["indicators"] is None or rng.random() < 0.7:
+                price = quote["price"] = round(quote["price"] * (1 + rng.gauss(0, 0.001)), 2)
+                quote["high"] = max(quote["high"], price)
+                quote["low"] = min(quote["low"], price)
+                quote["volume"] += rng.randint(100, 10000)
+                indicators = {name: price * rng.uniform(0.95, 1.05) for name in INDICATOR_FIELDS}
+                indicators.update(close=price, rsi=rng.uniform(20, 80), is_uptrend=price > quote["previous_close"],
+                                  is_downtrend=False)
+                quote["indicators"] = indicators
+            price, previous_close = quote["price"], quote["previous_close"]
+            yield symbol, {
+                'price': price,
+                'change': price - previous_close,
+                'changePercent': (price - previous_close) / previous_close * 100,
+                'high': quote["high"],
+                'low': quote["low"],
+                'volume': quote["volume"],
+                'timestamp': time.strftime('%d/%m/%Y %H:%M:%S '),
+                'currency': 'INR',
+                'indicators': dict(quote["indicators"])
+            }
+
+
+def benchmark(symbols=500, ticks=20):
+    """
+    Compare bytes per update and encode time of the wire formats.
+
+    Updates follow the quote poller: about 30% of polls return an unchanged quote
+    (deltas then carry only the timestamp), and the session high/low only change
+    when the price makes a new extreme.
+
+    Args:
+        symbols (int): Number of symbols
+        ticks (int): Updates per symbol
+
+    Returns:
+        dict: Per format and frame kind: updates, bytes per update and encode
+              microseconds per update (JSON is the current format)
+    """
+    updates = list(_sample_updates(symbols, ticks))
+    results = {}
+    variants = [("json", False)] + [(fmt, delta) for fmt in available_formats() if fmt != "json"
+                                     for delta in (False, True)]
+    for fmt, delta in variants:
+        table = SymbolTable()
+        total_bytes = 0
+        start = time.perf_counter()
+        for symbol, data in updates:
+            message = table.update(symbol, data).frame(fmt, delta)
+            total_bytes += len(message.encode() if isinstance(message, str) else message)
+        elapsed = time.perf_counter() - start
+        results[f"{fmt}{'+delta' if delta else ''}"] = {
+            "updates": len(updates),
+            "bytes_per_update": round(total_bytes / len(updates), 1),
+            "encode_us_per_update": round(elapsed / len(updates) * 1e6, 2)
+        }
+    baseline = results["json"]["bytes_per_update"]
+    for entry in results.values():
+        entry["size_vs_json"] = round(entry["bytes_per_update"] / baseline, 3)
+    return results
+
+
+def main(argv=None):
+    """Command line entry point (wire format benchmark)."""
+    parser = argparse.ArgumentParser(description="Benchmark the WebSocket wire formats")
+    parser.add_argument("--symbols", type=int, default=500, help="Number of symbols (default: 500)")
+    parser.add_argument("--ticks", type=int, default=20, help="Updates per symbol (default: 20)")
+    args = parser.parse_args(argv)
+    print(json.dumps(benchmark(args.symbols, args.ticks), indent=2))
+
+
+if __name__ == "__main__":
+    main()